@@ -1,18 +1,83 @@
-from typing import List, Any, Dict
+from typing import List, Any, Dict, Optional, Union, Literal
+from typing_extensions import Annotated
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, HTTPException, status, Body, File, Form, Header, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from bson.objectid import ObjectId
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from pymongo import DeleteOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 
-from app.models.database import get_database
-from app.models.application import Application, ApplicationCreate, ApplicationUpdate, ApplicationInDB, StatusHistory
+from app.models.database import get_database, register_query_shape
+from app.models.application import (
+    Application, ApplicationCreate, ApplicationUpdate, ApplicationInDB, StatusHistory,
+    ApplicationSummary, Document, SUMMARY_PROJECTION
+)
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.services.linkedin_crawler import LinkedInCrawler
+from app.services.crawl_cache import CrawlCache
 from app.services.gemini_service import GeminiService
+from app.services import (
+    application_events, application_stats, application_export, attachments, collection_versions, job_postings, search
+)
+from app.models.application_event import APPLICATION_EVENTS_COLLECTION, ApplicationEventResponse
+from app.services.enrichment_worker import EnrichmentWorkerPool, ENRICHMENT_PENDING, ENRICHMENT_COMPLETE
+from app.services.bulk_import import BulkImporter, parse_import_body, import_response
+from app.models.application_import import APPLICATION_IMPORTS_COLLECTION, ApplicationImportResponse
+from app.config import settings
+from app.utils.process_pool import BoundedProcessPool
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_after
+from app.utils.serialization import TrustedShape, trusted_response
+
+LIST_SORT = [("updated_at", -1), ("_id", -1)]
+
+register_query_shape("applications.list", "applications", {"user_id": ObjectId(), "archived_at": None}, sort=LIST_SORT)
+register_query_shape("applications.list_by_status", "applications", {"user_id": ObjectId(), "status": "Applied", "archived_at": None}, sort=LIST_SORT)
+register_query_shape("applications.list_by_company", "applications", {"user_id": ObjectId(), "company": "Acme", "archived_at": None}, sort=LIST_SORT)
+register_query_shape("applications.by_id", "applications", {"_id": ObjectId(), "user_id": ObjectId()})
+register_query_shape("applications.by_job_ids", "applications", {"user_id": ObjectId(), "linkedin_job_id": {"$in": ["1"]}})
+register_query_shape("github_projects.by_ids", "github_projects", {"_id": {"$in": [ObjectId()]}, "user_id": ObjectId()})
 
 router = APIRouter()
-linkedin_crawler = LinkedInCrawler()
+linkedin_crawler = LinkedInCrawler(
+    connect_timeout=settings.CRAWLER_CONNECT_TIMEOUT_SECONDS,
+    read_timeout=settings.CRAWLER_READ_TIMEOUT_SECONDS,
+    max_connections=settings.CRAWLER_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.CRAWLER_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=settings.CRAWLER_KEEPALIVE_EXPIRY_SECONDS,
+    parser=settings.HTML_PARSER,
+    extraction_pool=BoundedProcessPool(
+        "html_extraction",
+        max_workers=settings.EXTRACTION_WORKERS,
+        max_queue=settings.EXTRACTION_QUEUE_SIZE,
+    ) if settings.EXTRACTION_WORKERS > 0 else None,
+    cache=CrawlCache(
+        fresh_seconds=settings.CRAWL_CACHE_FRESH_SECONDS,
+        ttl_seconds=settings.CRAWL_CACHE_TTL_HOURS * 3600,
+        max_bytes=settings.CRAWL_CACHE_MAX_MB * 1024 * 1024,
+    ) if settings.CRAWL_CACHE_ENABLED else None,
+)
+enrichment_workers = EnrichmentWorkerPool(
+    linkedin_crawler,
+    workers=settings.ENRICHMENT_WORKERS,
+    poll_interval=settings.ENRICHMENT_POLL_INTERVAL_SECONDS,
+    lease_seconds=settings.ENRICHMENT_LEASE_SECONDS,
+    max_attempts=settings.ENRICHMENT_MAX_ATTEMPTS,
+)
+bulk_importer = BulkImporter(
+    linkedin_crawler,
+    enrichment_workers.enqueue,
+    concurrency=settings.IMPORT_CRAWL_CONCURRENCY,
+    host_rate_per_second=settings.IMPORT_HOST_RATE_PER_SECOND,
+    batch_size=settings.IMPORT_WRITE_BATCH_SIZE,
+)
+search_backend = search.create_backend(
+    settings.SEARCH_BACKEND,
+    max_users=settings.SEARCH_INDEX_MAX_USERS,
+    ttl=settings.SEARCH_INDEX_TTL_SECONDS,
+)
 gemini_service = GeminiService()
 
 class EmailGenerationRequest(BaseModel):
@@ -25,6 +90,58 @@ class EmailGenerationResponse(BaseModel):
 class ProjectSuggestionResponse(BaseModel):
     suggested_project_ids: List[str]
 
+class EnrichmentStatusResponse(BaseModel):
+    application_id: str
+    enrichment_status: Optional[str] = None
+    attempts: int = 0
+    last_error: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+class ActivityEntry(BaseModel):
+    application_id: str
+    title: Optional[str] = None
+    company: Optional[str] = None
+    status: Optional[str] = None
+    linkedin_url: Optional[str] = None
+    applied_date: Optional[datetime] = None
+    action: str
+    at: datetime
+
+class ApplicationStatsResponse(BaseModel):
+    total: int
+    active: int
+    interview_stage: int
+    by_status: Dict[str, int]
+    by_week: Dict[str, int]
+    recent_activity: List[ActivityEntry]
+    updated_at: Optional[datetime] = None
+
+class BulkOperationRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1)
+    operation: Literal["set_status", "append_note", "archive", "unarchive", "delete"]
+    status: Optional[str] = None # For set_status
+    note: Optional[str] = None # For append_note
+
+class BulkItemResult(BaseModel):
+    id: str
+    outcome: str # "updated", "deleted", "unchanged", "not_found", "invalid_id" or "failed"
+    error: Optional[str] = None
+
+class BulkOperationResponse(BaseModel):
+    operation: str
+    counts: Dict[str, int]
+    results: List[BulkItemResult]
+
+class SearchResult(BaseModel):
+    application: ApplicationSummary
+    score: float
+    highlights: Dict[str, str] = {}
+
+class SearchResponse(BaseModel):
+    query: str
+    backend: str
+    results: List[SearchResult]
+
 @router.post("/", response_model=Application)
 async def create_application(
     application_in: ApplicationCreate,
@@ -35,50 +152,398 @@ async def create_application(
     # Log the creation attempt
     print(f"Attempting to create application for URL: {application_in.linkedin_url}")
     
-    # Extract job details from LinkedIn
-    job_details = await linkedin_crawler.get_job_details(str(application_in.linkedin_url))
+    # Reuse a fresh shared posting when another application already crawled it
+    job_id = linkedin_crawler.extract_job_id(str(application_in.linkedin_url))
+    posting = await job_postings.get_fresh_posting(db, job_id)
+    provided = {k: v for k, v in application_in.dict().items() if v is not None}
+    application_data = {**job_postings.headline_fields(posting), **provided} if posting else provided
     
-    # Combine provided data with crawled data
-    application_data = {**application_in.dict(), **job_details}
-    
-    # Create application object
+    # Insert right away; otherwise job details are crawled in the background
     application = ApplicationInDB(
         **application_data,
         user_id=ObjectId(current_user.id),
+        linkedin_job_id=job_id,
+        enrichment_status=ENRICHMENT_COMPLETE if posting else ENRICHMENT_PENDING,
         status_history=[
             StatusHistory(
-                status=application_data.get("status", "Wishlist"),
+                status=application_in.status,
                 notes="Application created"
             )
         ]
     )
     
     # Use the new method that properly handles HttpUrl
-    result = await db.applications.insert_one(application.dict_for_mongodb())
+    application_doc = application.dict_for_mongodb()
+    result = await db.applications.insert_one(application_doc)
+    await application_events.record_created(db, [application_doc])
+    # Stats first: a /stats read in between must not cache old counters under the new version
+    await application_stats.record_created(db, application_doc)
+    await collection_versions.bump_version(db, application_doc["user_id"], collection_versions.APPLICATIONS)
+    if not posting:
+        await enrichment_workers.enqueue(db, application_doc)
     
     print(f"Application created with ID: {result.inserted_id}")
     
-    created_app = await db.applications.find_one({"_id": result.inserted_id})
-    return _map_application_to_response(created_app)
+    await job_postings.attach_job_descriptions(db, [application_doc])
+    return trusted_response(_map_application_to_response(application_doc))
+
+# Documents the two list shapes in OpenAPI only: list_applications returns a
+# Response directly, so this model never validates or filters its output.
+# Full documents are tried first; summaries lack linkedin_url so they fall through
+ApplicationListResponse = Annotated[
+    Union[List[Application], List[ApplicationSummary]],
+    Field(union_mode="left_to_right")
+]
 
-@router.get("/", response_model=List[Application])
+@router.get("/", response_model=ApplicationListResponse)
 async def list_applications(
+    request: Request,
+    response: Response,
+    view: Literal["full", "summary"] = "full",
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    company: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    include_archived: bool = False,
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    """
+    List applications newest-updated first, one page at a time.
+    When more results exist the X-Next-Cursor header carries the token for the next page.
+    view=summary loads and returns only the headline fields used by list views.
+    Answers If-None-Match with 304 while the user's applications are unchanged.
+    """
+    db = get_database()
+    
+    not_modified = await collection_versions.conditional_get(
+        request, response, db, ObjectId(current_user.id), collection_versions.APPLICATIONS
+    )
+    if not_modified:
+        return not_modified
+    
+    conditions = [{"user_id": ObjectId(current_user.id)}]
+    if status_filter:
+        conditions.append({"status": status_filter})
+    if company:
+        conditions.append({"company": company})
+    if not include_archived:
+        conditions.append({"archived_at": None})
+    if date_from or date_to:
+        updated_range = {}
+        if date_from:
+            updated_range["$gte"] = date_from
+        if date_to:
+            updated_range["$lte"] = date_to
+        conditions.append({"updated_at": updated_range})
+    if cursor:
+        try:
+            last_updated_at, last_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        conditions.append(keyset_after("updated_at", last_updated_at, last_id))
+    query = conditions[0] if len(conditions) == 1 else {"$and": conditions}
+    
+    # Fetch one extra document to know whether another page exists
+    projection = SUMMARY_PROJECTION if view == "summary" else None
+    applications = await db.applications.find(query, projection).sort(LIST_SORT).limit(limit + 1).to_list(length=limit + 1)
+    if len(applications) > limit:
+        applications = applications[:limit]
+        last = applications[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last["updated_at"], last["_id"])
+    
+    if view == "summary":
+        return trusted_response([_map_application_to_summary(app) for app in applications], response)
+    await job_postings.attach_job_descriptions(db, applications)
+    return trusted_response([_map_application_to_response(app) for app in applications], response)
+
+@router.get("/stats", response_model=ApplicationStatsResponse)
+async def get_application_stats(
+    request: Request,
+    response: Response,
+    rebuild: bool = False,
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    """
+    Dashboard counters (per status, per week of creation) and recent activity.
+    Served from an incrementally maintained document; rebuild=true recomputes it.
+    Archiving only hides applications from lists, search and export: the
+    counters still include archived applications.
+    """
+    db = get_database()
+    if not rebuild:
+        not_modified = await collection_versions.conditional_get(
+            request, response, db, ObjectId(current_user.id), collection_versions.APPLICATIONS
+        )
+        if not_modified:
+            return not_modified
+    return await application_stats.get_stats(db, ObjectId(current_user.id), rebuild=rebuild)
+
+@router.post("/bulk", response_model=BulkOperationResponse)
+async def bulk_update_applications(
+    request_data: BulkOperationRequest,
     current_user: User = Depends(get_current_user)
 ) -> Any:
+    """
+    Apply one operation (set_status, append_note, archive, unarchive or delete)
+    to many applications with a single ownership-filtered bulk_write.
+    Returns an outcome per ID.
+    """
+    if len(request_data.ids) > settings.BULK_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BULK_MAX_IDS} applications per bulk operation"
+        )
+    if request_data.operation == "set_status" and not request_data.status:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="status is required for set_status")
+    if request_data.operation == "append_note" and not request_data.note:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="note is required for append_note")
+    
     db = get_database()
+    user_id = ObjectId(current_user.id)
+    now = datetime.utcnow()
+    now = now.replace(microsecond=now.microsecond // 1000 * 1000)
     
-    cursor = db.applications.find({"user_id": ObjectId(current_user.id)})
-    applications = await cursor.to_list(length=100)  # Limit to 100 for now
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    object_ids: Dict[str, ObjectId] = {}
+    for raw_id in dict.fromkeys(request_data.ids):
+        if ObjectId.is_valid(raw_id):
+            object_ids[raw_id] = ObjectId(raw_id)
+        else:
+            outcomes[raw_id] = {"outcome": "invalid_id"}
     
-    return [_map_application_to_response(app) for app in applications]
+    # One read for ownership and current state
+    owned = {
+        app["_id"]: app
+        async for app in db.applications.find(
+            {"_id": {"$in": list(object_ids.values())}, "user_id": user_id},
+            {"user_id": 1, "status": 1, "archived_at": 1, "documents.sha256": 1, application_events.HISTORY_FLAG: 1}
+        )
+    }
+    
+    targets = []
+    operations = []
+    for raw_id, object_id in object_ids.items():
+        app = owned.get(object_id)
+        if app is None:
+            outcomes[raw_id] = {"outcome": "not_found"}
+            continue
+        operation = _bulk_operation(request_data, app, now)
+        if operation is None:
+            outcomes[raw_id] = {"outcome": "unchanged"}
+            continue
+        targets.append((raw_id, app))
+        operations.append(operation)
+    
+    failed: Dict[int, str] = {}
+    if operations:
+        try:
+            result = await db.applications.bulk_write(operations, ordered=False)
+            affected = result.deleted_count if request_data.operation == "delete" else result.matched_count
+        except BulkWriteError as e:
+            failed = {error["index"]: error.get("errmsg") for error in e.details.get("writeErrors", [])}
+            details = e.details
+            affected = details.get("nRemoved", 0) if request_data.operation == "delete" else details.get("nMatched", 0)
+        
+        # Updates that matched nothing hit an application deleted since the read
+        vanished = set()
+        if request_data.operation != "delete" and affected < len(operations) - len(failed):
+            remaining = await db.applications.distinct(
+                "_id", {"_id": {"$in": [app["_id"] for _, app in targets]}, "user_id": user_id}
+            )
+            vanished = {app["_id"] for _, app in targets} - set(remaining)
+        
+        done_outcome = "deleted" if request_data.operation == "delete" else "updated"
+        changed = []
+        for index, (raw_id, app) in enumerate(targets):
+            if index in failed:
+                outcomes[raw_id] = {"outcome": "failed", "error": failed[index]}
+            elif app["_id"] in vanished:
+                outcomes[raw_id] = {"outcome": "not_found"}
+            else:
+                outcomes[raw_id] = {"outcome": done_outcome}
+                changed.append(app)
+        
+        await _after_bulk_operation(db, request_data, user_id, changed, now)
+    
+    results = [{"id": raw_id, **outcomes[raw_id]} for raw_id in dict.fromkeys(request_data.ids)]
+    counts: Dict[str, int] = {}
+    for item in results:
+        counts[item["outcome"]] = counts.get(item["outcome"], 0) + 1
+    return {"operation": request_data.operation, "counts": counts, "results": results}
+
+@router.get("/search", response_model=SearchResponse)
+async def search_applications(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    include_archived: bool = False,
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    """
+    Relevance-ranked search over title, company and job description.
+    Quoted text is matched as a phrase; results carry highlighted snippets.
+    Archived applications are left out unless include_archived is set, as in the list.
+    """
+    query = search.parse_query(q)
+    if not query.tokens:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Query has no searchable terms")
+
+    filters: Dict[str, Any] = {}
+    if status_filter:
+        filters["status"] = status_filter
+    if not include_archived:
+        filters["archived_at"] = None
+    if date_from or date_to:
+        filters["updated_at"] = {}
+        if date_from:
+            filters["updated_at"]["$gte"] = date_from
+        if date_to:
+            filters["updated_at"]["$lte"] = date_to
+
+    db = get_database()
+    ranked = await search_backend.search(db, ObjectId(current_user.id), query, filters, limit)
+    return {
+        "query": q,
+        "backend": search_backend.name,
+        "results": [
+            {
+                "application": _map_application_to_summary(dict(doc)),
+                "score": round(score, 4),
+                "highlights": search.highlights(doc, query),
+            }
+            for score, doc in ranked
+        ],
+    }
+
+@router.get("/export")
+async def export_applications(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    columns: Optional[str] = Query(None, description="Comma-separated columns; job_description is opt-in"),
+    gzip: bool = False,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    include_archived: bool = False,
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    """
+    Stream every application as NDJSON or CSV straight from the cursor,
+    one batch at a time, so memory use does not grow with the number of rows.
+    Archived applications are left out unless include_archived is set, as in the list.
+    """
+    try:
+        selected = application_export.parse_columns(columns)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    db = get_database()
+    query = {"user_id": ObjectId(current_user.id)}
+    if status_filter:
+        query["status"] = status_filter
+    if not include_archived:
+        query["archived_at"] = None
+
+    batches = application_export.iter_batches(db, query, selected, settings.EXPORT_BATCH_SIZE)
+    if format == "csv":
+        body = application_export.csv_chunks(batches, selected)
+        media_type = "text/csv; charset=utf-8"
+    else:
+        body = application_export.ndjson_chunks(batches, selected)
+        media_type = "application/x-ndjson"
+    filename = f"applications.{format}"
+    if gzip:
+        body = application_export.gzip_chunks(body)
+        media_type = "application/gzip"
+        filename += ".gz"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.post("/imports", response_model=ApplicationImportResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_import(
+    request: Request,
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    """
+    Import many applications from a CSV (linkedin_url column plus optional
+    application fields) or a JSON list of URLs/objects. Rows are validated and
+    de-duplicated up front; crawling and inserts continue in the background.
+    Poll GET /imports/{id} for per-row results.
+    """
+    try:
+        rows = parse_import_body(await request.body(), request.headers.get("content-type", ""))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Could not parse import: {e}")
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Import contains no rows")
+    if len(rows) > settings.IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Imports are limited to {settings.IMPORT_MAX_ROWS} rows"
+        )
+
+    db = get_database()
+    doc = await bulk_importer.create(db, ObjectId(current_user.id), rows)
+    return import_response(doc)
+
+@router.get("/imports/{import_id}", response_model=ApplicationImportResponse)
+async def get_import(
+    import_id: str,
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    db = get_database()
+    if not ObjectId.is_valid(import_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid import ID format")
+
+    doc = await db[APPLICATION_IMPORTS_COLLECTION].find_one(
+        {"_id": ObjectId(import_id), "user_id": ObjectId(current_user.id)}
+    )
+    if doc is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import not found")
+    return import_response(doc)
+
+@router.post("/imports/{import_id}/resume", response_model=ApplicationImportResponse, status_code=status.HTTP_202_ACCEPTED)
+async def resume_import(
+    import_id: str,
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    """Continue an interrupted import; rows already written are not repeated"""
+    db = get_database()
+    if not ObjectId.is_valid(import_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid import ID format")
+
+    user_id = ObjectId(current_user.id)
+    doc = await bulk_importer.resume(db, ObjectId(import_id), user_id)
+    if doc is None:
+        exists = await db[APPLICATION_IMPORTS_COLLECTION].count_documents({"_id": ObjectId(import_id), "user_id": user_id})
+        if not exists:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import not found")
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Import is still running")
+    return import_response(doc)
 
 @router.get("/{application_id}", response_model=Application)
 async def get_application(
     application_id: str,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user)
 ) -> Any:
     db = get_database()
     
+    not_modified = await collection_versions.conditional_get(
+        request, response, db, ObjectId(current_user.id), collection_versions.APPLICATIONS
+    )
+    if not_modified:
+        return not_modified
+    
     application = await db.applications.find_one({
         "_id": ObjectId(application_id),
         "user_id": ObjectId(current_user.id)
@@ -90,54 +555,246 @@ async def get_application(
             detail="Application not found"
         )
     
-    return _map_application_to_response(application)
+    await job_postings.attach_job_descriptions(db, [application])
+    return trusted_response(_map_application_to_response(application), response)
 
-@router.put("/{application_id}", response_model=Application)
-async def update_application(
+@router.get("/{application_id}/enrichment", response_model=EnrichmentStatusResponse)
+async def get_enrichment_status(
     application_id: str,
-    application_update: ApplicationUpdate,
     current_user: User = Depends(get_current_user)
 ) -> Any:
+    """Poll the background crawl of an application's LinkedIn job page."""
     db = get_database()
     
-    # Get existing application
-    existing_app = await db.applications.find_one({
-        "_id": ObjectId(application_id),
-        "user_id": ObjectId(current_user.id)
-    })
+    application = await db.applications.find_one(
+        {"_id": ObjectId(application_id), "user_id": ObjectId(current_user.id)},
+        {"enrichment_status": 1, "updated_at": 1}
+    )
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
     
-    if not existing_app:
+    task = await enrichment_workers.get_task(db, application["_id"]) or {}
+    return EnrichmentStatusResponse(
+        application_id=application_id,
+        enrichment_status=application.get("enrichment_status"),
+        attempts=task.get("attempts", 0),
+        last_error=task.get("last_error"),
+        updated_at=task.get("updated_at", application.get("updated_at"))
+    )
+
+@router.get("/{application_id}/timeline", response_model=List[ApplicationEventResponse])
+async def get_application_timeline(
+    application_id: str,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    """
+    Full status history of an application, newest first, one page at a time.
+    When more events exist the X-Next-Cursor header carries the next page token.
+    """
+    db = get_database()
+    user_id = ObjectId(current_user.id)
+    
+    application = await db.applications.find_one(
+        {"_id": ObjectId(application_id), "user_id": user_id},
+        {"user_id": 1, "status_history": 1, application_events.HISTORY_FLAG: 1}
+    )
+    if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Application not found"
         )
+    # Applications from before the events collection are copied over on first read
+    await application_events.ensure_backfilled(db, application)
     
-    # Prepare update data
-    update_data = {k: v for k, v in application_update.dict().items() if v is not None}
-    update_data["updated_at"] = datetime.utcnow()
+    after = None
+    if cursor:
+        try:
+            last_at, last_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        after = keyset_after("at", last_at, last_id)
+    
+    events = await application_events.timeline_page(db, user_id, application["_id"], limit + 1, after)
+    if len(events) > limit:
+        events = events[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(events[-1]["at"], events[-1]["_id"])
+    
+    return [
+        {**event, "id": str(event["_id"]), "application_id": str(event["application_id"])}
+        for event in events
+    ]
+
+@router.post("/{application_id}/documents", response_model=Document, status_code=status.HTTP_201_CREATED)
+async def upload_document(
+    application_id: str,
+    file: UploadFile = File(...),
+    type: str = Form(...),
+    name: Optional[str] = Form(None),
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    """
+    Attach a file (e.g. a résumé or cover letter) to an application.
+    Identical files are stored once, however many applications attach them.
+    """
+    db = get_database()
+    selector = {"_id": ObjectId(application_id), "user_id": ObjectId(current_user.id)}
+    
+    if not await db.applications.count_documents(selector, limit=1):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
     
-    # Add to status history if status changed
-    if "status" in update_data and update_data["status"] != existing_app["status"]:
-        status_history_entry = StatusHistory(
-            status=update_data["status"],
-            notes=f"Status changed from {existing_app['status']} to {update_data['status']}"
+    content_type = file.content_type or "application/octet-stream"
+    try:
+        blob = await attachments.put_blob(db, file.file, content_type)
+    except attachments.AttachmentTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    
+    document = attachments.document_metadata(name or file.filename or "attachment", type, blob, content_type)
+    result = await db.applications.update_one(
+        selector, {"$push": {"documents": document}, "$set": {"updated_at": datetime.utcnow()}}
+    )
+    if not result.matched_count:
+        # Deleted while uploading
+        await attachments.release_blobs(db, [blob["_id"]])
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
         )
-        
-        # Use $push to add to status_history array
-        await db.applications.update_one(
-            {"_id": ObjectId(application_id)},
-            {"$push": {"status_history": status_history_entry.dict()}}
+    
+    await collection_versions.bump_version(db, ObjectId(current_user.id), collection_versions.APPLICATIONS)
+    return document
+
+@router.get("/{application_id}/documents/{document_id}")
+async def download_document(
+    application_id: str,
+    document_id: str,
+    range: Optional[str] = Header(None),
+    if_range: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream an attachment. Honours a single `Range: bytes=...` (206), and
+    If-None-Match / If-Range against the content hash.
+    """
+    db = get_database()
+    
+    application = await db.applications.find_one(
+        {"_id": ObjectId(application_id), "user_id": ObjectId(current_user.id), "documents.id": document_id},
+        {"documents": {"$elemMatch": {"id": document_id}}}
+    )
+    blob = None
+    if application:
+        document = application["documents"][0]
+        blob = await attachments.get_blob(db, document["sha256"])
+    if blob is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    
+    etag = f'"{blob["_id"]}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": collection_versions.CACHE_CONTROL,
+        "Content-Disposition": f"attachment; filename*=UTF-8''{quote(document['name'])}",
+    }
+    if collection_versions.etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    size = blob["size"]
+    try:
+        # A stale If-Range validator means the client's partial copy is outdated
+        byte_range = attachments.parse_range(range, size) if not if_range or if_range == etag else None
+    except attachments.RangeNotSatisfiable:
+        return Response(
+            status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+            headers={**headers, "Content-Range": f"bytes */{size}"}
         )
     
-    # Update application
-    await db.applications.update_one(
-        {"_id": ObjectId(application_id)},
-        {"$set": update_data}
+    start, end = byte_range or (0, size - 1)
+    headers["Content-Length"] = str(end - start + 1)
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        attachments.iter_blob(db, blob, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+        media_type=document.get("content_type") or blob["content_type"],
+        headers=headers,
+    )
+
+@router.delete("/{application_id}/documents/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_document(
+    application_id: str,
+    document_id: str,
+    current_user: User = Depends(get_current_user)
+) -> None:
+    db = get_database()
+    
+    # Pull the entry and get the pre-image in one step, so its reference is released exactly once
+    application = await db.applications.find_one_and_update(
+        {"_id": ObjectId(application_id), "user_id": ObjectId(current_user.id), "documents.id": document_id},
+        {"$pull": {"documents": {"id": document_id}}, "$set": {"updated_at": datetime.utcnow()}},
+        projection={"documents": {"$elemMatch": {"id": document_id}}},
+        return_document=ReturnDocument.BEFORE
+    )
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    
+    await collection_versions.bump_version(db, ObjectId(current_user.id), collection_versions.APPLICATIONS)
+    await attachments.release_blobs(db, [application["documents"][0].get("sha256")])
+
+@router.put("/{application_id}", response_model=Application)
+async def update_application(
+    application_id: str,
+    application_update: ApplicationUpdate,
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    db = get_database()
+    
+    # Mongo keeps millisecond precision; truncate so the history entry can be recognised
+    now = datetime.utcnow()
+    now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+    
+    # Prepare update data
+    update_data = {k: v for k, v in application_update.dict().items() if v is not None}
+    update_data["updated_at"] = now
+    
+    # Ownership check, conditional status-history append and update in one operation
+    updated_app = await db.applications.find_one_and_update(
+        {"_id": ObjectId(application_id), "user_id": ObjectId(current_user.id)},
+        _update_pipeline(update_data, now),
+        return_document=ReturnDocument.AFTER
     )
     
-    # Get updated application
-    updated_app = await db.applications.find_one({"_id": ObjectId(application_id)})
-    return _map_application_to_response(updated_app)
+    if not updated_app:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
+    
+    previous_status = _previous_status(updated_app, now)
+    if previous_status is not None and updated_app.get(application_events.HISTORY_FLAG):
+        await application_events.record_status_change(db, updated_app)
+    await application_stats.record_updated(db, updated_app, previous_status=previous_status)
+    await collection_versions.bump_version(db, updated_app["user_id"], collection_versions.APPLICATIONS)
+    await job_postings.attach_job_descriptions(db, [updated_app])
+    return trusted_response(_map_application_to_response(updated_app))
 
 @router.delete("/{application_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_application(
@@ -146,20 +803,22 @@ async def delete_application(
 ) -> None:
     db = get_database()
     
-    # Check application exists and belongs to user
-    existing_app = await db.applications.find_one({
-        "_id": ObjectId(application_id),
-        "user_id": ObjectId(current_user.id)
-    })
+    # Ownership-filtered delete; the removed document is returned for the counters
+    deleted_app = await db.applications.find_one_and_delete(
+        {"_id": ObjectId(application_id), "user_id": ObjectId(current_user.id)},
+        projection={"user_id": 1, "status": 1, "created_at": 1, "documents.sha256": 1}
+    )
     
-    if not existing_app:
+    if not deleted_app:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Application not found"
         )
     
-    # Delete application
-    await db.applications.delete_one({"_id": ObjectId(application_id)})
+    await application_stats.record_deleted(db, deleted_app)
+    await collection_versions.bump_version(db, deleted_app["user_id"], collection_versions.APPLICATIONS)
+    await application_events.delete_for_application(db, deleted_app["user_id"], deleted_app["_id"])
+    await attachments.release_blobs(db, [doc.get("sha256") for doc in deleted_app.get("documents", [])])
 
 @router.get("/{application_id}/suggest_projects", response_model=ProjectSuggestionResponse)
 async def suggest_projects(
@@ -187,7 +846,8 @@ async def suggest_projects(
             detail="Application not found"
         )
     
-    # Check if job description exists
+    # Check if job description exists (it may live on the shared posting)
+    await job_postings.attach_job_descriptions(db, [application])
     if not application.get("job_description"):
         print(f"DEBUG: No job description for application: {application_id}")
         raise HTTPException(
@@ -273,7 +933,8 @@ async def generate_email(
             detail="Application not found"
         )
     
-    # Check if job description exists
+    # Check if job description exists (it may live on the shared posting)
+    await job_postings.attach_job_descriptions(db, [application])
     if not application.get("job_description"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -317,8 +978,115 @@ async def generate_email(
     
     return EmailGenerationResponse(email_text=email_text)
 
-def _map_application_to_response(app_dict: dict) -> Application:
-    """Map MongoDB document to Pydantic model for response."""
-    app_dict["id"] = str(app_dict["_id"])
-    app_dict["user_id"] = str(app_dict["user_id"])
-    return Application(**app_dict)
+def _update_pipeline(update_data: Dict[str, Any], now: datetime) -> List[dict]:
+    """
+    Aggregation-pipeline update that sets the given fields and, only when the
+    status actually changes, appends a status-history entry (keeping the latest
+    STATUS_HISTORY_INLINE_LIMIT entries). Every expression in
+    a $set stage sees the document as it was before the stage, so "$status" is
+    the previous status.
+    """
+    stage = {field: {"$literal": value} for field, value in update_data.items()}
+    
+    new_status = update_data.get("status")
+    if new_status is not None:
+        entry = {
+            "status": {"$literal": new_status},
+            "previous_status": "$status",
+            "changed_at": {"$literal": now},
+            "notes": {"$concat": [
+                "Status changed from ", {"$ifNull": ["$status", ""]}, " to ", {"$literal": new_status}
+            ]},
+        }
+        appended = {"$concatArrays": [{"$ifNull": ["$status_history", []]}, [entry]]}
+        # Trim only once the full history has been copied to application_events
+        appended = {"$cond": [
+            {"$ifNull": ["$history_in_events", False]},
+            {"$slice": [appended, -settings.STATUS_HISTORY_INLINE_LIMIT]},
+            appended,
+        ]}
+        stage["status_history"] = {"$cond": [
+            {"$ne": ["$status", {"$literal": new_status}]},
+            appended,
+            {"$ifNull": ["$status_history", []]},
+        ]}
+    
+    return [{"$set": stage}]
+
+def _bulk_operation(request_data: BulkOperationRequest, app: dict, now: datetime):
+    """Write for one application of a bulk operation, or None if it would not change it."""
+    selector = {"_id": app["_id"], "user_id": app["user_id"]}
+    operation = request_data.operation
+    if operation == "delete":
+        return DeleteOne(selector)
+    if operation == "set_status":
+        if app.get("status") == request_data.status:
+            return None
+        return UpdateOne(selector, _update_pipeline({"status": request_data.status, "updated_at": now}, now))
+    if operation == "append_note":
+        return UpdateOne(selector, [{"$set": {
+            "notes": {"$cond": [
+                {"$eq": [{"$ifNull": ["$notes", ""]}, ""]},
+                {"$literal": request_data.note},
+                {"$concat": ["$notes", "\n", {"$literal": request_data.note}]},
+            ]},
+            "updated_at": now,
+        }}])
+    if operation == "archive":
+        if app.get("archived_at"):
+            return None
+        return UpdateOne(selector, {"$set": {"archived_at": now, "updated_at": now}})
+    if operation == "unarchive":
+        if not app.get("archived_at"):
+            return None
+        return UpdateOne(selector, {"$set": {"archived_at": None, "updated_at": now}})
+    raise ValueError(f"Unknown bulk operation: {operation}")
+
+async def _after_bulk_operation(db, request_data: BulkOperationRequest, user_id: ObjectId, changed: List[dict], now: datetime):
+    """Events, ETag version and counters for the applications a bulk operation changed."""
+    if not changed:
+        return
+    if request_data.operation == "set_status":
+        # Applications not yet flagged keep the entry inline until their backfill
+        events = [
+            application_events.event_from_history(app, {
+                "status": request_data.status,
+                "previous_status": app.get("status"),
+                "changed_at": now,
+                "notes": f"Status changed from {app.get('status') or ''} to {request_data.status}",
+            })
+            for app in changed
+            if app.get(application_events.HISTORY_FLAG)
+        ]
+        if events:
+            await db[APPLICATION_EVENTS_COLLECTION].insert_many(events, ordered=False)
+    if request_data.operation == "delete":
+        await db[APPLICATION_EVENTS_COLLECTION].delete_many(
+            {"user_id": user_id, "application_id": {"$in": [app["_id"] for app in changed]}}
+        )
+        await attachments.release_blobs(
+            db, [doc.get("sha256") for app in changed for doc in app.get("documents", [])]
+        )
+    # One recount instead of a counter update per application
+    await application_stats.rebuild_stats(db, user_id)
+    await collection_versions.bump_version(db, user_id, collection_versions.APPLICATIONS)
+
+def _previous_status(app_dict: dict, now: datetime) -> Optional[str]:
+    """Status before an update made at `now`, if that update changed it."""
+    history = app_dict.get("status_history") or []
+    if history and history[-1].get("changed_at") == now:
+        return history[-1].get("previous_status")
+    return None
+
+# Documents are written by this service, so responses are shaped from them
+# directly instead of being re-validated through the Pydantic models
+_application_shape = TrustedShape(Application)
+_summary_shape = TrustedShape(ApplicationSummary)
+
+def _map_application_to_response(app_dict: dict) -> Dict[str, Any]:
+    """Map MongoDB document to the Application response fields."""
+    return _application_shape({**app_dict, "id": str(app_dict["_id"]), "user_id": str(app_dict["user_id"])})
+
+def _map_application_to_summary(app_dict: dict) -> Dict[str, Any]:
+    """Map a projected MongoDB document to the slim list fields."""
+    return _summary_shape({**app_dict, "id": str(app_dict["_id"]), "user_id": str(app_dict["user_id"])})
@@ -1,19 +1,27 @@
+import time
 from datetime import timedelta
 from typing import Any
 from bson.objectid import ObjectId
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from pydantic import BaseModel
+from pymongo.errors import DuplicateKeyError
 
 from app.config import settings
-from app.models.database import get_database
+from app.models.database import get_database, register_query_shape
 from app.models.user import User, UserCreate, UserInDB
-from app.utils.security import verify_password, get_password_hash, create_access_token
+from app.utils.cache import TTLCache
+from app.utils.process_pool import PoolBusyError
+from app.utils.security import verify_password_async, get_password_hash_async, create_access_token
 
 router = APIRouter()
 
+register_query_shape("users.by_email", "users", {"email": "user@example.com"})
+register_query_shape("users.by_id", "users", {"_id": ObjectId()})
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login", auto_error=False)
 
 class Token(BaseModel):
     access_token: str
@@ -22,6 +30,31 @@ class Token(BaseModel):
 class TokenPayload(BaseModel):
     sub: str = None
 
+# Decoded token subjects keyed by the raw token string, and resolved principals
+# keyed by token subject, so authenticated requests skip the users lookup.
+# Users are never updated or deleted through the API, so entries are not
+# invalidated explicitly; a changed user record is picked up within
+# AUTH_CACHE_TTL_SECONDS.
+token_cache = TTLCache(
+    "auth_tokens", settings.AUTH_CACHE_MAX_SIZE, settings.AUTH_CACHE_TTL_SECONDS
+)
+principal_cache = TTLCache(
+    "auth_principals", settings.AUTH_CACHE_MAX_SIZE, settings.AUTH_CACHE_TTL_SECONDS
+)
+
+def _hashing_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is busy, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+def auth_cache_stats() -> dict:
+    return {
+        "tokens": token_cache.stats(),
+        "principals": principal_cache.stats(),
+    }
+
 async def get_user_by_email(email: str) -> UserInDB:
     db = get_database()
     user_data = await db.users.find_one({"email": email})
@@ -33,10 +66,28 @@ async def authenticate_user(email: str, password: str) -> UserInDB:
     user = await get_user_by_email(email)
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+    if not await verify_password_async(password, user.password_hash):
         return None
     return user
 
+def _decode_token_subject(token: str) -> str:
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+
+    payload = jwt.decode(
+        token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+    )
+    user_id = payload.get("sub")
+    if user_id is None:
+        return None
+
+    # Never keep a token around longer than it is valid
+    expires_at = payload.get("exp")
+    ttl = expires_at - time.time() if expires_at else None
+    token_cache.set(token, user_id, ttl=ttl)
+    return user_id
+
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -44,67 +95,89 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
+        user_id = _decode_token_subject(token)
         if user_id is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    
+
+    cached_user = principal_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+
+    if not ObjectId.is_valid(user_id):
+        raise credentials_exception
+
     db = get_database()
     user_data = await db.users.find_one({"_id": ObjectId(user_id)})
     if user_data is None:
         raise credentials_exception
     
     user = UserInDB(**user_data)
-    return User(
+    current_user = User(
         id=str(user.id),
         username=user.username,
         email=user.email,
         created_at=user.created_at
     )
+    principal_cache.set(user_id, current_user)
+    return current_user
+
+async def get_stream_user(
+    token: str = Depends(optional_oauth2_scheme),
+    access_token: str = Query(None),
+) -> User:
+    """Like get_current_user, but also accepts the token as a query parameter
+    since browsers' EventSource cannot set an Authorization header"""
+    if not token and not access_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await get_current_user(token or access_token)
 
 @router.post("/register", response_model=User)
 async def register_user(user_in: UserCreate) -> Any:
     db = get_database()
     
-    # Check if email already exists
-    existing_user = await db.users.find_one({"email": user_in.email})
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
-    # Check if username already exists
-    existing_username = await db.users.find_one({"username": user_in.username})
-    if existing_username:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already taken"
-        )
-    
     # Create new user
+    try:
+        password_hash = await get_password_hash_async(user_in.password)
+    except PoolBusyError:
+        raise _hashing_busy_exception()
     user_data = UserInDB(
         **user_in.dict(),
-        password_hash=get_password_hash(user_in.password)
+        password_hash=password_hash
     )
     
-    result = await db.users.insert_one(user_data.dict(by_alias=True))
+    # Unique indexes on email and username reject duplicates atomically
+    try:
+        await db.users.insert_one(user_data.dict(by_alias=True))
+    except DuplicateKeyError as e:
+        key_pattern = (e.details or {}).get("keyPattern") or {}
+        if "username" in key_pattern or "username_unique" in str(e):
+            detail = "Username already taken"
+        else:
+            detail = "Email already registered"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail
+        )
     
-    created_user = await db.users.find_one({"_id": result.inserted_id})
     return User(
-        id=str(created_user["_id"]),
-        username=created_user["username"],
-        email=created_user["email"],
-        created_at=created_user["created_at"]
+        id=str(user_data.id),
+        username=user_data.username,
+        email=user_data.email,
+        created_at=user_data.created_at
     )
 
 @router.post("/login", response_model=Token)
 async def login_access_token(form_data: OAuth2PasswordRequestForm = Depends()) -> Any:
-    user = await authenticate_user(form_data.username, form_data.password)
+    try:
+        user = await authenticate_user(form_data.username, form_data.password)
+    except PoolBusyError:
+        raise _hashing_busy_exception()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
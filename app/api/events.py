@@ -0,0 +1,106 @@
+import asyncio
+from typing import AsyncIterator, Iterable, Optional
+
+from bson.objectid import ObjectId
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.api.auth import get_stream_user
+from app.config import settings
+from app.models.user import User
+from app.services.change_feed import ChangeEvent, ChangeFeedHub, Subscription
+from app.utils.serialization import dumps
+
+router = APIRouter()
+change_feed = ChangeFeedHub(
+    buffer_size=settings.CHANGE_FEED_BUFFER_SIZE,
+    queue_size=settings.CHANGE_FEED_CLIENT_QUEUE_SIZE,
+    pre_images=settings.CHANGE_FEED_PRE_IMAGES,
+)
+
+RECONNECT_MILLISECONDS = 3000
+
+
+def format_event(event: ChangeEvent) -> bytes:
+    """One SSE message; the resume token doubles as the event id"""
+    if event.payload is None:
+        return reset_event(change_feed.latest_token)
+    return b"id: " + event.token.encode() + b"\nevent: change\ndata: " + dumps(event.payload) + b"\n\n"
+
+
+def reset_event(token: Optional[str]) -> bytes:
+    """Tell the client it missed changes and should refetch its lists"""
+    message = f"id: {token}\n" if token else ""
+    return f"{message}event: reset\ndata: {{}}\n\n".encode()
+
+
+async def _event_stream(
+    subscription: Subscription, replay: Iterable[ChangeEvent], reset: bool
+) -> AsyncIterator[bytes]:
+    try:
+        yield f"retry: {RECONNECT_MILLISECONDS}\n\n".encode()
+        if reset:
+            yield reset_event(change_feed.latest_token)
+        replayed = set()
+        for event in replay:
+            replayed.add(event.token)
+            yield format_event(event)
+
+        while True:
+            if subscription.overflowed:
+                # The client fell behind; drop what is queued and have it refetch
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.overflowed = False
+                yield reset_event(change_feed.latest_token)
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=settings.CHANGE_FEED_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            if event.token in replayed:
+                continue  # already sent while catching up
+            yield format_event(event)
+    finally:
+        change_feed.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def stream_changes(
+    current_user: User = Depends(get_stream_user),
+    last_event_id: Optional[str] = Header(None),
+):
+    """Server-Sent Events with compact deltas of the user's applications and GitHub projects.
+
+    Reconnects resume after the Last-Event-ID header; when that is no longer
+    possible a `reset` event asks the client to refetch. Responds 503 when
+    change streams are unavailable (no replica set) so clients keep polling.
+    """
+    if not change_feed.available:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Live updates are unavailable",
+            headers={"Retry-After": "60"},
+        )
+
+    user_id = ObjectId(current_user.id)
+    subscription, replay, found = change_feed.subscribe(user_id, last_event_id)
+    reset = False
+    if not found:
+        # Older than the shared buffer: resume a private stream from the token
+        try:
+            replay = await change_feed.catch_up(user_id, last_event_id)
+        except BaseException:
+            change_feed.unsubscribe(subscription)
+            raise
+        if replay is None:
+            replay, reset = [], True
+
+    return StreamingResponse(
+        _event_stream(subscription, replay, reset),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
@@ -1,14 +1,18 @@
 from typing import List, Any, Dict, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Request, Response
 from pydantic import BaseModel
 from bson.objectid import ObjectId
 from datetime import datetime
 
-from app.models.database import get_database
+from app.models.database import get_database, register_query_shape
 from app.models.github_project import GitHubProject, GitHubProjectResponse
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.services.github_service import GitHubService, RateLimitError
+from app.services import collection_versions
+
+register_query_shape("github_projects.by_github_id", "github_projects", {"user_id": ObjectId(), "github_id": 0})
+register_query_shape("github_projects.list", "github_projects", {"user_id": ObjectId()}, sort=[("last_commit_date", -1)])
 
 router = APIRouter()
 github_service = GitHubService()
@@ -111,6 +115,9 @@ async def fetch_github_projects(
                 print(
                     f"Error processing repository {repo.get('name', 'unknown')}: {str(e)}")
 
+        if stored_projects:
+            await collection_versions.bump_version(db, ObjectId(current_user.id), collection_versions.GITHUB_PROJECTS)
+
         # Convert to response models
         response_projects = []
         for project in stored_projects:
@@ -155,11 +162,19 @@ async def fetch_github_projects(
 
 @router.get("/", response_model=List[GitHubProjectResponse])
 async def list_github_projects(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user)
 ) -> Any:
-    """Get all GitHub projects for the current user"""
+    """Get all GitHub projects for the current user (304 if unchanged since the given ETag)"""
     db = get_database()
 
+    not_modified = await collection_versions.conditional_get(
+        request, response, db, ObjectId(current_user.id), collection_versions.GITHUB_PROJECTS
+    )
+    if not_modified:
+        return not_modified
+
     try:
         # Find all projects for the current user
         cursor = db.github_projects.find({
@@ -11,10 +11,92 @@ class Settings(BaseSettings):
     # MongoDB settings
     MONGODB_URL: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
     DATABASE_NAME: str = os.getenv("DATABASE_NAME", "job_tracker")
+    # Connection pool tuning
+    MONGODB_MIN_POOL_SIZE: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", "5"))
+    MONGODB_MAX_POOL_SIZE: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    # Commands slower than this are logged with a redacted filter shape
+    MONGODB_SLOW_COMMAND_MS: int = int(os.getenv("MONGODB_SLOW_COMMAND_MS", "100"))
+    # Dev/CI: explain() every registered query shape at startup, fail on COLLSCAN
+    QUERY_PLAN_AUDIT: bool = os.getenv("QUERY_PLAN_AUDIT", "false").lower() == "true"
     
     # Authentication
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-for-development")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 1 week
 
+    # Authenticated-principal cache (avoids a users lookup on every request);
+    # also bounds how long a changed user record can be served stale
+    AUTH_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+    AUTH_CACHE_MAX_SIZE: int = int(os.getenv("AUTH_CACHE_MAX_SIZE", "10000"))
+
+    # Password hashing runs in a dedicated process pool off the event loop
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_QUEUE_SIZE: int = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "32"))
+
+    # Background LinkedIn enrichment of new applications
+    ENRICHMENT_WORKERS: int = int(os.getenv("ENRICHMENT_WORKERS", "2"))
+    ENRICHMENT_POLL_INTERVAL_SECONDS: float = float(os.getenv("ENRICHMENT_POLL_INTERVAL_SECONDS", "5"))
+    ENRICHMENT_LEASE_SECONDS: int = int(os.getenv("ENRICHMENT_LEASE_SECONDS", "60"))
+    ENRICHMENT_MAX_ATTEMPTS: int = int(os.getenv("ENRICHMENT_MAX_ATTEMPTS", "3"))
+
+    # LinkedIn crawler: one pooled keep-alive HTTP client per worker
+    CRAWLER_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("CRAWLER_CONNECT_TIMEOUT_SECONDS", "5"))
+    CRAWLER_READ_TIMEOUT_SECONDS: float = float(os.getenv("CRAWLER_READ_TIMEOUT_SECONDS", "15"))
+    CRAWLER_MAX_CONNECTIONS: int = int(os.getenv("CRAWLER_MAX_CONNECTIONS", "20"))
+    CRAWLER_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("CRAWLER_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    CRAWLER_KEEPALIVE_EXPIRY_SECONDS: float = float(os.getenv("CRAWLER_KEEPALIVE_EXPIRY_SECONDS", "30"))
+
+    # Job page parsing: BeautifulSoup tree builder ("html.parser", or "lxml" when
+    # installed) and the worker processes it runs in (0 parses on the event loop)
+    HTML_PARSER: str = os.getenv("HTML_PARSER", "html.parser").lower()
+    EXTRACTION_WORKERS: int = int(os.getenv("EXTRACTION_WORKERS", "2"))
+    EXTRACTION_QUEUE_SIZE: int = int(os.getenv("EXTRACTION_QUEUE_SIZE", "32"))
+
+    # Crawl cache: pages are served without a request while fresh, revalidated
+    # with ETag/Last-Modified after that, expired after the TTL, and evicted
+    # least recently used first beyond the size budget (compressed bytes)
+    CRAWL_CACHE_ENABLED: bool = os.getenv("CRAWL_CACHE_ENABLED", "true").lower() == "true"
+    CRAWL_CACHE_FRESH_SECONDS: int = int(os.getenv("CRAWL_CACHE_FRESH_SECONDS", "3600"))
+    CRAWL_CACHE_TTL_HOURS: int = int(os.getenv("CRAWL_CACHE_TTL_HOURS", "720"))
+    CRAWL_CACHE_MAX_MB: int = int(os.getenv("CRAWL_CACHE_MAX_MB", "256"))
+
+    # Shared job postings younger than this are reused instead of re-crawled
+    JOB_POSTING_TTL_HOURS: int = int(os.getenv("JOB_POSTING_TTL_HOURS", "168"))
+
+    # Bulk import: concurrent crawls, per-host request rate and write batch size
+    IMPORT_CRAWL_CONCURRENCY: int = int(os.getenv("IMPORT_CRAWL_CONCURRENCY", "4"))
+    IMPORT_HOST_RATE_PER_SECOND: float = float(os.getenv("IMPORT_HOST_RATE_PER_SECOND", "1.0"))
+    IMPORT_MAX_ROWS: int = int(os.getenv("IMPORT_MAX_ROWS", "1000"))
+    IMPORT_WRITE_BATCH_SIZE: int = int(os.getenv("IMPORT_WRITE_BATCH_SIZE", "50"))
+
+    # Documents fetched per cursor batch (and memory held) while streaming an export
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+    # Search: "mongo" uses text indexes, "memory" an in-process inverted index
+    SEARCH_BACKEND: str = os.getenv("SEARCH_BACKEND", "mongo").lower()
+    SEARCH_INDEX_TTL_SECONDS: int = int(os.getenv("SEARCH_INDEX_TTL_SECONDS", "900"))
+    SEARCH_INDEX_MAX_USERS: int = int(os.getenv("SEARCH_INDEX_MAX_USERS", "100"))
+
+    # Status-history entries kept on the application document; older ones are
+    # only in the application_events timeline
+    STATUS_HISTORY_INLINE_LIMIT: int = int(os.getenv("STATUS_HISTORY_INLINE_LIMIT", "10"))
+
+    # Most applications one bulk operation may touch
+    BULK_MAX_IDS: int = int(os.getenv("BULK_MAX_IDS", "500"))
+
+    # Attachments: upload size limit, and how long an unreferenced blob is kept
+    # (so re-attaching the same file right after removing it reuses the blob)
+    ATTACHMENT_MAX_BYTES: int = int(os.getenv("ATTACHMENT_MAX_BYTES", str(10 * 1024 * 1024)))
+    ATTACHMENT_GC_GRACE_SECONDS: int = int(os.getenv("ATTACHMENT_GC_GRACE_SECONDS", "3600"))
+
+    # Live updates over SSE, fed by one change stream per worker (needs a replica
+    # set; pre-images on MongoDB 6+ let deletes be routed to their owner)
+    CHANGE_FEED_ENABLED: bool = os.getenv("CHANGE_FEED_ENABLED", "true").lower() == "true"
+    CHANGE_FEED_PRE_IMAGES: bool = os.getenv("CHANGE_FEED_PRE_IMAGES", "true").lower() == "true"
+    CHANGE_FEED_BUFFER_SIZE: int = int(os.getenv("CHANGE_FEED_BUFFER_SIZE", "1000"))
+    CHANGE_FEED_CLIENT_QUEUE_SIZE: int = int(os.getenv("CHANGE_FEED_CLIENT_QUEUE_SIZE", "100"))
+    CHANGE_FEED_HEARTBEAT_SECONDS: float = float(os.getenv("CHANGE_FEED_HEARTBEAT_SECONDS", "15"))
+
 settings = Settings()
\ No newline at end of file
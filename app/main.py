@@ -1,9 +1,16 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.models.database import connect_to_mongodb, close_mongodb_connection
-from app.api import auth, applications, github
+from app.models.database import (
+    connect_to_mongodb, close_mongodb_connection, ensure_indexes, run_query_plan_audit,
+    ping_database, get_pool_stats
+)
+from app.api import auth, applications, events, github
+from app.models.monitoring import current_request_scope
+from app.utils.metrics import registry
+from app.utils.security import hashing_pool
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -17,20 +24,48 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+@app.middleware("http")
+async def attribute_mongodb_commands(request: Request, call_next):
+    """Tag MongoDB commands issued while handling a request with its route"""
+    token = current_request_scope.set(request.scope)
+    try:
+        return await call_next(request)
+    finally:
+        current_request_scope.reset(token)
+
 @app.on_event("startup")
 async def startup():
     await connect_to_mongodb()
+    await ensure_indexes()
+    if settings.QUERY_PLAN_AUDIT:
+        await run_query_plan_audit()
+    hashing_pool.start()
+    applications.linkedin_crawler.start()
+    if applications.linkedin_crawler.extraction_pool is not None:
+        applications.linkedin_crawler.extraction_pool.start()
+    applications.enrichment_workers.start()
+    if settings.CHANGE_FEED_ENABLED:
+        events.change_feed.start()
 
 @app.on_event("shutdown")
 async def shutdown():
+    await events.change_feed.stop()
+    await applications.bulk_importer.stop()
+    await applications.enrichment_workers.stop()
+    await applications.linkedin_crawler.close()
+    if applications.linkedin_crawler.extraction_pool is not None:
+        applications.linkedin_crawler.extraction_pool.shutdown()
     await close_mongodb_connection()
+    hashing_pool.shutdown()
 
 # Include API routes
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["authentication"])
 app.include_router(applications.router, prefix=f"{settings.API_V1_STR}/applications", tags=["applications"])
 app.include_router(github.router, prefix=f"{settings.API_V1_STR}/github", tags=["github"])
+app.include_router(events.router, prefix=f"{settings.API_V1_STR}/events", tags=["events"])
 
 
 @app.get("/")
@@ -39,4 +74,23 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+@app.get("/ready")
+async def readiness_check():
+    try:
+        ping_ms = await ping_database()
+    except Exception as e:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable", "error": str(e), "pool": get_pool_stats()}
+        )
+    return {"status": "ready", "ping_ms": round(ping_ms, 2), "pool": get_pool_stats()}
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "metrics": registry.snapshot(),
+        "auth_cache": auth.auth_cache_stats(),
+        "change_feed": events.change_feed.stats(),
+    }
\ No newline at end of file
@@ -2,18 +2,60 @@ from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel, Field, HttpUrl
 from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from app.config import settings
+from app.models.database import register_indexes
 from app.models.user import PyObjectId # Assuming PyObjectId is defined in user.py
 
+# Listing is keyset-paginated on (updated_at, _id) newest first, optionally
+# narrowed by status or company, so each filter gets a matching compound index
+register_indexes("applications", [
+    IndexModel(
+        [("user_id", ASCENDING), ("updated_at", DESCENDING), ("_id", DESCENDING)],
+        name="user_updated_at",
+    ),
+    IndexModel(
+        [("user_id", ASCENDING), ("status", ASCENDING), ("updated_at", DESCENDING), ("_id", DESCENDING)],
+        name="user_status_updated_at",
+    ),
+    IndexModel(
+        [("user_id", ASCENDING), ("company", ASCENDING), ("updated_at", DESCENDING), ("_id", DESCENDING)],
+        name="user_company_updated_at",
+    ),
+    # Duplicate detection for imports
+    IndexModel([("user_id", ASCENDING), ("linkedin_job_id", ASCENDING)], name="user_linkedin_job_id"),
+    # Users tracking a posting, when its shared description is refreshed
+    IndexModel([("linkedin_job_id", ASCENDING), ("user_id", ASCENDING)], name="linkedin_job_id_user"),
+])
+
+# Only created for the Mongo search backend; the in-memory backend serves
+# deployments whose server has no text search
+if settings.SEARCH_BACKEND == "mongo":
+    register_indexes("applications", [
+        IndexModel(
+            [("user_id", ASCENDING), ("title", TEXT), ("company", TEXT), ("job_description", TEXT)],
+            weights={"title": 10, "company": 5, "job_description": 1},
+            name="user_text",
+        ),
+    ])
+
 
 class StatusHistory(BaseModel):
     status: str
+    previous_status: Optional[str] = None
     changed_at: datetime = Field(default_factory=datetime.utcnow)
     notes: Optional[str] = None
 
 class Document(BaseModel):
+    # Metadata only; the bytes live in attachment_blobs, shared by every
+    # application that attaches the same file (see app.services.attachments)
+    id: Optional[str] = None
     name: str
     type: str  # "Resume", "Cover Letter"
-    content: str # Consider if storing full content here is wise, maybe path?
+    content_type: Optional[str] = None
+    size: Optional[int] = None
+    sha256: Optional[str] = None
+    content: Optional[str] = None # Legacy inline text, moved to a blob by `python -m app.services.attachments`
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 class Contact(BaseModel):
@@ -52,7 +94,11 @@ class ApplicationInDB(ApplicationBase):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
     user_id: PyObjectId
     linkedin_job_id: Optional[str] = None
+    enrichment_status: Optional[str] = None # "pending", "complete" or "failed"
+    # Latest entries only; the full history lives in application_events
     status_history: List[StatusHistory] = []
+    history_in_events: bool = True # False on documents written before events existed
+    archived_at: Optional[datetime] = None
     documents: List[Document] = []
     contacts: List[Contact] = []
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -81,6 +127,8 @@ class Application(ApplicationBase):
     id: str # Expose ID as string
     user_id: str # Expose user_id as string
     linkedin_job_id: Optional[str] = None
+    enrichment_status: Optional[str] = None
+    archived_at: Optional[datetime] = None
     status_history: List[StatusHistory] = []
     documents: List[Document] = []
     contacts: List[Contact] = []
@@ -88,4 +136,34 @@ class Application(ApplicationBase):
     updated_at: datetime
 
     class Config:
-        from_attributes = True # UPDATED from orm_mode
\ No newline at end of file
+        from_attributes = True # UPDATED from orm_mode
+
+# Fields loaded for list views that only show headline information
+SUMMARY_PROJECTION = {
+    "user_id": 1,
+    "title": 1,
+    "company": 1,
+    "location": 1,
+    "status": 1,
+    "date_posted": 1,
+    "applied_date": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "enrichment_status": 1,
+    "archived_at": 1,
+}
+
+class ApplicationSummary(BaseModel):
+    # Deliberately omits linkedin_url so a summary never validates as a full Application
+    id: str
+    user_id: str
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    status: str = "Wishlist"
+    date_posted: Optional[datetime] = None
+    applied_date: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+    enrichment_status: Optional[str] = None
+    archived_at: Optional[datetime] = None
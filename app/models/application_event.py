@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from app.models.database import register_indexes
+from app.models.user import PyObjectId
+
+APPLICATION_EVENTS_COLLECTION = "application_events"
+
+# Event types
+EVENT_CREATED = "created"
+EVENT_STATUS_CHANGED = "status_changed"
+
+register_indexes(APPLICATION_EVENTS_COLLECTION, [
+    # Timeline pages, newest first
+    IndexModel(
+        [("user_id", ASCENDING), ("application_id", ASCENDING), ("at", DESCENDING), ("_id", DESCENDING)],
+        name="user_application_at",
+    ),
+])
+
+class ApplicationEvent(BaseModel):
+    """One status transition; the collection is append-only"""
+    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    user_id: PyObjectId
+    application_id: PyObjectId
+    type: str = EVENT_STATUS_CHANGED
+    status: str
+    previous_status: Optional[str] = None
+    notes: Optional[str] = None
+    at: datetime = Field(default_factory=datetime.utcnow)
+    backfilled: bool = False # Copied from an application's embedded history
+
+    class Config:
+        populate_by_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {
+            ObjectId: str,
+            PyObjectId: str
+        }
+
+    def dict_for_mongodb(self):
+        """Convert the model to a MongoDB-compatible dict"""
+        return self.model_dump(by_alias=True)
+
+class ApplicationEventResponse(BaseModel):
+    id: str
+    application_id: str
+    type: str
+    status: str
+    previous_status: Optional[str] = None
+    notes: Optional[str] = None
+    at: datetime
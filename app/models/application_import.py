@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from app.models.database import register_indexes
+from app.models.user import PyObjectId
+
+APPLICATION_IMPORTS_COLLECTION = "application_imports"
+
+# Import lifecycle
+IMPORT_RUNNING = "running"
+IMPORT_COMPLETED = "completed"
+
+# Per-row outcomes
+ROW_PENDING = "pending"
+ROW_CREATED = "created"
+ROW_DUPLICATE = "duplicate"
+ROW_INVALID = "invalid"
+ROW_FAILED = "failed"
+
+register_indexes(APPLICATION_IMPORTS_COLLECTION, [
+    IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_created_at"),
+])
+
+class ImportRow(BaseModel):
+    row: int
+    linkedin_url: Optional[str] = None
+    fields: Dict = {} # Optional application fields supplied with the URL
+    job_id: Optional[str] = None
+    # Pre-allocated so a resumed import never inserts the same row twice
+    application_id: PyObjectId = Field(default_factory=PyObjectId)
+    result: str = ROW_PENDING
+    error: Optional[str] = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
+class ApplicationImport(BaseModel):
+    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    user_id: PyObjectId
+    status: str = IMPORT_RUNNING
+    rows: List[ImportRow] = []
+    heartbeat_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        populate_by_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {
+            ObjectId: str,
+            PyObjectId: str
+        }
+
+    def dict_for_mongodb(self):
+        """Convert the model to a MongoDB-compatible dict"""
+        return self.model_dump(by_alias=True)
+
+class ImportRowResult(BaseModel):
+    row: int
+    linkedin_url: Optional[str] = None
+    job_id: Optional[str] = None
+    result: str
+    application_id: Optional[str] = None
+    error: Optional[str] = None
+
+class ApplicationImportResponse(BaseModel):
+    id: str
+    status: str
+    total: int
+    counts: Dict[str, int]
+    rows: List[ImportRowResult]
+    created_at: datetime
+    updated_at: datetime
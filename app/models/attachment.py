@@ -0,0 +1,21 @@
+from pymongo import ASCENDING, IndexModel
+from app.models.database import register_indexes
+
+# Content-addressed attachment storage: one blob per distinct sha256 (the
+# blob _id), its bytes split across chunk documents. Applications embed only
+# metadata and the hash, and each embedded reference counts towards `refs`.
+ATTACHMENT_BLOBS_COLLECTION = "attachment_blobs"
+ATTACHMENT_CHUNKS_COLLECTION = "attachment_chunks"
+
+register_indexes(ATTACHMENT_BLOBS_COLLECTION, [
+    # Unreferenced blobs due for collection
+    IndexModel([("refs", ASCENDING), ("released_at", ASCENDING)], name="refs_released_at"),
+])
+
+register_indexes(ATTACHMENT_CHUNKS_COLLECTION, [
+    # Ranged reads, and idempotent chunk writes from concurrent uploads
+    IndexModel(
+        [("blob_id", ASCENDING), ("generation", ASCENDING), ("n", ASCENDING)],
+        unique=True, name="blob_generation_n_unique",
+    ),
+])
@@ -0,0 +1,14 @@
+from pymongo import ASCENDING, IndexModel
+from app.models.database import register_indexes
+
+CRAWL_CACHE_COLLECTION = "crawl_cache"
+# One running total of the entries' sizes, so checking the byte budget is a single read
+CRAWL_CACHE_USAGE_COLLECTION = "crawl_cache_usage"
+
+register_indexes(CRAWL_CACHE_COLLECTION, [
+    # MongoDB drops entries once expires_at passes
+    IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+    # Least recently used first when over the size budget; with size in the
+    # key the occasional recount of the byte total reads only the index
+    IndexModel([("last_used_at", ASCENDING), ("size", ASCENDING)], name="last_used_at_size"),
+])
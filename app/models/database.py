@@ -1,19 +1,150 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
 from app.config import settings
+from app.models.monitoring import CommandTimingListener, pool_stats
 
 class Database:
     client: AsyncIOMotorClient = None
-    
+
 db = Database()
 
+# Indexes contributed by each model module, keyed by collection name
+index_registry: Dict[str, List[IndexModel]] = {}
+
+# Query shapes used by the routers, audited with explain() when enabled
+query_shapes: List[Dict[str, Any]] = []
+
+def register_indexes(collection: str, indexes: List[IndexModel]):
+    """Declare indexes for a collection; they are created at startup"""
+    index_registry.setdefault(collection, []).extend(indexes)
+
+def register_query_shape(name: str, collection: str, filter: dict, sort: Optional[list] = None):
+    """Declare a query shape (with placeholder values) for the query-plan audit"""
+    query_shapes.append({
+        "name": name,
+        "collection": collection,
+        "filter": filter,
+        "sort": sort,
+    })
+
 async def connect_to_mongodb():
-    db.client = AsyncIOMotorClient(settings.MONGODB_URL)
-    print("Connected to MongoDB")
+    db.client = AsyncIOMotorClient(
+        settings.MONGODB_URL,
+        minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+        maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+        waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        event_listeners=[
+            pool_stats,
+            CommandTimingListener(settings.MONGODB_SLOW_COMMAND_MS),
+        ],
+    )
+    await warm_up_pool()
+    print(f"Connected to MongoDB ({pool_stats.stats()['open']} pooled connections)")
+
+async def warm_up_pool():
+    """Open min pool size connections up front with concurrent pings"""
+    pings = max(1, settings.MONGODB_MIN_POOL_SIZE)
+    await asyncio.gather(*(db.client.admin.command("ping") for _ in range(pings)))
+
+async def ping_database() -> float:
+    """Ping the server and return the round-trip latency in milliseconds"""
+    start = time.perf_counter()
+    await db.client.admin.command("ping")
+    return (time.perf_counter() - start) * 1000
+
+def get_pool_stats() -> Dict[str, int]:
+    return {
+        **pool_stats.stats(),
+        "min_pool_size": settings.MONGODB_MIN_POOL_SIZE,
+        "max_pool_size": settings.MONGODB_MAX_POOL_SIZE,
+    }
 
 async def close_mongodb_connection():
     if db.client:
         db.client.close()
         print("Closed MongoDB connection")
 
+DUPLICATE_KEY = 11000
+
+async def _duplicate_keys(collection, index: IndexModel, limit: int = 5) -> List[dict]:
+    """Key values shared by more than one document, which block a unique index"""
+    fields = list(index.document["key"])
+    pipeline = [
+        {"$group": {"_id": {f.replace(".", "_"): f"${f}" for f in fields}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+        {"$limit": limit},
+    ]
+    return await collection.aggregate(pipeline).to_list(length=limit)
+
+async def ensure_indexes():
+    """Create every registered index; safe to run on each startup.
+
+    Data written before a unique index existed may violate it; startup then
+    fails naming the index and some duplicate keys instead of a bare E11000.
+    """
+    database = get_database()
+    for collection, indexes in index_registry.items():
+        if not indexes:
+            continue
+        try:
+            await database[collection].create_indexes(indexes)
+        except OperationFailure as e:
+            if e.code != DUPLICATE_KEY:
+                raise
+            problems = []
+            for index in indexes:
+                if index.document.get("unique"):
+                    duplicates = await _duplicate_keys(database[collection], index)
+                    if duplicates:
+                        keys = ", ".join(str(d["_id"]) for d in duplicates)
+                        problems.append(f"{index.document['name']} (e.g. {keys})")
+            raise RuntimeError(
+                f"Cannot create unique indexes on {collection}: duplicate documents for "
+                f"{'; '.join(problems) or e}. Remove the duplicates and restart "
+                "(see 'Unique indexes' in the README)."
+            ) from e
+    print(f"Ensured MongoDB indexes for {len(index_registry)} collections")
+
+def _plan_stages(plan: Any) -> List[str]:
+    """Collect every stage name in an explain() plan tree"""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+async def audit_query_plans() -> List[str]:
+    """Explain every registered query shape and return those that COLLSCAN"""
+    database = get_database()
+    offenders = []
+    for shape in query_shapes:
+        cursor = database[shape["collection"]].find(shape["filter"])
+        if shape["sort"]:
+            cursor = cursor.sort(shape["sort"])
+        explanation = await cursor.explain()
+        winning_plan = explanation.get("queryPlanner", {}).get("winningPlan", {})
+        if "COLLSCAN" in _plan_stages(winning_plan):
+            offenders.append(shape["name"])
+    return offenders
+
+async def run_query_plan_audit():
+    """Fail startup if any registered query shape is a collection scan"""
+    offenders = await audit_query_plans()
+    if offenders:
+        raise RuntimeError(
+            f"Query plan audit failed, collection scans for: {', '.join(offenders)}"
+        )
+    print(f"Query plan audit passed for {len(query_shapes)} query shapes")
+
 def get_database():
-    return db.client[settings.DATABASE_NAME]
\ No newline at end of file
+    return db.client[settings.DATABASE_NAME]
@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
+from app.models.database import register_indexes
+from app.models.user import PyObjectId
+
+ENRICHMENT_TASKS_COLLECTION = "enrichment_tasks"
+
+# Task lifecycle: queued -> running -> done | failed (running tasks whose lease
+# expired, e.g. after a restart, are claimed again)
+TASK_QUEUED = "queued"
+TASK_RUNNING = "running"
+TASK_DONE = "done"
+TASK_FAILED = "failed"
+
+register_indexes(ENRICHMENT_TASKS_COLLECTION, [
+    IndexModel([("application_id", ASCENDING)], unique=True, name="application_id_unique"),
+    IndexModel([("status", ASCENDING), ("available_at", ASCENDING)], name="status_available_at"),
+    IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)], name="status_lease_expires_at"),
+    # Finished tasks are kept a week for status polling, then expire
+    IndexModel([("finished_at", ASCENDING)], expireAfterSeconds=7 * 24 * 3600, name="finished_at_ttl"),
+])
+
+class EnrichmentTask(BaseModel):
+    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    application_id: PyObjectId
+    user_id: PyObjectId
+    linkedin_url: str
+    status: str = TASK_QUEUED
+    attempts: int = 0
+    last_error: Optional[str] = None
+    available_at: datetime = Field(default_factory=datetime.utcnow)
+    lease_expires_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        populate_by_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {
+            ObjectId: str,
+            PyObjectId: str
+        }
+
+    def dict_for_mongodb(self):
+        """Convert the model to a MongoDB-compatible dict"""
+        return self.model_dump(by_alias=True)
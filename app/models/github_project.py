@@ -2,8 +2,15 @@ from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel, Field, HttpUrl
 from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from app.models.database import register_indexes
 from app.models.user import PyObjectId
 
+register_indexes("github_projects", [
+    IndexModel([("user_id", ASCENDING), ("github_id", ASCENDING)], unique=True, name="user_github_id_unique"),
+    IndexModel([("user_id", ASCENDING), ("last_commit_date", DESCENDING)], name="user_last_commit_date"),
+])
+
 class GitHubProject(BaseModel):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
     user_id: PyObjectId
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Dict, Optional
+from pydantic import BaseModel, Field
+from pymongo import TEXT, IndexModel
+from app.config import settings
+from app.models.database import register_indexes
+
+JOB_POSTINGS_COLLECTION = "job_postings"
+
+# Postings are keyed by LinkedIn job ID and only looked up by _id
+register_indexes(JOB_POSTINGS_COLLECTION, [])
+if settings.SEARCH_BACKEND == "mongo":
+    register_indexes(JOB_POSTINGS_COLLECTION, [
+        IndexModel([("job_description", TEXT)], name="job_description_text"),
+    ])
+
+class JobPosting(BaseModel):
+    """A crawled LinkedIn posting shared by every application that tracks it"""
+    id: str = Field(alias="_id") # The LinkedIn job ID
+    linkedin_url: str
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    job_description: Optional[str] = None
+    date_posted: Optional[datetime] = None
+    field_sources: Dict[str, Optional[str]] = {} # "json_ld" or "selectors" per field, from the last crawl
+    fetched_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        populate_by_name = True
@@ -0,0 +1,169 @@
+import logging
+import threading
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+from pymongo import monitoring
+
+from app.utils.metrics import registry
+
+logger = logging.getLogger("mongodb")
+
+# ASGI scope of the request currently being handled, set by middleware in app.main.
+# The router records the matched endpoint in the same scope once routing is done.
+current_request_scope: ContextVar[Optional[dict]] = ContextVar("current_request_scope", default=None)
+
+command_seconds = registry.histogram(
+    "mongodb_command_seconds",
+    "MongoDB command duration by route, command and collection",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+command_failures = registry.counter(
+    "mongodb_command_failures_total", "MongoDB commands that returned an error"
+)
+
+# Where each command keeps the filter worth logging for slow commands
+_FILTER_FIELDS = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+    "aggregate": "pipeline",
+}
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Tracks open and checked-out connections across the client's pools"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open_connections = 0
+        self.checked_out = 0
+        self.checkout_failures = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "open": self.open_connections,
+                "checked_out": self.checked_out,
+                "available": max(0, self.open_connections - self.checked_out),
+                "checkout_failures": self.checkout_failures,
+            }
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections = max(0, self.open_connections - 1)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checked_out += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+
+def current_route() -> str:
+    """Endpoint handling the current request (e.g. 'GET auth.read_users_me'), or 'background'"""
+    scope = current_request_scope.get()
+    if scope is None:
+        return "background"
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return f"{scope.get('method')} <unmatched>"
+    module = getattr(endpoint, "__module__", "").rsplit(".", 1)[-1]
+    return f"{scope.get('method')} {module}.{getattr(endpoint, '__name__', endpoint)}"
+
+
+def redact(value: Any) -> Any:
+    """Keep the keys and operators of a filter but replace every value with '?'"""
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(value[0])] if value else []
+    return "?"
+
+
+def _filter_shape(command_name: str, command: dict) -> Optional[Any]:
+    field = _FILTER_FIELDS.get(command_name)
+    if field is not None:
+        return redact(command.get(field))
+    if command_name in ("update", "delete"):
+        statements = command.get(command_name + "s") or []
+        if statements:
+            return redact(statements[0].get("q"))
+    return None
+
+
+def _collection_name(command_name: str, command: dict) -> str:
+    if command_name == "getMore":
+        return str(command.get("collection", ""))
+    target = command.get(command_name)
+    return target if isinstance(target, str) else ""
+
+
+class CommandTimingListener(monitoring.CommandListener):
+    """Records per-route command durations and logs slow commands"""
+
+    def __init__(self, slow_command_ms: float):
+        self.slow_command_ms = slow_command_ms
+        self._started: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        key = (event.connection_id, event.request_id)
+        collection = _collection_name(event.command_name, event.command)
+        with self._lock:
+            self._started[key] = (current_route(), collection, event.command)
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        command_failures.inc(command=event.command_name)
+        self._finish(event)
+
+    def _finish(self, event):
+        with self._lock:
+            started = self._started.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+        route, collection, command = started
+        seconds = event.duration_micros / 1_000_000
+        command_seconds.observe(
+            seconds, route=route, command=event.command_name, collection=collection
+        )
+        if seconds * 1000 >= self.slow_command_ms:
+            logger.warning(
+                f"Slow MongoDB command {event.command_name} on {collection or '-'} "
+                f"took {seconds * 1000:.1f}ms (route: {route}, "
+                f"filter: {_filter_shape(event.command_name, command)})"
+            )
+
+
+pool_stats = PoolStatsListener()
@@ -2,6 +2,8 @@ from pydantic import GetCoreSchemaHandler, GetJsonSchemaHandler
 from pydantic.json_schema import JsonSchemaValue
 from pydantic_core import core_schema
 from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
+from app.models.database import register_indexes
 from typing import Any
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
@@ -64,4 +66,10 @@ class User(UserBase):
     created_at: datetime
 
     class Config:
-        from_attributes = True # UPDATED from orm_mode
\ No newline at end of file
+        from_attributes = True # UPDATED from orm_mode
+
+# Unique indexes back registration: a single insert is enough to reject duplicates
+register_indexes("users", [
+    IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+    IndexModel([("username", ASCENDING)], unique=True, name="username_unique"),
+])
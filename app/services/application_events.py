@@ -0,0 +1,99 @@
+from typing import List, Optional
+
+from bson import ObjectId
+
+from app.models.application_event import (
+    APPLICATION_EVENTS_COLLECTION, ApplicationEvent, EVENT_CREATED, EVENT_STATUS_CHANGED
+)
+from app.models.database import register_query_shape
+
+# Applications with this flag have their full history in application_events,
+# so the embedded status_history may be trimmed to the latest entries
+HISTORY_FLAG = "history_in_events"
+
+TIMELINE_SORT = [("at", -1), ("_id", -1)]
+
+register_query_shape(
+    "application_events.timeline", APPLICATION_EVENTS_COLLECTION,
+    {"user_id": ObjectId(), "application_id": ObjectId()}, sort=TIMELINE_SORT,
+)
+
+
+def event_from_history(application: dict, entry: dict, event_type: str = EVENT_STATUS_CHANGED, backfilled: bool = False) -> dict:
+    return ApplicationEvent(
+        user_id=application["user_id"],
+        application_id=application["_id"],
+        type=event_type,
+        status=entry["status"],
+        previous_status=entry.get("previous_status"),
+        notes=entry.get("notes"),
+        at=entry["changed_at"],
+        backfilled=backfilled,
+    ).dict_for_mongodb()
+
+
+async def record_created(db, applications: List[dict]):
+    """Append the initial-status event for newly inserted applications"""
+    events = [
+        event_from_history(app, app["status_history"][0], EVENT_CREATED)
+        for app in applications
+        if app.get("status_history")
+    ]
+    if events:
+        await db[APPLICATION_EVENTS_COLLECTION].insert_many(events, ordered=False)
+
+
+async def record_status_change(db, application: dict):
+    """Append the newest embedded history entry as a status_changed event"""
+    await db[APPLICATION_EVENTS_COLLECTION].insert_one(
+        event_from_history(application, application["status_history"][-1])
+    )
+
+
+async def delete_for_application(db, user_id: ObjectId, application_id: ObjectId):
+    await db[APPLICATION_EVENTS_COLLECTION].delete_many(
+        {"user_id": user_id, "application_id": application_id}
+    )
+
+
+async def ensure_backfilled(db, application: dict, attempts: int = 3) -> bool:
+    """Copy the embedded history of an application written before events existed.
+
+    Earlier backfill attempts are removed first, so an interrupted run can
+    simply be repeated. The application is flagged only if its history did not
+    grow meanwhile; from then on updates record events and trim the history.
+    """
+    collection = db[APPLICATION_EVENTS_COLLECTION]
+    selector = {"user_id": application["user_id"], "application_id": application["_id"]}
+    for _ in range(attempts):
+        if application.get(HISTORY_FLAG):
+            return True
+        history = application.get("status_history") or []
+        await collection.delete_many({**selector, "backfilled": True})
+        if history:
+            await collection.insert_many([
+                event_from_history(application, entry, EVENT_CREATED if i == 0 else EVENT_STATUS_CHANGED, backfilled=True)
+                for i, entry in enumerate(history)
+            ])
+        result = await db.applications.update_one(
+            {"_id": application["_id"], "user_id": application["user_id"], "status_history": {"$size": len(history)}},
+            {"$set": {HISTORY_FLAG: True}},
+        )
+        if result.modified_count:
+            return True
+        application = await db.applications.find_one(
+            {"_id": application["_id"], "user_id": application["user_id"]},
+            {"user_id": 1, "status_history": 1, HISTORY_FLAG: 1},
+        )
+        if application is None:
+            return False
+    return False
+
+
+async def timeline_page(db, user_id: ObjectId, application_id: ObjectId, limit: int, after: Optional[dict] = None) -> List[dict]:
+    query = {"user_id": user_id, "application_id": application_id}
+    if after:
+        query = {"$and": [query, after]}
+    return await db[APPLICATION_EVENTS_COLLECTION].find(query).sort(
+        TIMELINE_SORT
+    ).limit(limit).to_list(length=limit)
@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+
+from bson import ObjectId
+
+from app.services import job_postings
+
+# Columns a user may export, in default output order
+EXPORT_COLUMNS = [
+    "id",
+    "linkedin_url",
+    "linkedin_job_id",
+    "title",
+    "company",
+    "location",
+    "status",
+    "date_posted",
+    "applied_date",
+    "notes",
+    "job_description",
+    "enrichment_status",
+    "created_at",
+    "updated_at",
+]
+# job_description is opt-in: it is by far the largest field
+DEFAULT_EXPORT_COLUMNS = [c for c in EXPORT_COLUMNS if c != "job_description"]
+
+EXPORT_SORT = [("updated_at", -1), ("_id", -1)]
+
+
+def parse_columns(value: Optional[str]) -> List[str]:
+    """Parse a comma-separated column list, rejecting unknown names"""
+    if not value:
+        return list(DEFAULT_EXPORT_COLUMNS)
+    columns = [c.strip() for c in value.split(",") if c.strip()]
+    unknown = [c for c in columns if c not in EXPORT_COLUMNS]
+    if unknown or not columns:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}" if unknown else "No columns selected")
+    return columns
+
+
+def _projection(columns: List[str]) -> dict:
+    projection = {("_id" if c == "id" else c): 1 for c in columns}
+    if "job_description" in columns:
+        projection["linkedin_job_id"] = 1
+    return projection
+
+
+def _value(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _row(doc: dict, columns: List[str]) -> list:
+    return [_value(doc.get("_id" if c == "id" else c)) for c in columns]
+
+
+async def iter_batches(db, query: dict, columns: List[str], batch_size: int) -> AsyncIterator[List[dict]]:
+    """Yield projected documents one cursor batch at a time"""
+    cursor = db.applications.find(query, _projection(columns)).sort(EXPORT_SORT).batch_size(batch_size)
+    while True:
+        batch = await cursor.to_list(length=batch_size)
+        if not batch:
+            return
+        if "job_description" in columns:
+            await job_postings.attach_job_descriptions(db, batch)
+        yield batch
+
+
+async def ndjson_chunks(batches: AsyncIterator[List[dict]], columns: List[str]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        lines = (json.dumps(dict(zip(columns, _row(doc, columns))), ensure_ascii=False) for doc in batch)
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def csv_chunks(batches: AsyncIterator[List[dict]], columns: List[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for batch in batches:
+        writer.writerows(_row(doc, columns) for doc in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, for an empty export
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream incrementally into a single gzip member"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
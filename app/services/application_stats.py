@@ -0,0 +1,173 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+STATS_COLLECTION = "application_stats"
+RECENT_ACTIVITY_LIMIT = 10
+
+ACTIVE_STATUSES = [
+    "Wishlist",
+    "Applied",
+    "Screening",
+    "Interview",
+    "Technical Test",
+    "Final Interview",
+    "Offer",
+]
+INTERVIEW_STATUSES = ["Interview", "Technical Test", "Final Interview"]
+
+
+def week_key(moment: datetime) -> str:
+    """ISO week bucket, e.g. '2026-W07' (matches $dateToString '%G-W%V')"""
+    return moment.strftime("%G-W%V")
+
+
+def _field_key(value: str) -> str:
+    """Make a user-supplied value safe to use as a sub-document key"""
+    return (value or "Unknown").replace(".", "_").lstrip("$") or "Unknown"
+
+
+def _activity_entry(application: dict, action: str, at: datetime) -> dict:
+    return {
+        "application_id": application["_id"],
+        "title": application.get("title"),
+        "company": application.get("company"),
+        "status": application.get("status"),
+        "linkedin_url": application.get("linkedin_url"),
+        "applied_date": application.get("applied_date"),
+        "action": action,
+        "at": at,
+    }
+
+
+async def _apply(db, user_id: ObjectId, update: dict):
+    # No upsert: the document is only created by a full rebuild, so a user's
+    # pre-existing applications are never missing from the counts
+    update.setdefault("$set", {})["updated_at"] = datetime.utcnow()
+    await db[STATS_COLLECTION].update_one({"_id": user_id}, update)
+
+
+async def record_created(db, application: dict):
+    """Count a newly inserted application"""
+    await _apply(db, application["user_id"], {
+        "$inc": {
+            "total": 1,
+            f"by_status.{_field_key(application.get('status'))}": 1,
+            f"by_week.{week_key(application['created_at'])}": 1,
+        },
+        "$push": {
+            "recent_activity": {
+                "$each": [_activity_entry(application, "created", application["created_at"])],
+                "$slice": -RECENT_ACTIVITY_LIMIT,
+            }
+        },
+    })
+
+
+async def record_updated(db, application: dict, previous_status: Optional[str] = None):
+    """Record an update; moves the status count when the status changed"""
+    update: Dict[str, Any] = {
+        "$push": {
+            "recent_activity": {
+                "$each": [_activity_entry(application, "updated", application["updated_at"])],
+                "$slice": -RECENT_ACTIVITY_LIMIT,
+            }
+        },
+    }
+    previous_key = _field_key(previous_status) if previous_status is not None else None
+    if previous_key is not None and previous_key != _field_key(application.get("status")):
+        update["$inc"] = {
+            f"by_status.{previous_key}": -1,
+            f"by_status.{_field_key(application.get('status'))}": 1,
+        }
+    await _apply(db, application["user_id"], update)
+
+
+async def record_deleted(db, application: dict):
+    """Remove a deleted application from the counters"""
+    await _apply(db, application["user_id"], {
+        "$inc": {
+            "total": -1,
+            f"by_status.{_field_key(application.get('status'))}": -1,
+            f"by_week.{week_key(application['created_at'])}": -1,
+        },
+        "$pull": {"recent_activity": {"application_id": application["_id"]}},
+    })
+
+
+async def rebuild_stats(db, user_id: ObjectId) -> dict:
+    """Recompute the counters document from the applications collection"""
+    pipeline = [
+        {"$match": {"user_id": user_id}},
+        {"$facet": {
+            "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+            "by_week": [{"$group": {
+                "_id": {"$dateToString": {"format": "%G-W%V", "date": "$created_at"}},
+                "count": {"$sum": 1},
+            }}],
+            "recent": [
+                {"$sort": {"updated_at": -1, "_id": -1}},
+                {"$limit": RECENT_ACTIVITY_LIMIT},
+                {"$project": {
+                    "title": 1, "company": 1, "status": 1, "linkedin_url": 1,
+                    "applied_date": 1, "created_at": 1, "updated_at": 1,
+                }},
+            ],
+        }},
+    ]
+    result = await db.applications.aggregate(pipeline).to_list(length=1)
+    facets = result[0] if result else {"by_status": [], "by_week": [], "recent": []}
+
+    by_status = {_field_key(row["_id"]): row["count"] for row in facets["by_status"]}
+    stats = {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "by_week": {row["_id"]: row["count"] for row in facets["by_week"] if row["_id"]},
+        "recent_activity": [
+            _activity_entry(
+                app,
+                "created" if app["updated_at"] == app["created_at"] else "updated",
+                app["updated_at"],
+            )
+            for app in reversed(facets["recent"])
+        ],
+        "updated_at": datetime.utcnow(),
+    }
+    return await db[STATS_COLLECTION].find_one_and_replace(
+        {"_id": user_id}, stats, upsert=True, return_document=ReturnDocument.AFTER
+    )
+
+
+async def get_stats(db, user_id: ObjectId, rebuild: bool = False) -> dict:
+    """Read the counters document, rebuilding it when missing or requested"""
+    stats = None if rebuild else await db[STATS_COLLECTION].find_one({"_id": user_id})
+    if stats is None or "total" not in stats:
+        stats = await rebuild_stats(db, user_id)
+    return summarize(stats)
+
+
+def summarize(stats: dict) -> dict:
+    """Shape a counters document for the API (drops zero buckets, newest activity first)"""
+    by_status = {k: v for k, v in stats.get("by_status", {}).items() if v > 0}
+    by_week = {k: v for k, v in sorted(stats.get("by_week", {}).items()) if v > 0}
+
+    # Newest first, one entry per application
+    recent: List[dict] = []
+    seen = set()
+    for entry in reversed(stats.get("recent_activity", [])):
+        if entry["application_id"] in seen:
+            continue
+        seen.add(entry["application_id"])
+        recent.append({**entry, "application_id": str(entry["application_id"])})
+
+    return {
+        "total": max(0, stats.get("total", 0)),
+        "active": sum(by_status.get(_field_key(s), 0) for s in ACTIVE_STATUSES),
+        "interview_stage": sum(by_status.get(_field_key(s), 0) for s in INTERVIEW_STATUSES),
+        "by_status": by_status,
+        "by_week": by_week,
+        "recent_activity": recent,
+        "updated_at": stats.get("updated_at"),
+    }
@@ -0,0 +1,276 @@
+import asyncio
+import hashlib
+import io
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import AsyncIterator, BinaryIO, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.config import settings
+from app.models.application import Document
+from app.models.attachment import ATTACHMENT_BLOBS_COLLECTION, ATTACHMENT_CHUNKS_COLLECTION
+from app.models.database import (
+    close_mongodb_connection, connect_to_mongodb, get_database, register_query_shape
+)
+from app.services import collection_versions
+
+CHUNK_SIZE = 255 * 1024  # same as GridFS, keeps each chunk document well under 16MB
+INLINE_CONTENT_TYPE = "text/plain; charset=utf-8"
+
+register_query_shape("attachment_blobs.by_hash", ATTACHMENT_BLOBS_COLLECTION, {"_id": "0" * 64, "complete": True})
+register_query_shape(
+    "attachment_blobs.unreferenced", ATTACHMENT_BLOBS_COLLECTION,
+    {"refs": {"$lte": 0}, "released_at": {"$lt": datetime.utcnow()}},
+)
+register_query_shape(
+    "attachment_chunks.range", ATTACHMENT_CHUNKS_COLLECTION,
+    {"blob_id": "0" * 64, "generation": ObjectId(), "n": {"$gte": 0, "$lte": 1}}, sort=[("n", 1)],
+)
+
+
+class AttachmentTooLarge(Exception):
+    pass
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def hash_file(source: BinaryIO, max_bytes: int) -> Tuple[str, int]:
+    """sha256 and size of a file, rewound afterwards"""
+    digest = hashlib.sha256()
+    size = 0
+    source.seek(0)
+    while True:
+        data = source.read(CHUNK_SIZE)
+        if not data:
+            break
+        size += len(data)
+        if size > max_bytes:
+            raise AttachmentTooLarge(f"Attachments are limited to {max_bytes} bytes")
+        digest.update(data)
+    source.seek(0)
+    return digest.hexdigest(), size
+
+
+async def _acquire(db, sha256: str, size: int, content_type: str) -> dict:
+    """Add a reference to a blob, creating its record if this is new content"""
+    update = {
+        "$inc": {"refs": 1},
+        "$unset": {"released_at": ""},
+        "$setOnInsert": {
+            "size": size,
+            "content_type": content_type,
+            "chunk_size": CHUNK_SIZE,
+            "generation": ObjectId(),
+            "complete": False,
+            "created_at": datetime.utcnow(),
+        },
+    }
+    for attempt in range(2):
+        try:
+            return await db[ATTACHMENT_BLOBS_COLLECTION].find_one_and_update(
+                {"_id": sha256}, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Lost an upsert race with an identical upload; the retry matches its record
+            if attempt:
+                raise
+
+
+async def _write_chunks(db, blob: dict, source: BinaryIO):
+    n = 0
+    batch = []
+    while True:
+        data = source.read(blob["chunk_size"])
+        if not data:
+            break
+        batch.append({"blob_id": blob["_id"], "generation": blob["generation"], "n": n, "data": data})
+        n += 1
+        if len(batch) == 16:
+            await _insert_chunks(db, batch)
+            batch = []
+    if batch:
+        await _insert_chunks(db, batch)
+
+
+async def _insert_chunks(db, chunks: List[dict]):
+    try:
+        await db[ATTACHMENT_CHUNKS_COLLECTION].insert_many(chunks, ordered=False)
+    except BulkWriteError as e:
+        # A concurrent upload of the same content already wrote these chunks
+        if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+            raise
+
+
+async def put_blob(db, source: BinaryIO, content_type: str, max_bytes: int = None) -> dict:
+    """Store file content once per sha256 and take a reference to it.
+
+    Content that is already stored only costs the hashing pass (run in a
+    thread, off the event loop) and one upsert; the chunks are written for
+    new content only.
+    """
+    sha256, size = await asyncio.to_thread(hash_file, source, max_bytes or settings.ATTACHMENT_MAX_BYTES)
+    blob = await _acquire(db, sha256, size, content_type)
+    if not blob["complete"]:
+        await _write_chunks(db, blob, source)
+        blob = await db[ATTACHMENT_BLOBS_COLLECTION].find_one_and_update(
+            {"_id": sha256}, {"$set": {"complete": True}}, return_document=ReturnDocument.AFTER
+        )
+    return blob
+
+
+async def release_blobs(db, hashes: Iterable[Optional[str]]):
+    """Drop references; blobs left unreferenced past the grace period are deleted"""
+    now = datetime.utcnow()
+    counts = Counter(h for h in hashes if h)
+    for sha256, count in counts.items():
+        await db[ATTACHMENT_BLOBS_COLLECTION].update_one({"_id": sha256}, {"$inc": {"refs": -count}})
+    if counts:
+        await db[ATTACHMENT_BLOBS_COLLECTION].update_many(
+            {"_id": {"$in": list(counts)}, "refs": {"$lte": 0}, "released_at": None},
+            {"$set": {"released_at": now}},
+        )
+    await collect_garbage(db, now - timedelta(seconds=settings.ATTACHMENT_GC_GRACE_SECONDS))
+
+
+async def collect_garbage(db, released_before: datetime, limit: int = 100):
+    """Delete blobs unreferenced since before the cutoff.
+
+    The blob record goes first, atomically conditioned on still having no
+    references; an upload racing with this creates a new record with a new
+    generation, so only the old generation's chunks are removed.
+    """
+    stale = db[ATTACHMENT_BLOBS_COLLECTION].find(
+        {"refs": {"$lte": 0}, "released_at": {"$lt": released_before}}, {"_id": 1}
+    ).limit(limit)
+    async for candidate in stale:
+        blob = await db[ATTACHMENT_BLOBS_COLLECTION].find_one_and_delete(
+            {"_id": candidate["_id"], "refs": {"$lte": 0}}
+        )
+        if blob is not None:
+            await db[ATTACHMENT_CHUNKS_COLLECTION].delete_many(
+                {"blob_id": blob["_id"], "generation": blob["generation"]}
+            )
+
+
+async def get_blob(db, sha256: str) -> Optional[dict]:
+    return await db[ATTACHMENT_BLOBS_COLLECTION].find_one({"_id": sha256, "complete": True})
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Inclusive (start, end) for a single `bytes=` range, or None to send everything.
+
+    Multiple ranges are answered with the whole file, which RFC 9110 allows.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                raise RangeNotSatisfiable()
+            return max(0, size - suffix), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+async def iter_blob(db, blob: dict, start: int, end: int) -> AsyncIterator[bytes]:
+    """Yield the bytes start..end (inclusive), reading only the chunks they span"""
+    chunk_size = blob["chunk_size"]
+    cursor = db[ATTACHMENT_CHUNKS_COLLECTION].find(
+        {
+            "blob_id": blob["_id"],
+            "generation": blob["generation"],
+            "n": {"$gte": start // chunk_size, "$lte": end // chunk_size},
+        },
+        {"_id": 0, "n": 1, "data": 1},
+    ).sort("n", 1)
+    async for chunk in cursor:
+        offset = chunk["n"] * chunk_size
+        data = chunk["data"][max(0, start - offset):end - offset + 1]
+        if data:
+            yield bytes(data)
+
+
+def document_metadata(name: str, doc_type: str, blob: dict, content_type: str) -> dict:
+    return Document(
+        id=str(ObjectId()),
+        name=name,
+        type=doc_type,
+        content_type=content_type,
+        size=blob["size"],
+        sha256=blob["_id"],
+    ).model_dump(exclude_none=True)
+
+
+async def offload_inline_documents(db, application: dict) -> dict:
+    """Move documents stored inline (before attachments existed) into blobs.
+
+    The documents array is swapped only if nobody changed it meanwhile;
+    otherwise the references taken here are released again.
+    """
+    documents = application.get("documents") or []
+    if not any(doc.get("content") is not None for doc in documents):
+        return application
+
+    moved, taken = [], []
+    for doc in documents:
+        if doc.get("content") is None:
+            moved.append(doc)
+            continue
+        # Inline text predates the size limit, so it is moved whatever its length
+        blob = await put_blob(db, io.BytesIO(doc["content"].encode("utf-8")), INLINE_CONTENT_TYPE, max_bytes=2 ** 62)
+        taken.append(blob["_id"])
+        metadata = document_metadata(doc["name"], doc["type"], blob, INLINE_CONTENT_TYPE)
+        metadata["created_at"] = doc.get("created_at", metadata["created_at"])
+        moved.append(metadata)
+
+    result = await db.applications.update_one(
+        {"_id": application["_id"], "documents": documents}, {"$set": {"documents": moved}}
+    )
+    if result.modified_count:
+        application["documents"] = moved
+        await collection_versions.bump_version(db, application["user_id"], collection_versions.APPLICATIONS)
+    else:
+        await release_blobs(db, taken)
+    return application
+
+
+async def backfill_inline_documents(db) -> int:
+    """One-off migration of every application that still has inline documents"""
+    moved = 0
+    cursor = db.applications.find({"documents.content": {"$type": "string"}}, {"user_id": 1, "documents": 1})
+    async for application in cursor:
+        application = await offload_inline_documents(db, application)
+        if all(doc.get("content") is None for doc in application["documents"]):
+            moved += 1
+    return moved
+
+
+async def _backfill():
+    await connect_to_mongodb()
+    try:
+        moved = await backfill_inline_documents(get_database())
+        print(f"Moved inline documents of {moved} applications into attachment storage")
+    finally:
+        await close_mongodb_connection()
+
+
+if __name__ == "__main__":
+    # python -m app.services.attachments
+    asyncio.run(_backfill())
@@ -0,0 +1,338 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from bson import ObjectId
+from pydantic import ValidationError
+from pymongo import InsertOne, ReturnDocument
+from pymongo.errors import BulkWriteError
+
+from app.models.application import ApplicationCreate, ApplicationInDB, StatusHistory
+from app.models.application_import import (
+    APPLICATION_IMPORTS_COLLECTION, ApplicationImport, ImportRow,
+    IMPORT_RUNNING, IMPORT_COMPLETED,
+    ROW_PENDING, ROW_CREATED, ROW_DUPLICATE, ROW_INVALID, ROW_FAILED
+)
+from app.services import application_events, application_stats, collection_versions, job_postings
+from app.services.enrichment_worker import ENRICHED_FIELDS, ENRICHMENT_COMPLETE, ENRICHMENT_PENDING
+
+logger = logging.getLogger("bulk_import")
+
+# An import whose runner has not written progress for this long is considered
+# abandoned (e.g. the worker restarted) and may be resumed
+HEARTBEAT_TIMEOUT_SECONDS = 120
+# Written by the runner independently of progress, since one slow batch of
+# crawls can take longer than the timeout
+HEARTBEAT_INTERVAL_SECONDS = 30
+
+
+class HostRateLimiter:
+    """Spaces out requests to the same host to at most `per_second`"""
+
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, url: str):
+        if not self.interval:
+            return
+        host = urlparse(url).hostname or ""
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def parse_import_body(body: bytes, content_type: str) -> List[Dict[str, Any]]:
+    """Read raw rows from a CSV upload or a JSON list (of URLs or objects)"""
+    text = body.decode("utf-8-sig")
+    if "csv" in content_type:
+        return [dict(row) for row in csv.DictReader(io.StringIO(text))]
+
+    data = json.loads(text)
+    if isinstance(data, dict):
+        data = data.get("items", [])
+    if not isinstance(data, list):
+        raise ValueError("Expected a JSON list of URLs or objects")
+    rows = []
+    for i, item in enumerate(data, start=1):
+        if isinstance(item, str):
+            rows.append({"linkedin_url": item})
+        elif isinstance(item, dict):
+            rows.append(item)
+        else:
+            raise ValueError(f"Item {i} must be a URL string or an object")
+    return rows
+
+
+def build_import(user_id: ObjectId, raw_rows: List[Dict[str, Any]], extract_job_id: Callable) -> ApplicationImport:
+    """Validate rows and mark invalid ones and in-file duplicates up front"""
+    rows = []
+    seen_job_ids: Set[str] = set()
+    for index, raw in enumerate(raw_rows, start=1):
+        raw = {k.strip(): v for k, v in raw.items() if k and v not in (None, "")}
+        url = raw.get("linkedin_url")
+        try:
+            application_in = ApplicationCreate(**raw)
+        except ValidationError as e:
+            rows.append(ImportRow(row=index, linkedin_url=url, result=ROW_INVALID, error=str(e.errors()[0]["msg"])))
+            continue
+
+        url = str(application_in.linkedin_url)
+        fields = application_in.dict(exclude_none=True)
+        fields.pop("linkedin_url")
+        job_id = extract_job_id(url)
+        row = ImportRow(row=index, linkedin_url=url, fields=fields, job_id=job_id)
+        if job_id and job_id in seen_job_ids:
+            row.result = ROW_DUPLICATE
+            row.error = "Same job appears earlier in this import"
+        elif job_id:
+            seen_job_ids.add(job_id)
+        rows.append(row)
+    return ApplicationImport(user_id=user_id, rows=rows)
+
+
+class BulkImporter:
+    """Runs imports in the background with bounded, rate-limited crawling.
+
+    Crawls run at most `concurrency` at a time and are spaced per host by a
+    HostRateLimiter. Results are written with bulk_write every `batch_size`
+    rows together with the per-row outcomes, so an interrupted import can be
+    resumed and only re-processes rows that were not yet written.
+    """
+
+    def __init__(self, crawler, enqueue_enrichment: Callable, concurrency: int,
+                 host_rate_per_second: float, batch_size: int):
+        self.crawler = crawler
+        self.enqueue_enrichment = enqueue_enrichment
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.rate_limiter = HostRateLimiter(host_rate_per_second)
+        self._running: Set[asyncio.Task] = set()
+
+    async def create(self, db, user_id: ObjectId, raw_rows: List[Dict[str, Any]]) -> dict:
+        application_import = build_import(user_id, raw_rows, self.crawler.extract_job_id)
+        doc = application_import.dict_for_mongodb()
+        await db[APPLICATION_IMPORTS_COLLECTION].insert_one(doc)
+        self._start(db, doc["_id"])
+        return doc
+
+    async def resume(self, db, import_id: ObjectId, user_id: ObjectId) -> Optional[dict]:
+        """Claim an import that is finished or abandoned and process its remaining rows"""
+        now = datetime.utcnow()
+        doc = await db[APPLICATION_IMPORTS_COLLECTION].find_one_and_update(
+            {
+                "_id": import_id,
+                "user_id": user_id,
+                "$or": [
+                    {"status": {"$ne": IMPORT_RUNNING}},
+                    {"heartbeat_at": {"$lt": now - timedelta(seconds=HEARTBEAT_TIMEOUT_SECONDS)}},
+                ],
+            },
+            {"$set": {"status": IMPORT_RUNNING, "heartbeat_at": now, "updated_at": now}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc is not None:
+            self._start(db, import_id)
+        return doc
+
+    async def stop(self):
+        for task in self._running:
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+
+    def _start(self, db, import_id: ObjectId):
+        task = asyncio.create_task(self._run(db, import_id))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, db, import_id: ObjectId):
+        try:
+            await self._process(db, import_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Import {import_id} stopped: {e}", exc_info=True)
+
+    async def _process(self, db, import_id: ObjectId):
+        doc = await db[APPLICATION_IMPORTS_COLLECTION].find_one({"_id": import_id})
+        user_id = doc["user_id"]
+        todo = [
+            (index, row) for index, row in enumerate(doc["rows"])
+            if row["result"] in (ROW_PENDING, ROW_FAILED)
+        ]
+
+        # Skip jobs the user already tracks; an application carrying this row's
+        # pre-allocated ID was written by an earlier run of this same import
+        job_ids = [row["job_id"] for _, row in todo if row.get("job_id")]
+        existing = {}
+        if job_ids:
+            cursor = db.applications.find(
+                {"user_id": user_id, "linkedin_job_id": {"$in": job_ids}},
+                {"linkedin_job_id": 1}
+            )
+            existing = {app["linkedin_job_id"]: app["_id"] async for app in cursor}
+
+        outcomes: Dict[int, Tuple[str, Optional[str]]] = {}
+        to_crawl = []
+        for index, row in todo:
+            existing_id = existing.get(row.get("job_id"))
+            if existing_id is None:
+                to_crawl.append((index, row))
+            elif existing_id == row["application_id"]:
+                outcomes[index] = (ROW_CREATED, None)
+            else:
+                outcomes[index] = (ROW_DUPLICATE, f"Already tracked as application {existing_id}")
+        if outcomes:
+            await self._save_outcomes(db, import_id, outcomes)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pending_writes: List[Tuple[int, Optional[dict], Optional[str]]] = []
+        flush_lock = asyncio.Lock()
+
+        async def handle(index: int, row: dict):
+            async with semaphore:
+                try:
+                    pending_writes.append((index, await self._build_application(db, user_id, row), None))
+                except Exception as e:
+                    pending_writes.append((index, None, str(e)))
+            if len(pending_writes) >= self.batch_size:
+                async with flush_lock:
+                    await self._flush(db, import_id, pending_writes)
+
+        heartbeat = asyncio.create_task(self._heartbeat(db, import_id))
+        try:
+            await asyncio.gather(*(handle(index, row) for index, row in to_crawl))
+            async with flush_lock:
+                await self._flush(db, import_id, pending_writes)
+        finally:
+            heartbeat.cancel()
+
+        now = datetime.utcnow()
+        await db[APPLICATION_IMPORTS_COLLECTION].update_one(
+            {"_id": import_id},
+            {"$set": {"status": IMPORT_COMPLETED, "heartbeat_at": now, "updated_at": now}}
+        )
+        logger.info(f"Import {import_id} completed ({len(to_crawl)} rows crawled)")
+
+    async def _build_application(self, db, user_id: ObjectId, row: dict) -> dict:
+        url = row["linkedin_url"]
+        job_id = row.get("job_id")
+
+        posting = await job_postings.get_fresh_posting(db, job_id)
+        crawled = {}
+        if posting is None:
+            await self.rate_limiter.acquire(url)
+            details = await self.crawler.get_job_details(url)
+            crawled = {f: details.get(f) for f in ENRICHED_FIELDS if details.get(f) is not None}
+            if crawled and job_id:
+                posting = await job_postings.save_posting(db, job_id, url, details)
+        fields = job_postings.headline_fields(posting) if posting else crawled
+
+        application = ApplicationInDB(
+            **{**fields, **row["fields"]},
+            _id=row["application_id"],
+            linkedin_url=url,
+            user_id=user_id,
+            linkedin_job_id=job_id,
+            enrichment_status=ENRICHMENT_COMPLETE if (posting or crawled) else ENRICHMENT_PENDING,
+            status_history=[
+                StatusHistory(
+                    status=row["fields"].get("status", "Wishlist"),
+                    notes="Application imported"
+                )
+            ]
+        )
+        return application.dict_for_mongodb()
+
+    async def _flush(self, db, import_id: ObjectId, pending_writes: list):
+        batch = list(pending_writes)
+        pending_writes.clear()
+        if not batch:
+            return
+
+        outcomes: Dict[int, Tuple[str, Optional[str]]] = {}
+        writes = []
+        for index, app_doc, error in batch:
+            if app_doc is None:
+                outcomes[index] = (ROW_FAILED, error)
+            else:
+                outcomes[index] = (ROW_CREATED, None)
+                writes.append((index, app_doc))
+
+        if writes:
+            skipped = set()
+            try:
+                await db.applications.bulk_write([InsertOne(doc) for _, doc in writes], ordered=False)
+            except BulkWriteError as e:
+                for write_error in e.details.get("writeErrors", []):
+                    skipped.add(write_error["index"])
+                    # 11000 on a pre-allocated _id: written by an earlier run
+                    if write_error.get("code") != 11000:
+                        index = writes[write_error["index"]][0]
+                        outcomes[index] = (ROW_FAILED, write_error.get("errmsg"))
+            inserted = [doc for position, (_, doc) in enumerate(writes) if position not in skipped]
+            await application_events.record_created(db, inserted)
+            # One rebuild per batch instead of a counter update per imported row;
+            # also catches up on rows an interrupted run wrote without counting
+            await application_stats.rebuild_stats(db, writes[0][1]["user_id"])
+            await collection_versions.bump_version(db, writes[0][1]["user_id"], collection_versions.APPLICATIONS)
+
+        # Enqueueing is idempotent, so rows written by an earlier run are re-queued safely
+        for index, app_doc in writes:
+            if outcomes[index][0] == ROW_CREATED and app_doc["enrichment_status"] == ENRICHMENT_PENDING:
+                await self.enqueue_enrichment(db, app_doc)
+
+        await self._save_outcomes(db, import_id, outcomes)
+
+    async def _heartbeat(self, db, import_id: ObjectId):
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL_SECONDS)
+            try:
+                await db[APPLICATION_IMPORTS_COLLECTION].update_one(
+                    {"_id": import_id}, {"$set": {"heartbeat_at": datetime.utcnow()}}
+                )
+            except Exception as e:
+                logger.warning(f"Import {import_id} heartbeat failed: {e}")
+
+    async def _save_outcomes(self, db, import_id: ObjectId, outcomes: Dict[int, Tuple[str, Optional[str]]]):
+        now = datetime.utcnow()
+        update = {"heartbeat_at": now, "updated_at": now}
+        for index, (result, error) in outcomes.items():
+            update[f"rows.{index}.result"] = result
+            update[f"rows.{index}.error"] = error
+        await db[APPLICATION_IMPORTS_COLLECTION].update_one({"_id": import_id}, {"$set": update})
+
+
+def import_response(doc: dict) -> dict:
+    """Shape an import document for the API"""
+    counts: Dict[str, int] = {}
+    rows = []
+    for row in doc["rows"]:
+        counts[row["result"]] = counts.get(row["result"], 0) + 1
+        rows.append({
+            "row": row["row"],
+            "linkedin_url": row.get("linkedin_url"),
+            "job_id": row.get("job_id"),
+            "result": row["result"],
+            "application_id": str(row["application_id"]) if row["result"] == ROW_CREATED else None,
+            "error": row.get("error"),
+        })
+    return {
+        "id": str(doc["_id"]),
+        "status": doc["status"],
+        "total": len(rows),
+        "counts": counts,
+        "rows": rows,
+        "created_at": doc["created_at"],
+        "updated_at": doc["updated_at"],
+    }
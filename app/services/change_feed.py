@@ -0,0 +1,268 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from bson import ObjectId
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.models.database import get_database
+
+logger = logging.getLogger("change_feed")
+
+# Fields pushed to clients per collection; large fields (descriptions,
+# READMEs, embedded history) are left out, clients refetch those on demand
+DELTA_FIELDS = {
+    "applications": [
+        "title", "company", "location", "status", "notes", "linkedin_url",
+        "date_posted", "applied_date", "enrichment_status", "archived_at",
+        "created_at", "updated_at",
+    ],
+    "github_projects": [
+        "name", "description", "language", "stars", "forks", "html_url",
+        "last_commit_date", "created_at", "updated_at",
+    ],
+}
+
+NOT_REPLICA_SET = 40573  # $changeStream is only supported on replica sets
+HISTORY_LOST = {280, 286}  # ChangeStreamFatalError, ChangeStreamHistoryLost
+
+
+class ChangeEvent(NamedTuple):
+    token: str  # resume token "_data", sent to clients as the SSE id
+    user_id: Optional[ObjectId]
+    payload: Optional[Dict[str, Any]]  # None for a reset marker
+
+
+def to_delta(change: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact client payload for one change event"""
+    collection = change["ns"]["coll"]
+    operation = change["operationType"]
+    fields = DELTA_FIELDS[collection]
+    delta = {
+        "collection": collection,
+        "op": {"insert": "insert", "delete": "delete"}.get(operation, "update"),
+        "id": str(change["documentKey"]["_id"]),
+    }
+    if operation == "delete":
+        return delta
+    if operation == "update":
+        description = change.get("updateDescription") or {}
+        source = description.get("updatedFields") or {}
+        removed = [field for field in description.get("removedFields") or [] if field in fields]
+        if removed:
+            delta["removed"] = removed
+    else:
+        source = change.get("fullDocument") or {}
+    delta["fields"] = {field: source[field] for field in fields if field in source}
+    return delta
+
+
+class Subscription:
+    """One connected client; a full queue means the client missed events"""
+
+    def __init__(self, user_id: ObjectId, max_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(max_size)
+        self.overflowed = False
+
+    def push(self, event: ChangeEvent):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class ChangeFeedHub:
+    """Shares one change stream per worker among every connected client.
+
+    The stream watches applications and github_projects; events are routed
+    by user_id (from the post-image, or the pre-image for deletes) to each of
+    that user's subscriptions. Recent events are kept in a ring buffer so a
+    reconnecting client can resume from its Last-Event-ID; older tokens are
+    resumed with a private change stream, and if that history is gone the
+    client is told to reset (refetch). Without a replica set the hub stays
+    unavailable and clients keep polling.
+    """
+
+    def __init__(self, buffer_size: int, queue_size: int, pre_images: bool, retry_seconds: float = 60):
+        self.buffer: Deque[ChangeEvent] = deque(maxlen=buffer_size)
+        self.queue_size = queue_size
+        self.pre_images = pre_images
+        self.retry_seconds = retry_seconds
+        self.subscribers: Dict[ObjectId, Set[Subscription]] = {}
+        self.available = False
+        self.unavailable_reason: Optional[str] = "not started"
+        self._resume_token: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def collections(self) -> List[str]:
+        return list(DELTA_FIELDS)
+
+    @property
+    def latest_token(self) -> Optional[str]:
+        return self._resume_token["_data"] if self._resume_token else None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="change-feed")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.available = False
+
+    def _pipeline(self, user_id: Optional[ObjectId] = None) -> List[dict]:
+        match: Dict[str, Any] = {
+            "ns.coll": {"$in": self.collections},
+            "operationType": {"$in": ["insert", "update", "replace", "delete"]},
+        }
+        if user_id is not None:
+            match["$or"] = [{"fullDocument.user_id": user_id}, {"fullDocumentBeforeChange.user_id": user_id}]
+        project = {
+            "operationType": 1,
+            "ns": 1,
+            "documentKey": 1,
+            "updateDescription": 1,
+            "fullDocument.user_id": 1,
+            "fullDocumentBeforeChange.user_id": 1,
+        }
+        for fields in DELTA_FIELDS.values():
+            project.update({f"fullDocument.{field}": 1 for field in fields})
+        return [{"$match": match}, {"$project": project}]
+
+    def _watch_options(self) -> dict:
+        options = {"full_document": "updateLookup"}
+        if self.pre_images:
+            options["full_document_before_change"] = "whenAvailable"
+        return options
+
+    async def _enable_pre_images(self, db):
+        # Deletes carry no user_id; the pre-image is the only way to route them
+        for collection in self.collections:
+            try:
+                await db.command("collMod", collection, changeStreamPreAndPostImages={"enabled": True})
+            except PyMongoError as e:
+                logger.warning(f"Could not enable change stream pre-images on {collection}: {e}")
+
+    async def _run(self):
+        delay = 1.0
+        pre_images_enabled = False
+        while True:
+            try:
+                db = get_database()
+                if self.pre_images and not pre_images_enabled:
+                    await self._enable_pre_images(db)
+                    pre_images_enabled = True
+                async with db.watch(self._pipeline(), resume_after=self._resume_token, **self._watch_options()) as stream:
+                    self.available = True
+                    self.unavailable_reason = None
+                    delay = 1.0
+                    logger.info(f"Watching {', '.join(self.collections)} for changes")
+                    async for change in stream:
+                        self._resume_token = change["_id"]
+                        self._dispatch(change)
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                self.available = False
+                self.unavailable_reason = str(e)
+                if e.code == NOT_REPLICA_SET:
+                    logger.warning("Change streams need a replica set; live updates are disabled")
+                    delay = self.retry_seconds
+                elif e.code in HISTORY_LOST:
+                    logger.warning(f"Change stream history lost, restarting from now: {e}")
+                    self._resume_token = None
+                    self._reset_all()
+                else:
+                    logger.error(f"Change stream failed: {e}")
+            except PyMongoError as e:
+                # Transient (e.g. failover): resume from the last token
+                self.available = False
+                self.unavailable_reason = str(e)
+                logger.warning(f"Change stream interrupted, resuming: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.retry_seconds)
+
+    def _event(self, change: Dict[str, Any]) -> Optional[ChangeEvent]:
+        owner = (change.get("fullDocument") or {}).get("user_id") \
+            or (change.get("fullDocumentBeforeChange") or {}).get("user_id")
+        if owner is None:
+            return None  # deleted without a pre-image, or gone before the lookup
+        return ChangeEvent(token=change["_id"]["_data"], user_id=owner, payload=to_delta(change))
+
+    def _dispatch(self, change: Dict[str, Any]):
+        event = self._event(change)
+        if event is None:
+            return
+        self.buffer.append(event)
+        for subscription in self.subscribers.get(event.user_id, ()):
+            subscription.push(event)
+
+    def _reset_all(self):
+        self.buffer.clear()
+        marker = ChangeEvent(token="", user_id=None, payload=None)
+        for subscriptions in self.subscribers.values():
+            for subscription in subscriptions:
+                subscription.push(marker)
+
+    def subscribe(self, user_id: ObjectId, last_event_id: Optional[str] = None) -> Tuple[Subscription, List[ChangeEvent], bool]:
+        """Register a client; returns its subscription, buffered events after
+        last_event_id, and whether last_event_id was found in the buffer"""
+        subscription = Subscription(user_id, self.queue_size)
+        self.subscribers.setdefault(user_id, set()).add(subscription)
+        if not last_event_id:
+            return subscription, [], True
+        backlog = []
+        found = False
+        for event in self.buffer:
+            if found and event.user_id == user_id:
+                backlog.append(event)
+            elif event.token == last_event_id:
+                found = True
+        return subscription, backlog, found
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self.subscribers.get(subscription.user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self.subscribers[subscription.user_id]
+
+    async def catch_up(self, user_id: ObjectId, last_event_id: str) -> Optional[List[ChangeEvent]]:
+        """Replay a user's changes after a token older than the ring buffer.
+
+        Returns None when the token can no longer be resumed.
+        """
+        events: List[ChangeEvent] = []
+        try:
+            db = get_database()
+            async with db.watch(
+                self._pipeline(user_id), resume_after={"_data": last_event_id}, **self._watch_options()
+            ) as stream:
+                while len(events) < self.buffer.maxlen:
+                    change = await stream.try_next()
+                    if change is None:
+                        break
+                    event = self._event(change)
+                    if event is not None:
+                        events.append(event)
+                else:
+                    return None  # too far behind; a refetch is cheaper
+        except PyMongoError as e:
+            logger.info(f"Could not resume change stream for {user_id}: {e}")
+            return None
+        return events
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "available": self.available,
+            "unavailable_reason": self.unavailable_reason,
+            "subscribers": sum(len(s) for s in self.subscribers.values()),
+            "buffered_events": len(self.buffer),
+        }
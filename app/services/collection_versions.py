@@ -0,0 +1,72 @@
+import hashlib
+from typing import Iterable, Optional
+
+from bson import ObjectId
+from fastapi import Request, Response, status
+
+VERSIONS_COLLECTION = "collection_versions"
+
+# Collections whose reads are served with ETags
+APPLICATIONS = "applications"
+GITHUB_PROJECTS = "github_projects"
+
+# Browsers must revalidate every time, which sends If-None-Match automatically
+CACHE_CONTROL = "private, no-cache"
+
+
+async def get_version(db, user_id: ObjectId, collection: str) -> int:
+    doc = await db[VERSIONS_COLLECTION].find_one({"_id": user_id}, {collection: 1})
+    return (doc or {}).get(collection, 0)
+
+
+async def bump_version(db, user_id: ObjectId, *collections: str):
+    """Invalidate every ETag issued for the user's copy of these collections"""
+    await db[VERSIONS_COLLECTION].update_one(
+        {"_id": user_id},
+        {"$inc": {collection: 1 for collection in collections}},
+        upsert=True,
+    )
+
+
+async def bump_versions(db, user_ids: Iterable[ObjectId], *collections: str):
+    """Bump the same collections for many users at once"""
+    user_ids = list(user_ids)
+    if len(user_ids) == 1:
+        await bump_version(db, user_ids[0], *collections)
+    elif user_ids:
+        # No upsert: a user without a version document has no ETags outstanding
+        await db[VERSIONS_COLLECTION].update_many(
+            {"_id": {"$in": user_ids}},
+            {"$inc": {collection: 1 for collection in collections}},
+        )
+
+
+def make_etag(user_id: ObjectId, collection: str, version: int, request: Request) -> str:
+    """Strong ETag for one representation: user, collection version, path and query"""
+    key = f"{user_id}:{collection}:{version}:{request.url.path}?{request.url.query}"
+    return '"' + hashlib.sha1(key.encode()).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses weak comparison, so a W/ prefix still matches
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+async def conditional_get(
+    request: Request, response: Response, db, user_id: ObjectId, collection: str
+) -> Optional[Response]:
+    """Set the ETag for this read and return a 304 if the client already has it.
+
+    Called before any document is loaded, so an unchanged read costs one
+    lookup of the version document.
+    """
+    version = await get_version(db, user_id, collection)
+    etag = make_etag(user_id, collection, version, request)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
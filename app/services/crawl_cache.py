@@ -0,0 +1,178 @@
+import logging
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from pymongo.errors import PyMongoError
+
+from app.models.crawl_cache import CRAWL_CACHE_COLLECTION, CRAWL_CACHE_USAGE_COLLECTION
+from app.models.database import get_database, register_query_shape
+from app.services.job_page_extraction import EXTRACTOR_VERSION
+from app.utils.metrics import registry
+
+logger = logging.getLogger("crawl_cache")
+
+LRU_SORT = [("last_used_at", 1)]
+USAGE_ID = "bytes"
+
+register_query_shape("crawl_cache.lru", CRAWL_CACHE_COLLECTION, {}, sort=LRU_SORT)
+
+cache_requests = registry.counter(
+    "crawl_cache_requests_total", "Crawls by cache outcome (fresh, revalidated, miss, stale_on_error)"
+)
+cache_evictions = registry.counter(
+    "crawl_cache_evictions_total", "Entries evicted to stay within the size budget"
+)
+
+# Extracted fields kept with the page, so fresh hits and 304s need no parsing
+CACHED_FIELDS = ["title", "company", "location", "job_description", "date_posted", "field_sources"]
+
+
+class CrawlCache:
+    """Raw job pages (zlib-compressed) and their extracted fields, keyed by job ID.
+
+    An entry is served without any request while fresh. After that it is
+    revalidated with If-None-Match / If-Modified-Since, and a 304 reuses
+    the stored fields without parsing. Fields from an older EXTRACTOR_VERSION
+    are re-extracted from the stored page rather than refetched. Entries expire through a TTL index,
+    and the least recently used ones are evicted when the collection grows
+    past its byte budget.
+
+    The budget is checked against a running total kept in its own document.
+    Entries removed by the TTL monitor are not subtracted from it, so it can
+    only overstate usage; when it reports the budget exceeded, it is recounted
+    from the last_used_at_size index before anything is evicted.
+    """
+
+    def __init__(self, fresh_seconds: float, ttl_seconds: float, max_bytes: int, evict_interval: float = 60):
+        self.fresh_seconds = fresh_seconds
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.evict_interval = evict_interval
+        self._last_eviction = 0.0
+
+    def is_fresh(self, entry: dict) -> bool:
+        return entry["fetched_at"] >= datetime.utcnow() - timedelta(seconds=self.fresh_seconds)
+
+    @staticmethod
+    def validators(entry: dict) -> Dict[str, str]:
+        """Conditional request headers for revalidating an entry"""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    @staticmethod
+    def html(entry: dict) -> str:
+        return zlib.decompress(entry["html"]).decode("utf-8")
+
+    @staticmethod
+    def is_current(entry: dict) -> bool:
+        """Whether the stored fields came from the running extractor"""
+        return entry.get("extractor_version") == EXTRACTOR_VERSION
+
+    @staticmethod
+    def details(entry: dict) -> Dict[str, Any]:
+        return {field: entry.get(field) for field in CACHED_FIELDS}
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        db = get_database()
+        return await db[CRAWL_CACHE_COLLECTION].find_one_and_update(
+            {"_id": job_id}, {"$set": {"last_used_at": datetime.utcnow()}}, projection={"html": 0}
+        )
+
+    async def page(self, job_id: str) -> Optional[str]:
+        """The stored page, which get() leaves out"""
+        db = get_database()
+        entry = await db[CRAWL_CACHE_COLLECTION].find_one({"_id": job_id}, {"html": 1})
+        return self.html(entry) if entry else None
+
+    async def store(self, job_id: str, url: str, html: str, details: Dict[str, Any], headers) -> None:
+        now = datetime.utcnow()
+        compressed = zlib.compress(html.encode("utf-8"), 6)
+        entry = {
+            "url": url,
+            "html": compressed,
+            "size": len(compressed),
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "fetched_at": now,
+            "last_used_at": now,
+            "expires_at": now + timedelta(seconds=self.ttl_seconds),
+            "extractor_version": EXTRACTOR_VERSION,
+            **{field: details.get(field) for field in CACHED_FIELDS},
+        }
+        db = get_database()
+        previous = await db[CRAWL_CACHE_COLLECTION].find_one_and_replace(
+            {"_id": job_id}, entry, projection={"size": 1}, upsert=True
+        )
+        await self._add_usage(db, entry["size"] - (previous or {}).get("size", 0))
+        await self.evict_if_needed()
+
+    async def reextracted(self, job_id: str, details: Dict[str, Any]) -> None:
+        """Replace the fields of an entry whose stored page was parsed again"""
+        update = {field: details.get(field) for field in CACHED_FIELDS}
+        update["extractor_version"] = EXTRACTOR_VERSION
+        db = get_database()
+        await db[CRAWL_CACHE_COLLECTION].update_one({"_id": job_id}, {"$set": update})
+
+    async def revalidated(self, job_id: str, headers) -> None:
+        """Record a 304: the stored page is current again"""
+        now = datetime.utcnow()
+        update = {"fetched_at": now, "last_used_at": now, "expires_at": now + timedelta(seconds=self.ttl_seconds)}
+        # A 304 may carry updated validators
+        if headers.get("etag"):
+            update["etag"] = headers["etag"]
+        if headers.get("last-modified"):
+            update["last_modified"] = headers["last-modified"]
+        db = get_database()
+        await db[CRAWL_CACHE_COLLECTION].update_one({"_id": job_id}, {"$set": update})
+
+    async def _add_usage(self, db, delta: int) -> None:
+        if delta:
+            await db[CRAWL_CACHE_USAGE_COLLECTION].update_one({"_id": USAGE_ID}, {"$inc": {"bytes": delta}}, upsert=True)
+
+    async def usage(self) -> int:
+        """Running byte total of the cached pages (an upper bound, see above)"""
+        db = get_database()
+        doc = await db[CRAWL_CACHE_USAGE_COLLECTION].find_one({"_id": USAGE_ID})
+        return (doc or {}).get("bytes", 0)
+
+    async def _recount(self, db) -> int:
+        # Sorting on the index's leading key lets the sum read only the index
+        totals = await db[CRAWL_CACHE_COLLECTION].aggregate([
+            {"$sort": {"last_used_at": 1}},
+            {"$group": {"_id": None, "bytes": {"$sum": "$size"}}},
+        ]).to_list(length=1)
+        total = totals[0]["bytes"] if totals else 0
+        await db[CRAWL_CACHE_USAGE_COLLECTION].update_one({"_id": USAGE_ID}, {"$set": {"bytes": total}}, upsert=True)
+        return total
+
+    async def evict_if_needed(self) -> None:
+        """Drop least recently used entries while over the byte budget (at most once per interval)"""
+        if time.monotonic() - self._last_eviction < self.evict_interval:
+            return
+        self._last_eviction = time.monotonic()
+        db = get_database()
+        try:
+            if await self.usage() <= self.max_bytes:
+                return
+            excess = await self._recount(db) - self.max_bytes
+            if excess <= 0:
+                return
+            victims, freed = [], 0
+            cursor = db[CRAWL_CACHE_COLLECTION].find({}, {"size": 1}).sort(LRU_SORT)
+            async for entry in cursor:
+                victims.append(entry["_id"])
+                freed += entry.get("size", 0)
+                if freed >= excess:
+                    break
+            await db[CRAWL_CACHE_COLLECTION].delete_many({"_id": {"$in": victims}})
+            await self._add_usage(db, -freed)
+            cache_evictions.inc(len(victims))
+            logger.info(f"Evicted {len(victims)} crawl cache entries ({freed} bytes)")
+        except PyMongoError as e:
+            logger.warning(f"Crawl cache eviction failed: {e}")
@@ -0,0 +1,225 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.models.database import get_database, register_query_shape
+from app.services import application_stats, collection_versions, job_postings
+from app.models.enrichment_task import (
+    ENRICHMENT_TASKS_COLLECTION, EnrichmentTask,
+    TASK_QUEUED, TASK_RUNNING, TASK_DONE, TASK_FAILED
+)
+
+logger = logging.getLogger("enrichment_worker")
+
+# Application.enrichment_status values
+ENRICHMENT_PENDING = "pending"
+ENRICHMENT_COMPLETE = "complete"
+ENRICHMENT_FAILED = "failed"
+
+# Crawled fields patched into an application (only where the user left them empty)
+ENRICHED_FIELDS = ["title", "company", "location", "job_description", "date_posted"]
+
+CLAIM_SORT = [("available_at", 1)]
+
+
+def claimable(now: datetime) -> Dict[str, Any]:
+    """Queued tasks that are due, and running tasks whose lease expired"""
+    return {"$or": [
+        {"status": TASK_QUEUED, "available_at": {"$lte": now}},
+        {"status": TASK_RUNNING, "lease_expires_at": {"$lte": now}},
+    ]}
+
+
+register_query_shape("enrichment_tasks.claim", ENRICHMENT_TASKS_COLLECTION, claimable(datetime.utcnow()), sort=CLAIM_SORT)
+
+
+class EnrichmentWorkerPool:
+    """Crawls LinkedIn job pages for new applications in the background.
+
+    Tasks live in a MongoDB collection so queued work survives restarts.
+    Workers claim tasks with find_one_and_update and hold a lease while
+    crawling; a task whose lease expires (worker crashed or was restarted)
+    is picked up again. Every claim counts as an attempt, so a task that
+    keeps failing or crashing its worker ends up failed after max_attempts.
+    """
+
+    def __init__(
+        self,
+        crawler,
+        workers: int,
+        poll_interval: float,
+        lease_seconds: int,
+        max_attempts: int,
+    ):
+        self.crawler = crawler
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self):
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._run(i), name=f"enrichment-worker-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info(f"Started {self.workers} enrichment workers")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def enqueue(self, db, application: Dict[str, Any]):
+        """Queue a crawl for a freshly inserted application"""
+        task = EnrichmentTask(
+            application_id=application["_id"],
+            user_id=application["user_id"],
+            linkedin_url=str(application["linkedin_url"]),
+        )
+        try:
+            await db[ENRICHMENT_TASKS_COLLECTION].insert_one(task.dict_for_mongodb())
+        except DuplicateKeyError:
+            logger.info(f"Enrichment already queued for application {application['_id']}")
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def get_task(self, db, application_id) -> Optional[dict]:
+        return await db[ENRICHMENT_TASKS_COLLECTION].find_one({"application_id": application_id})
+
+    async def _claim(self, db) -> Optional[dict]:
+        now = datetime.utcnow()
+        return await db[ENRICHMENT_TASKS_COLLECTION].find_one_and_update(
+            claimable(now),
+            {
+                "$set": {
+                    "status": TASK_RUNNING,
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=CLAIM_SORT,
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _run(self, worker_id: int):
+        while True:
+            try:
+                db = get_database()
+                task = await self._claim(db)
+                if task is None:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                await self._attempt(db, task)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Enrichment worker {worker_id} error: {e}", exc_info=True)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _attempt(self, db, task: dict):
+        """Process a claimed task; any failure counts as an attempt"""
+        if task["attempts"] > self.max_attempts:
+            # Its lease kept expiring, e.g. the worker crashed on it every time
+            await self._retry_or_fail(db, task, task.get("last_error") or "Lease expired too often")
+            return
+        try:
+            await self._process(db, task)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Enriching application {task['application_id']} failed: {e}", exc_info=True)
+            await self._retry_or_fail(db, task, str(e) or type(e).__name__)
+
+    async def _process(self, db, task: dict):
+        url = task["linkedin_url"]
+        job_id = self.crawler.extract_job_id(url)
+
+        # Another application may have crawled the same posting in the meantime
+        posting = await job_postings.get_fresh_posting(db, job_id)
+        if posting is None:
+            details = await self.crawler.get_job_details(url)
+            crawled = {
+                field: details.get(field)
+                for field in ENRICHED_FIELDS
+                if details.get(field) is not None
+            }
+            if not crawled:
+                await self._retry_or_fail(db, task, "No job details could be extracted")
+                return
+            if job_id:
+                posting = await job_postings.save_posting(db, job_id, url, details)
+
+        # Applications reference the shared posting for the description; without a
+        # job ID there is nothing to reference, so everything is stored inline
+        fields = job_postings.headline_fields(posting) if posting else crawled
+        await self._patch_application(db, task, fields, ENRICHMENT_COMPLETE)
+        await self._finish(db, task, TASK_DONE)
+        logger.info(f"Enriched application {task['application_id']} with {sorted(fields)}")
+
+    async def _patch_application(self, db, task: dict, crawled: Dict[str, Any], enrichment_status: str):
+        # Pipeline update so user-supplied values win without reading the document first
+        fields = {
+            field: {"$ifNull": [f"${field}", {"$literal": value}]}
+            for field, value in crawled.items()
+        }
+        await db.applications.update_one(
+            {"_id": task["application_id"], "user_id": task["user_id"]},
+            [{"$set": {
+                **fields,
+                "enrichment_status": enrichment_status,
+                "updated_at": datetime.utcnow(),
+            }}],
+        )
+        if crawled:
+            # Recent activity holds the title and company from before the crawl
+            await application_stats.rebuild_stats(db, task["user_id"])
+        await collection_versions.bump_version(db, task["user_id"], collection_versions.APPLICATIONS)
+
+    async def _retry_or_fail(self, db, task: dict, error: str):
+        if task["attempts"] >= self.max_attempts:
+            await self._patch_application(db, task, {}, ENRICHMENT_FAILED)
+            await self._finish(db, task, TASK_FAILED, error)
+            logger.warning(f"Giving up enriching application {task['application_id']}: {error}")
+            return
+
+        # Exponential backoff between attempts
+        delay = self.poll_interval * (2 ** task["attempts"])
+        now = datetime.utcnow()
+        await db[ENRICHMENT_TASKS_COLLECTION].update_one(
+            {"_id": task["_id"]},
+            {"$set": {
+                "status": TASK_QUEUED,
+                "available_at": now + timedelta(seconds=delay),
+                "lease_expires_at": None,
+                "last_error": error,
+                "updated_at": now,
+            }},
+        )
+
+    async def _finish(self, db, task: dict, status: str, error: Optional[str] = None):
+        now = datetime.utcnow()
+        await db[ENRICHMENT_TASKS_COLLECTION].update_one(
+            {"_id": task["_id"]},
+            {"$set": {
+                "status": status,
+                "last_error": error,
+                "lease_expires_at": None,
+                "finished_at": now,
+                "updated_at": now,
+            }},
+        )
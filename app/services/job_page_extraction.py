@@ -0,0 +1,314 @@
+import html as html_lib
+import json
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+try:
+    import lxml  # noqa: F401  optional, a much faster tree builder for BeautifulSoup
+except ImportError:
+    lxml = None
+
+logger = logging.getLogger("linkedin_crawler")
+
+PARSERS = ("html.parser", "lxml")
+
+# --- Helper function to parse relative dates ---
+def parse_relative_date(date_str: str) -> Optional[datetime]:
+    """Parses relative date strings like '2 days ago', '1 week ago'."""
+    now = datetime.utcnow()
+    date_str = date_str.lower().strip()
+
+    try:
+        if "just now" in date_str or "moments ago" in date_str:
+            return now
+        elif "minute" in date_str:
+            minutes = int(re.search(r'\d+', date_str).group())
+            return now - timedelta(minutes=minutes)
+        elif "hour" in date_str:
+            hours = int(re.search(r'\d+', date_str).group())
+            return now - timedelta(hours=hours)
+        elif "day" in date_str:
+            days = int(re.search(r'\d+', date_str).group())
+            return now - timedelta(days=days)
+        elif "week" in date_str:
+            weeks = int(re.search(r'\d+', date_str).group())
+            return now - timedelta(weeks=weeks)
+        elif "month" in date_str:
+            months = int(re.search(r'\d+', date_str).group())
+            # Approximate month as 30 days
+            return now - timedelta(days=months * 30)
+        elif "year" in date_str:
+            years = int(re.search(r'\d+', date_str).group())
+            # Approximate year as 365 days
+            return now - timedelta(days=years * 365)
+        else:
+            # Attempt to parse as a fixed date if possible (less common on LinkedIn)
+            # This part might need refinement based on actual date formats encountered
+            return datetime.strptime(date_str, "%Y-%m-%d") # Example format
+    except Exception:
+        # If parsing fails, return None
+        return None
+# -------------------------------------------------
+
+
+def resolve_parser(name: str) -> str:
+    """BeautifulSoup tree builder to use; falls back to html.parser when lxml is missing"""
+    if name not in PARSERS:
+        raise ValueError(f"Unknown HTML_PARSER: {name}")
+    if name == "lxml" and lxml is None:
+        logger.warning("HTML_PARSER=lxml but lxml is not installed; using html.parser")
+        return "html.parser"
+    return name
+
+
+def get_element_text(soup: BeautifulSoup, selector: str, attribute: Optional[str] = None) -> Optional[str]:
+    """Safely find an element and return its text or attribute."""
+    try:
+        element = soup.select_one(selector)
+        if element:
+            if attribute:
+                return element.get(attribute, '').strip()
+            # Handle cases where text might be split across multiple tags (e.g., within spans)
+            text_parts = [part.strip() for part in element.stripped_strings]
+            return ' '.join(text_parts) if text_parts else None
+    except Exception as e:
+        logger.error(f"Error extracting text with selector '{selector}': {e}")
+    return None
+
+def get_job_description_text(soup: BeautifulSoup, selector: str) -> Optional[str]:
+    """Safely find the job description element and extract formatted text."""
+    try:
+        description_div = soup.select_one(selector)
+        if not description_div:
+            return None
+
+        # Attempt to preserve some formatting (paragraphs, lists)
+        content = []
+        for element in description_div.children:
+            if isinstance(element, NavigableString):
+                text = element.strip()
+                if text:
+                    content.append(text)
+            elif isinstance(element, Tag):
+                # Avoid extracting text from known 'show more/less' button containers if element removal wasn't used
+                # (Add class names/tags here if you identify them and didn't use decompose)
+                # if 'some-show-more-class' in element.get('class', []):
+                #    continue
+
+                if element.name == 'ul':
+                    items = ["- " + li.get_text(strip=True) for li in element.find_all('li')]
+                    if items: # Only add if list has items
+                       content.append("\n" + "\n".join(items)) # Add newline before list
+                elif element.name in ['p', 'div']:
+                    # Get text, ensuring spaces between inline elements are somewhat preserved
+                    text = element.get_text(separator=' ', strip=True)
+                    if text:
+                       content.append(text + "\n") # Add newline after paragraphs/divs
+                elif element.name == 'br':
+                     # Add a newline for <br>, but only if the last element wasn't already adding one
+                    if content and not content[-1].endswith('\n'):
+                        content.append('\n')
+                elif element.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+                    text = element.get_text(strip=True)
+                    if text:
+                       content.append("\n" + text + "\n") # Add spacing around headers
+                else:
+                     # For other inline tags like <strong>, <em>, <a> etc. get text directly
+                    text = element.get_text(strip=True)
+                    if text:
+                        content.append(text)
+
+
+        # --- Post-processing to remove unwanted trailing text ---
+        full_description = "\n".join(content).strip()
+
+        # Define common trailing texts to remove (case-insensitive check)
+        suffixes_to_remove = ["Show moreShow less", "Show less", "Show more"]
+
+        cleaned_description = full_description
+        lower_description = cleaned_description.lower() # Check against lowercase
+
+        for suffix in suffixes_to_remove:
+            if lower_description.endswith(suffix.lower()):
+                # Remove the suffix, preserving original case as much as possible
+                # Slice the original string based on the length of the found suffix
+                cleaned_description = cleaned_description[:-len(suffix)].strip()
+                lower_description = cleaned_description.lower() # Update for next check if needed
+
+        logger.debug(f"Original Description length: {len(full_description)}, Cleaned Description length: {len(cleaned_description)}")
+        return cleaned_description if cleaned_description else None # Return None if empty after cleaning
+
+    except Exception as e:
+        logger.error(f"Error extracting job description with selector '{selector}': {e}", exc_info=True)
+    return None
+
+
+# --- Structured data (JSON-LD) fast path ---
+FIELDS = ["title", "company", "location", "job_description", "date_posted"]
+SOURCE_JSON_LD = "json_ld"
+SOURCE_SELECTORS = "selectors"
+# Bump whenever extraction output changes: crawl cache entries extracted by an
+# older version are re-extracted from their stored page instead of trusted
+EXTRACTOR_VERSION = 1
+
+_JSON_LD_SCRIPT = re.compile(
+    r'<script\b[^>]*\btype\s*=\s*["\']application/ld\+json["\'][^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL,
+)
+_BLOCK_BREAK = re.compile(r"<\s*(?:br\s*/?|/p|/div|/h[1-6]|/ul|/ol)\s*>", re.IGNORECASE)
+_LIST_ITEM = re.compile(r"<\s*li\b[^>]*>", re.IGNORECASE)
+_TAG = re.compile(r"<[^>]+>")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+def _job_postings(data: Any):
+    """JobPosting objects in a JSON-LD document (top level, list or @graph)"""
+    if isinstance(data, list):
+        for item in data:
+            yield from _job_postings(item)
+    elif isinstance(data, dict):
+        kind = data.get("@type")
+        if kind == "JobPosting" or (isinstance(kind, list) and "JobPosting" in kind):
+            yield data
+        yield from _job_postings(data.get("@graph"))
+
+
+def find_job_posting(html: str) -> Optional[dict]:
+    """The page's JSON-LD JobPosting, found with a regex scan instead of a DOM parse"""
+    for match in _JSON_LD_SCRIPT.finditer(html):
+        raw = match.group(1).strip()
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            try:
+                data = json.loads(html_lib.unescape(raw))
+            except ValueError:
+                continue
+        for posting in _job_postings(data):
+            return posting
+    return None
+
+
+def html_to_text(fragment: Optional[str]) -> Optional[str]:
+    """Plain text for the HTML description JSON-LD carries, keeping paragraphs and list items"""
+    if not fragment:
+        return None
+    text = _LIST_ITEM.sub("\n- ", html_lib.unescape(fragment) if "&lt;" in fragment else fragment)
+    text = _BLOCK_BREAK.sub("\n", text)
+    text = html_lib.unescape(_TAG.sub("", text))
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    text = _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+    return text or None
+
+
+def _name(value: Any) -> Optional[str]:
+    if isinstance(value, dict):
+        value = value.get("name")
+    if isinstance(value, str):
+        return value.strip() or None
+    return None
+
+
+def _location(value: Any) -> Optional[str]:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if not isinstance(value, dict):
+        return _name(value)
+    address = value.get("address") or {}
+    if isinstance(address, str):
+        return address.strip() or None
+    parts = [address.get("addressLocality"), address.get("addressRegion"), _name(address.get("addressCountry"))]
+    parts = [p.strip() for p in parts if isinstance(p, str) and p.strip()]
+    return ", ".join(dict.fromkeys(parts)) or None
+
+
+def _date(value: Any) -> Optional[datetime]:
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def structured_fields(posting: dict) -> Dict[str, Any]:
+    """Map a JobPosting to our field names; fields it lacks are None"""
+    return {
+        "title": _name(posting.get("title")),
+        "company": _name(posting.get("hiringOrganization")),
+        "location": _location(posting.get("jobLocation")),
+        "job_description": html_to_text(posting.get("description")),
+        "date_posted": _date(posting.get("datePosted")),
+    }
+
+
+def selector_fields(soup: BeautifulSoup, fields) -> Dict[str, Any]:
+    """The DOM selector path, for just the requested fields"""
+    # NOTE: These selectors are based on common LinkedIn structures (as of late 2023/early 2024)
+    # AND ARE LIKELY TO CHANGE. They require inspection and adjustment.
+    details: Dict[str, Any] = {}
+
+    if "title" in fields:
+        # Title: Often in an <h1> tag within the top card
+        details["title"] = get_element_text(soup, 'h1.top-card-layout__title, h1.job-title, .job-details-jobs-unified-top-card__job-title')
+
+    if "company" in fields:
+        # Company Name: Often a link within the top card or a specific span
+        details["company"] = get_element_text(soup, 'a.topcard__org-name-link, span.job-details-jobs-unified-top-card__company-name, .topcard__flavor a')
+        if not details["company"]: # Fallback selector
+             details["company"] = get_element_text(soup, '.job-card-container__company-name, .job-details-jobs-unified-top-card__primary-description-without-tagline a')
+
+    if "location" in fields:
+        # Location: Often a span within the top card
+        details["location"] = get_element_text(soup, 'span.topcard__flavor--bullet, span.job-details-jobs-unified-top-card__bullet, .job-details-jobs-unified-top-card__primary-description-without-tagline span:first-of-type') # Take the first span if multiple
+
+    if "job_description" in fields:
+        # Job Description: Usually within a specific div
+        # Look for common description container classes
+        details["job_description"] = get_job_description_text(soup, 'div.description__text--rich, div.show-more-less-html__markup, .jobs-description-content__text')
+
+    if "date_posted" in fields:
+        # Date Posted: Often relative time in a span
+        date_str = get_element_text(soup, 'span.posted-time-ago__text, span.job-details-jobs-unified-top-card__posted-date')
+        details["date_posted"] = parse_relative_date(date_str) if date_str else None
+        details["date_posted_text"] = date_str
+    return details
+
+
+def extract_job_details(html: str, parser: str = "html.parser") -> Dict[str, Any]:
+    """Parse a job page into its headline fields.
+
+    The JSON-LD JobPosting block is tried first; the page is only parsed
+    into a DOM for the fields it lacks. `field_sources` records which path
+    produced each field (None when neither did). Pure CPU and module-level,
+    so it can run in a worker process.
+    """
+    details: Dict[str, Any] = dict.fromkeys(FIELDS)
+    details["date_posted_text"] = None
+    sources: Dict[str, Optional[str]] = dict.fromkeys(FIELDS)
+
+    posting = find_job_posting(html)
+    if posting is not None:
+        for field, value in structured_fields(posting).items():
+            if value is not None:
+                details[field] = value
+                sources[field] = SOURCE_JSON_LD
+        if sources["date_posted"]:
+            details["date_posted_text"] = posting.get("datePosted")
+
+    missing = [field for field in FIELDS if sources[field] is None]
+    if missing:
+        for field, value in selector_fields(BeautifulSoup(html, parser), missing).items():
+            details[field] = value
+            if field in sources and value is not None:
+                sources[field] = SOURCE_SELECTORS
+
+    details["field_sources"] = sources
+    return details
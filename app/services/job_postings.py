@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.services import collection_versions
+from app.models.database import register_query_shape
+from app.models.job_posting import JOB_POSTINGS_COLLECTION, JobPosting
+
+# Small fields copied onto applications so lists can show and sort them;
+# the large job_description stays on the shared posting
+HEADLINE_FIELDS = ["title", "company", "location", "date_posted"]
+
+register_query_shape("job_postings.fresh_by_id", JOB_POSTINGS_COLLECTION, {"_id": "1", "fetched_at": {"$gte": datetime.utcnow()}})
+register_query_shape("job_postings.by_ids", JOB_POSTINGS_COLLECTION, {"_id": {"$in": ["1"]}})
+
+
+def _fresh_after() -> datetime:
+    return datetime.utcnow() - timedelta(hours=settings.JOB_POSTING_TTL_HOURS)
+
+
+async def get_fresh_posting(db, job_id: Optional[str]) -> Optional[dict]:
+    """Return the stored posting if it was crawled within the freshness TTL"""
+    if not job_id:
+        return None
+    return await db[JOB_POSTINGS_COLLECTION].find_one(
+        {"_id": job_id, "fetched_at": {"$gte": _fresh_after()}}
+    )
+
+
+async def save_posting(db, job_id: str, url: str, details: Dict[str, Any]) -> dict:
+    """Upsert freshly crawled details; fields the crawl missed keep their old value"""
+    posting = JobPosting(
+        _id=job_id,
+        linkedin_url=url,
+        field_sources=details.get("field_sources") or {},
+        **{k: details.get(k) for k in HEADLINE_FIELDS + ["job_description"]}
+    )
+    fields = posting.model_dump(by_alias=True, exclude_none=True)
+    fields.pop("_id")
+    await db[JOB_POSTINGS_COLLECTION].update_one(
+        {"_id": job_id}, {"$set": fields}, upsert=True
+    )
+    # The description changes every application that shows it
+    user_ids = await db.applications.distinct("user_id", {"linkedin_job_id": job_id})
+    await collection_versions.bump_versions(db, user_ids, collection_versions.APPLICATIONS)
+    return {"_id": job_id, **fields}
+
+
+def headline_fields(posting: dict) -> Dict[str, Any]:
+    return {k: posting[k] for k in HEADLINE_FIELDS if posting.get(k) is not None}
+
+
+async def attach_job_descriptions(db, applications: List[dict]) -> List[dict]:
+    """Fill job_description from shared postings for applications that reference one"""
+    missing = {
+        app["linkedin_job_id"]
+        for app in applications
+        if not app.get("job_description") and app.get("linkedin_job_id")
+    }
+    if not missing:
+        return applications
+
+    cursor = db[JOB_POSTINGS_COLLECTION].find(
+        {"_id": {"$in": list(missing)}}, {"job_description": 1}
+    )
+    descriptions = {
+        posting["_id"]: posting.get("job_description")
+        async for posting in cursor
+    }
+    for app in applications:
+        if not app.get("job_description") and app.get("linkedin_job_id"):
+            app["job_description"] = descriptions.get(app["linkedin_job_id"])
+    return applications
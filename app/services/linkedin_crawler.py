@@ -1,57 +1,46 @@
 # Updated app/services/linkedin_crawler.py
 import re
-import requests
-from bs4 import BeautifulSoup, NavigableString, Tag
-from datetime import datetime, timedelta
+import time
+import httpx
 from typing import Dict, Any, Optional
 import logging
 
-# --- Helper function to parse relative dates ---
-def parse_relative_date(date_str: str) -> Optional[datetime]:
-    """Parses relative date strings like '2 days ago', '1 week ago'."""
-    now = datetime.utcnow()
-    date_str = date_str.lower().strip()
-
-    try:
-        if "just now" in date_str or "moments ago" in date_str:
-            return now
-        elif "minute" in date_str:
-            minutes = int(re.search(r'\d+', date_str).group())
-            return now - timedelta(minutes=minutes)
-        elif "hour" in date_str:
-            hours = int(re.search(r'\d+', date_str).group())
-            return now - timedelta(hours=hours)
-        elif "day" in date_str:
-            days = int(re.search(r'\d+', date_str).group())
-            return now - timedelta(days=days)
-        elif "week" in date_str:
-            weeks = int(re.search(r'\d+', date_str).group())
-            return now - timedelta(weeks=weeks)
-        elif "month" in date_str:
-            months = int(re.search(r'\d+', date_str).group())
-            # Approximate month as 30 days
-            return now - timedelta(days=months * 30)
-        elif "year" in date_str:
-            years = int(re.search(r'\d+', date_str).group())
-            # Approximate year as 365 days
-            return now - timedelta(days=years * 365)
-        else:
-            # Attempt to parse as a fixed date if possible (less common on LinkedIn)
-            # This part might need refinement based on actual date formats encountered
-            return datetime.strptime(date_str, "%Y-%m-%d") # Example format
-    except Exception:
-        # If parsing fails, return None
-        return None
-# -------------------------------------------------
+from pymongo.errors import PyMongoError
+
+from app.services.crawl_cache import CrawlCache, cache_requests
+from app.services.job_page_extraction import extract_job_details, parse_relative_date, resolve_parser  # noqa: F401
+from app.utils.metrics import registry
+from app.utils.process_pool import BoundedProcessPool
+
+extraction_seconds = registry.histogram(
+    "job_extraction_seconds", "Job page extraction latency, including any wait for a worker process"
+)
+extraction_failures = registry.counter(
+    "job_extraction_failures_total", "Job pages whose extraction raised"
+)
+extraction_fields = registry.counter(
+    "job_extraction_fields_total", "Extracted fields by the path that produced them (json_ld, selectors or none)"
+)
 
 class LinkedInCrawler:
-    def __init__(self):
+    def __init__(
+        self,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 15.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        parser: str = "html.parser",
+        extraction_pool: Optional[BoundedProcessPool] = None,
+        cache: Optional[CrawlCache] = None,
+    ):
         self.headers = {
             # Using a realistic User-Agent is important
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36',
             'Accept-Language': 'en-US,en;q=0.9',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
+            # Accept-Encoding is left to httpx, which only offers what it can decode
             # Add other headers that might help mimic a real browser visit
             'Sec-Ch-Ua': '"Not?A_Brand";v="8", "Chromium";v="108", "Google Chrome";v="108"',
             'Sec-Ch-Ua-Mobile': '?0',
@@ -61,9 +50,100 @@ class LinkedInCrawler:
             'Sec-Fetch-Site': 'same-origin', # Or 'none' if coming from external site
             'Upgrade-Insecure-Requests': '1',
         }
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self.parser = resolve_parser(parser)
+        # Parsing is pure CPU; without a pool it runs on the event loop thread
+        self.extraction_pool = extraction_pool
+        self.cache = cache
         self.logger = logging.getLogger("linkedin_crawler")
         logging.basicConfig(level=logging.INFO) # Basic logging config
 
+    def start(self):
+        """Open the shared connection pool; call once at application startup"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=self.limits,
+                follow_redirects=True,
+                transport=self.transport,
+            )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            # Scripts and tests that skip the app lifespan
+            self.start()
+        return self._client
+
+    async def fetch_page(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """GET a job page over the pooled client; raises httpx errors except for a 304"""
+        response = await self.client.get(url, headers=headers)
+        if response.status_code != 304:
+            response.raise_for_status()
+        self.logger.info(f"Successfully fetched URL: {url}. Status code: {response.status_code}")
+        return response
+
+    async def extract(self, html: str) -> Dict[str, Any]:
+        """Parse a fetched page, in the extraction pool when one is configured"""
+        start = time.perf_counter()
+        try:
+            if self.extraction_pool is not None:
+                return await self.extraction_pool.run(extract_job_details, html, self.parser)
+            return extract_job_details(html, self.parser)
+        except Exception:
+            extraction_failures.inc(parser=self.parser)
+            raise
+        finally:
+            extraction_seconds.observe(time.perf_counter() - start, parser=self.parser)
+
+    async def _cached(self, job_id: Optional[str]) -> Optional[dict]:
+        if self.cache is None or not job_id:
+            return None
+        try:
+            return await self.cache.get(job_id)
+        except PyMongoError as e:
+            # The cache is an optimisation; crawl without it
+            self.logger.warning(f"Crawl cache unavailable: {e}")
+            return None
+
+    async def _cached_details(self, job_id: str, cached: dict) -> Dict[str, Any]:
+        """Stored fields, re-extracted from the stored page if an older extractor produced them"""
+        if self.cache.is_current(cached):
+            return self.cache.details(cached)
+        try:
+            html = await self.cache.page(job_id)
+        except PyMongoError as e:
+            self.logger.warning(f"Crawl cache unavailable: {e}")
+            html = None
+        if html is None:
+            return self.cache.details(cached)
+        extracted = await self.extract(html)
+        extracted.pop("date_posted_text")
+        # Relative dates ("2 days ago") would drift if parsed again now
+        extracted["date_posted"] = cached.get("date_posted") or extracted["date_posted"]
+        await self._update_cache(self.cache.reextracted(job_id, extracted))
+        return extracted
+
+    async def _update_cache(self, write) -> None:
+        """Await a cache write; failing to cache must not fail the crawl"""
+        try:
+            await write
+        except PyMongoError as e:
+            self.logger.warning(f"Could not update the crawl cache: {e}")
+
     def extract_job_id(self, url: str) -> Optional[str]:
         """Extract LinkedIn job ID from URL."""
         # More robust regex to handle different URL formats
@@ -73,93 +153,11 @@ class LinkedInCrawler:
         self.logger.warning(f"Could not extract job ID from URL: {url}")
         return None
 
-    def get_element_text(self, soup: BeautifulSoup, selector: str, attribute: Optional[str] = None) -> Optional[str]:
-        """Safely find an element and return its text or attribute."""
-        try:
-            element = soup.select_one(selector)
-            if element:
-                if attribute:
-                    return element.get(attribute, '').strip()
-                # Handle cases where text might be split across multiple tags (e.g., within spans)
-                text_parts = [part.strip() for part in element.stripped_strings]
-                return ' '.join(text_parts) if text_parts else None
-        except Exception as e:
-            self.logger.error(f"Error extracting text with selector '{selector}': {e}")
-        return None
-
-    def get_job_description_text(self, soup: BeautifulSoup, selector: str) -> Optional[str]:
-        """Safely find the job description element and extract formatted text."""
-        try:
-            description_div = soup.select_one(selector)
-            if not description_div:
-                return None
-
-            # Attempt to preserve some formatting (paragraphs, lists)
-            content = []
-            for element in description_div.children:
-                if isinstance(element, NavigableString):
-                    text = element.strip()
-                    if text:
-                        content.append(text)
-                elif isinstance(element, Tag):
-                    # Avoid extracting text from known 'show more/less' button containers if element removal wasn't used
-                    # (Add class names/tags here if you identify them and didn't use decompose)
-                    # if 'some-show-more-class' in element.get('class', []):
-                    #    continue
-
-                    if element.name == 'ul':
-                        items = ["- " + li.get_text(strip=True) for li in element.find_all('li')]
-                        if items: # Only add if list has items
-                           content.append("\n" + "\n".join(items)) # Add newline before list
-                    elif element.name in ['p', 'div']:
-                        # Get text, ensuring spaces between inline elements are somewhat preserved
-                        text = element.get_text(separator=' ', strip=True)
-                        if text:
-                           content.append(text + "\n") # Add newline after paragraphs/divs
-                    elif element.name == 'br':
-                         # Add a newline for <br>, but only if the last element wasn't already adding one
-                        if content and not content[-1].endswith('\n'):
-                            content.append('\n')
-                    elif element.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                        text = element.get_text(strip=True)
-                        if text:
-                           content.append("\n" + text + "\n") # Add spacing around headers
-                    else:
-                         # For other inline tags like <strong>, <em>, <a> etc. get text directly
-                        text = element.get_text(strip=True)
-                        if text:
-                            content.append(text)
-
-
-            # --- Post-processing to remove unwanted trailing text ---
-            full_description = "\n".join(content).strip()
-
-            # Define common trailing texts to remove (case-insensitive check)
-            suffixes_to_remove = ["Show moreShow less", "Show less", "Show more"]
-
-            cleaned_description = full_description
-            lower_description = cleaned_description.lower() # Check against lowercase
-
-            for suffix in suffixes_to_remove:
-                if lower_description.endswith(suffix.lower()):
-                    # Remove the suffix, preserving original case as much as possible
-                    # Slice the original string based on the length of the found suffix
-                    cleaned_description = cleaned_description[:-len(suffix)].strip()
-                    lower_description = cleaned_description.lower() # Update for next check if needed
-
-            self.logger.debug(f"Original Description length: {len(full_description)}, Cleaned Description length: {len(cleaned_description)}")
-            return cleaned_description if cleaned_description else None # Return None if empty after cleaning
-
-        except Exception as e:
-            self.logger.error(f"Error extracting job description with selector '{selector}': {e}", exc_info=True)
-        return None
-
     async def get_job_details(self, url: str) -> Dict[str, Any]:
         """
         Crawl LinkedIn job page and extract relevant information.
-        NOTE: This uses synchronous 'requests'. For high-concurrency applications,
-        consider using an async HTTP client like 'httpx' or running this
-        in a separate thread pool executor (e.g., FastAPI's run_in_executor).
+        The page is fetched on the shared async client, so a slow response
+        only holds up this crawl, not the event loop.
         """
         job_id = self.extract_job_id(url)
         details = {
@@ -170,6 +168,7 @@ class LinkedInCrawler:
             "location": None,
             "job_description": None,
             "date_posted": None,
+            "field_sources": {}, # Which extraction path produced each field
             # Add more fields if needed later
             # "company_url": None,
             # "seniority_level": None,
@@ -178,47 +177,38 @@ class LinkedInCrawler:
             # "industries": None,
         }
 
+        cached = await self._cached(job_id)
+        if cached is not None and self.cache.is_fresh(cached):
+            cache_requests.inc(result="fresh")
+            self.logger.info(f"Serving {url} from the crawl cache")
+            details.update(await self._cached_details(job_id, cached))
+            return details
+
         try:
             self.logger.info(f"Attempting to crawl LinkedIn job at: {url}")
             # Add a small delay to be polite
             # time.sleep(random.uniform(1, 3)) # Consider adding random delays
 
-            # --- Perform the HTTP GET request ---
-            # Using a session object can potentially handle cookies if needed later
-            session = requests.Session()
-            session.headers.update(self.headers)
-            response = session.get(url, timeout=15) # Add a timeout
-            response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
-
-            self.logger.info(f"Successfully fetched URL: {url}. Status code: {response.status_code}")
-
-            # --- Parse the HTML content ---
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # --- Extract Job Details ---
-            # NOTE: These selectors are based on common LinkedIn structures (as of late 2023/early 2024)
-            # AND ARE LIKELY TO CHANGE. They require inspection and adjustment.
-
-            # Title: Often in an <h1> tag within the top card
-            details["title"] = self.get_element_text(soup, 'h1.top-card-layout__title, h1.job-title, .job-details-jobs-unified-top-card__job-title')
-
-            # Company Name: Often a link within the top card or a specific span
-            details["company"] = self.get_element_text(soup, 'a.topcard__org-name-link, span.job-details-jobs-unified-top-card__company-name, .topcard__flavor a')
-            if not details["company"]: # Fallback selector
-                 details["company"] = self.get_element_text(soup, '.job-card-container__company-name, .job-details-jobs-unified-top-card__primary-description-without-tagline a')
-
-
-            # Location: Often a span within the top card
-            details["location"] = self.get_element_text(soup, 'span.topcard__flavor--bullet, span.job-details-jobs-unified-top-card__bullet, .job-details-jobs-unified-top-card__primary-description-without-tagline span:first-of-type') # Take the first span if multiple
-
-            # Job Description: Usually within a specific div
-            # Look for common description container classes
-            details["job_description"] = self.get_job_description_text(soup, 'div.description__text--rich, div.show-more-less-html__markup, .jobs-description-content__text')
-
-            # Date Posted: Often relative time in a span
-            date_str = self.get_element_text(soup, 'span.posted-time-ago__text, span.job-details-jobs-unified-top-card__posted-date')
+            # --- Perform the HTTP GET request (conditional when we hold a copy) ---
+            response = await self.fetch_page(url, self.cache.validators(cached) if cached else None)
+            if response.status_code == 304 and cached is not None:
+                cache_requests.inc(result="revalidated")
+                self.logger.info(f"{url} not modified; reusing cached details")
+                await self._update_cache(self.cache.revalidated(job_id, response.headers))
+                details.update(await self._cached_details(job_id, cached))
+                return details
+            if self.cache is not None and job_id:
+                cache_requests.inc(result="miss")
+
+            # --- Parse the HTML content (off the event loop) ---
+            extracted = await self.extract(response.text)
+            date_str = extracted.pop("date_posted_text")
+            details.update(extracted)
+            if self.cache is not None and job_id and any(details["field_sources"].values()):
+                await self._update_cache(self.cache.store(job_id, url, response.text, details, response.headers))
+            for field, source in details["field_sources"].items():
+                extraction_fields.inc(field=field, source=source or "none")
             if date_str:
-                details["date_posted"] = parse_relative_date(date_str)
                 self.logger.info(f"Parsed relative date string '{date_str}' to {details['date_posted']}")
             else:
                  self.logger.warning(f"Could not find date posted element for {url}")
@@ -235,19 +225,26 @@ class LinkedInCrawler:
 
             return details
 
-        except requests.exceptions.HTTPError as http_err:
+        except httpx.HTTPStatusError as http_err:
             self.logger.error(f"HTTP error occurred while scraping {url}: {http_err} - Status Code: {http_err.response.status_code}")
             # You might want specific handling for 404 (Not Found) vs 429 (Too Many Requests) etc.
-        except requests.exceptions.ConnectionError as conn_err:
+        except httpx.ConnectError as conn_err:
             self.logger.error(f"Connection error occurred while scraping {url}: {conn_err}")
-        except requests.exceptions.Timeout as timeout_err:
+        except httpx.TimeoutException as timeout_err:
             self.logger.error(f"Timeout error occurred while scraping {url}: {timeout_err}")
-        except requests.exceptions.RequestException as req_err:
+        except httpx.RequestError as req_err:
             self.logger.error(f"An ambiguous request error occurred while scraping {url}: {req_err}")
         except Exception as e:
             # Catch any other unexpected errors during scraping/parsing
             self.logger.error(f"An unexpected error occurred scraping LinkedIn job {url}: {str(e)}", exc_info=True) # Include stack trace
 
+        if cached is not None:
+            # Stale beats nothing while LinkedIn is failing
+            cache_requests.inc(result="stale_on_error")
+            self.logger.warning(f"Serving stale cached details for {url}")
+            details.update(self.cache.details(cached))
+            return details
+
         # Return the partially filled or empty details dictionary in case of errors
         # Ensures the API endpoint still gets a dictionary back, even if scraping fails.
         return details
\ No newline at end of file
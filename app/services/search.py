@@ -0,0 +1,267 @@
+import heapq
+import html
+import math
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from bson import ObjectId
+
+from app.models.application import SUMMARY_PROJECTION
+from app.models.job_posting import JOB_POSTINGS_COLLECTION
+from app.services import job_postings
+from app.utils.cache import TTLCache
+
+# Searchable fields and their relative weight (mirrors the Mongo text index weights)
+FIELD_WEIGHTS = {"title": 10.0, "company": 5.0, "job_description": 1.0}
+
+SEARCH_PROJECTION = {**SUMMARY_PROJECTION, "linkedin_job_id": 1, "job_description": 1}
+SNIPPET_WIDTH = 160
+
+_TOKEN = re.compile(r"\w[\w+#]*", re.UNICODE)
+_PHRASE = re.compile(r'"([^"]+)"')
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return [t.lower() for t in _TOKEN.findall(text or "")]
+
+
+class SearchQuery(NamedTuple):
+    terms: List[str]           # scored, any may match
+    phrases: List[List[str]]   # every phrase must appear
+
+    @property
+    def tokens(self) -> List[str]:
+        return self.terms + [t for phrase in self.phrases for t in phrase]
+
+    def mongo_search(self) -> str:
+        """Render as a $text $search string (phrases quoted)"""
+        return " ".join(self.terms + [f'"{" ".join(p)}"' for p in self.phrases])
+
+
+def parse_query(q: str) -> SearchQuery:
+    """Split quoted phrases from loose terms"""
+    phrases = [tokenize(p) for p in _PHRASE.findall(q)]
+    terms = tokenize(_PHRASE.sub(" ", q))
+    return SearchQuery(terms=terms, phrases=[p for p in phrases if p])
+
+
+def highlight(text: Optional[str], query: SearchQuery, width: int = SNIPPET_WIDTH) -> Optional[str]:
+    """HTML-escaped snippet around the first match with matches wrapped in <mark>"""
+    if not text:
+        return None
+    alternatives = [r"\W+".join(map(re.escape, p)) for p in query.phrases]
+    alternatives += [re.escape(t) for t in sorted(set(query.terms), key=len, reverse=True)]
+    if not alternatives:
+        return None
+    pattern = re.compile(r"\b(?:" + "|".join(alternatives) + r")\b", re.IGNORECASE)
+    first = pattern.search(text)
+    if first is None:
+        return None
+
+    start = max(0, first.start() - width // 3)
+    end = min(len(text), start + width)
+    window = text[start:end]
+    parts, last = [], 0
+    for match in pattern.finditer(window):
+        parts.append(html.escape(window[last:match.start()]))
+        parts.append(f"<mark>{html.escape(match.group(0))}</mark>")
+        last = match.end()
+    parts.append(html.escape(window[last:]))
+    return ("…" if start > 0 else "") + "".join(parts).strip() + ("…" if end < len(text) else "")
+
+
+def highlights(doc: dict, query: SearchQuery) -> Dict[str, str]:
+    snippets = {field: highlight(doc.get(field), query) for field in FIELD_WEIGHTS}
+    return {field: snippet for field, snippet in snippets.items() if snippet}
+
+
+def _matches_filters(doc: dict, filters: Dict[str, Any]) -> bool:
+    if "status" in filters and doc.get("status") != filters["status"]:
+        return False
+    if "archived_at" in filters and doc.get("archived_at") is not None:
+        return False  # only ever filtered as {"archived_at": None}
+    updated_range = filters.get("updated_at", {})
+    if "$gte" in updated_range and doc["updated_at"] < updated_range["$gte"]:
+        return False
+    if "$lte" in updated_range and doc["updated_at"] > updated_range["$lte"]:
+        return False
+    return True
+
+
+class InvertedIndex:
+    """Weighted term -> document postings for one user's applications, ranked with BM25"""
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[ObjectId, float]] = {}
+        self.docs: Dict[ObjectId, dict] = {}
+        self.lengths: Dict[ObjectId, float] = {}
+        self.normalized: Dict[ObjectId, List[str]] = {}  # " token token " per field, for phrase checks
+        self.watermark: Optional[datetime] = None  # newest updated_at indexed
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, doc: dict):
+        doc_id = doc["_id"]
+        if doc_id in self.docs:
+            self.remove(doc_id)
+        weighted: Counter = Counter()
+        normalized = []
+        for field, weight in FIELD_WEIGHTS.items():
+            tokens = tokenize(doc.get(field))
+            for token in tokens:
+                weighted[token] += weight
+            normalized.append(f" {' '.join(tokens)} ")
+        for token, frequency in weighted.items():
+            self.postings.setdefault(token, {})[doc_id] = frequency
+        self.docs[doc_id] = doc
+        self.lengths[doc_id] = sum(weighted.values())
+        self.normalized[doc_id] = normalized
+        if self.watermark is None or doc["updated_at"] > self.watermark:
+            self.watermark = doc["updated_at"]
+
+    def remove(self, doc_id: ObjectId):
+        doc = self.docs.pop(doc_id, None)
+        if doc is None:
+            return
+        self.lengths.pop(doc_id, None)
+        for token in set(" ".join(self.normalized.pop(doc_id)).split()):
+            postings = self.postings.get(token)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self.postings[token]
+
+    def _has_phrase(self, doc_id: ObjectId, phrase: List[str]) -> bool:
+        needle = f" {' '.join(phrase)} "
+        return any(needle in text for text in self.normalized[doc_id])
+
+    def search(self, query: SearchQuery, filters: Dict[str, Any], limit: int) -> List[Tuple[float, dict]]:
+        if not self.docs:
+            return []
+        # Like $text: phrases are required, loose terms only add to the score
+        if query.phrases:
+            candidates = None
+            for phrase in query.phrases:
+                for token in phrase:
+                    ids = set(self.postings.get(token, ()))
+                    candidates = ids if candidates is None else candidates & ids
+            candidates = {
+                doc_id for doc_id in candidates
+                if all(self._has_phrase(doc_id, phrase) for phrase in query.phrases)
+            }
+        else:
+            candidates = set()
+            for token in query.terms:
+                candidates.update(self.postings.get(token, ()))
+
+        count = len(self.docs)
+        average_length = sum(self.lengths.values()) / count or 1.0
+        scores: Dict[ObjectId, float] = {}
+        for token in set(query.tokens):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                if doc_id not in candidates:
+                    continue
+                norm = self.K1 * (1 - self.B + self.B * self.lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.K1 + 1) / (frequency + norm)
+
+        return heapq.nlargest(
+            limit,
+            ((score, self.docs[doc_id]) for doc_id, score in scores.items()
+             if _matches_filters(self.docs[doc_id], filters)),
+            key=lambda item: item[0],
+        )
+
+
+async def _load_documents(db, query: dict) -> List[dict]:
+    docs = await db.applications.find(query, SEARCH_PROJECTION).to_list(length=None)
+    await job_postings.attach_job_descriptions(db, docs)
+    return docs
+
+
+class MemorySearchBackend:
+    """Per-user inverted indexes held in process memory.
+
+    Indexes are built on first search and kept current by re-indexing
+    applications whose updated_at moved past the index watermark; a count
+    mismatch afterwards (a delete) triggers a full rebuild. This works across
+    processes without write hooks, at the cost of two indexed queries per search.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_users: int, ttl: float):
+        self.indexes = TTLCache("search_index", max_size=max_users, ttl=ttl)
+
+    async def _index_for(self, db, user_id: ObjectId) -> InvertedIndex:
+        index = self.indexes.get(user_id)
+        if index is not None and index.watermark is not None:
+            for doc in await _load_documents(db, {"user_id": user_id, "updated_at": {"$gte": index.watermark}}):
+                index.add(doc)
+        if index is None or len(index) != await db.applications.count_documents({"user_id": user_id}):
+            index = InvertedIndex()
+            for doc in await _load_documents(db, {"user_id": user_id}):
+                index.add(doc)
+        self.indexes.set(user_id, index)
+        return index
+
+    async def search(self, db, user_id: ObjectId, query: SearchQuery, filters: Dict[str, Any], limit: int) -> List[Tuple[float, dict]]:
+        index = await self._index_for(db, user_id)
+        return index.search(query, filters, limit)
+
+
+class MongoTextSearchBackend:
+    """Ranks with the applications and job_postings text indexes.
+
+    Descriptions mostly live on shared job postings, so postings matching the
+    query (restricted to the user's job IDs) contribute their score to every
+    application that references them.
+    """
+
+    name = "mongo"
+
+    async def search(self, db, user_id: ObjectId, query: SearchQuery, filters: Dict[str, Any], limit: int) -> List[Tuple[float, dict]]:
+        text = {"$text": {"$search": query.mongo_search()}}
+        score = {"score": {"$meta": "textScore"}}
+        base = {"user_id": user_id, **filters}
+
+        scores: Dict[ObjectId, float] = {}
+        docs: Dict[ObjectId, dict] = {}
+        cursor = db.applications.find({**base, **text}, {**SEARCH_PROJECTION, **score})
+        async for doc in cursor.sort([("score", {"$meta": "textScore"})]).limit(limit):
+            scores[doc["_id"]] = doc.pop("score")
+            docs[doc["_id"]] = doc
+
+        job_ids = await db.applications.distinct("linkedin_job_id", {**base, "linkedin_job_id": {"$ne": None}})
+        if job_ids:
+            cursor = db[JOB_POSTINGS_COLLECTION].find({**text, "_id": {"$in": job_ids}}, score)
+            posting_scores = {
+                posting["_id"]: posting["score"]
+                async for posting in cursor.sort([("score", {"$meta": "textScore"})]).limit(limit)
+            }
+            if posting_scores:
+                cursor = db.applications.find({**base, "linkedin_job_id": {"$in": list(posting_scores)}}, SEARCH_PROJECTION)
+                async for doc in cursor:
+                    scores[doc["_id"]] = scores.get(doc["_id"], 0.0) + posting_scores[doc["linkedin_job_id"]]
+                    docs.setdefault(doc["_id"], doc)
+
+        ranked = sorted(((s, docs[doc_id]) for doc_id, s in scores.items()), key=lambda item: item[0], reverse=True)[:limit]
+        await job_postings.attach_job_descriptions(db, [doc for _, doc in ranked])
+        return ranked
+
+
+def create_backend(name: str, max_users: int, ttl: float):
+    if name == "memory":
+        return MemorySearchBackend(max_users=max_users, ttl=ttl)
+    if name == "mongo":
+        return MongoTextSearchBackend()
+    raise ValueError(f"Unknown SEARCH_BACKEND: {name}")
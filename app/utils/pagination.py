@@ -0,0 +1,32 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+from bson import ObjectId
+
+
+def encode_cursor(sort_value: datetime, document_id: ObjectId) -> str:
+    """Build an opaque continuation token from the last item's sort key"""
+    raw = json.dumps({"t": sort_value.isoformat(), "i": str(document_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, ObjectId]:
+    """Reverse encode_cursor; raises ValueError for malformed tokens"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["t"]), ObjectId(data["i"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {token}") from e
+
+
+def keyset_after(field: str, sort_value: datetime, document_id: ObjectId) -> dict:
+    """Filter for documents after the cursor in (field desc, _id desc) order"""
+    return {
+        "$or": [
+            {field: {"$lt": sort_value}},
+            {field: sort_value, "_id": {"$lt": document_id}},
+        ]
+    }
@@ -0,0 +1,102 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from app.utils.metrics import registry
+
+pool_queue_depth = registry.gauge(
+    "process_pool_queue_depth", "Tasks waiting for a free worker process"
+)
+pool_in_flight = registry.gauge(
+    "process_pool_in_flight", "Tasks admitted to the pool (running or queued)"
+)
+pool_rejected = registry.counter(
+    "process_pool_rejected_total", "Tasks rejected because the wait queue was full"
+)
+pool_task_seconds = registry.histogram(
+    "process_pool_task_seconds", "Time spent executing a task in a worker process"
+)
+pool_latency_seconds = registry.histogram(
+    "process_pool_latency_seconds", "End-to-end task latency including queue wait"
+)
+
+
+class PoolBusyError(Exception):
+    """Raised when a pool's wait queue is full and a task is rejected"""
+    def __init__(self, pool_name: str):
+        self.pool_name = pool_name
+        super().__init__(f"Process pool '{pool_name}' is at capacity")
+
+
+def _timed_call(fn: Callable, *args) -> tuple:
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class BoundedProcessPool:
+    """Process pool for CPU-bound work with a bounded wait queue.
+
+    At most ``max_workers`` tasks run at once and at most ``max_queue`` more
+    may wait; anything beyond that is rejected immediately with
+    PoolBusyError instead of piling up behind the busy workers.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+
+    def start(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._in_flight - self.max_workers)
+
+    def _update_gauges(self):
+        pool_in_flight.set(self._in_flight, pool=self.name)
+        pool_queue_depth.set(self.queue_depth, pool=self.name)
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run ``fn(*args)`` in a worker process, rejecting when saturated"""
+        if self._in_flight >= self.max_workers + self.max_queue:
+            pool_rejected.inc(pool=self.name)
+            raise PoolBusyError(self.name)
+
+        self.start()
+        self._in_flight += 1
+        self._update_gauges()
+        start = time.perf_counter()
+        executor = self._executor
+        try:
+            loop = asyncio.get_running_loop()
+            result, elapsed = await loop.run_in_executor(
+                executor, _timed_call, fn, *args
+            )
+            pool_task_seconds.observe(elapsed, pool=self.name)
+            return result
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge input); start fresh on the next task,
+            # unless a concurrent failure already replaced the broken executor
+            if self._executor is executor:
+                self.shutdown()
+            raise
+        finally:
+            self._in_flight -= 1
+            self._update_gauges()
+            pool_latency_seconds.observe(time.perf_counter() - start, pool=self.name)
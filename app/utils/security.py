@@ -3,15 +3,30 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config import settings
+from app.utils.process_pool import BoundedProcessPool
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+hashing_pool = BoundedProcessPool(
+    "password_hashing",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password, hashed_password):
+    """Verify a password in the hashing pool; raises PoolBusyError when saturated"""
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    """Hash a password in the hashing pool; raises PoolBusyError when saturated"""
+    return await hashing_pool.run(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
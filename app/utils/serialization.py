@@ -0,0 +1,88 @@
+import json
+import typing
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Type
+
+from bson import ObjectId
+from fastapi import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib encoder produces the same JSON
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson (when installed) from plain Python data"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _list_item_model(annotation) -> Optional[Type[BaseModel]]:
+    if typing.get_origin(annotation) in (list, typing.List):
+        (item,) = typing.get_args(annotation) or (None,)
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            return item
+    return None
+
+
+class TrustedShape:
+    """Shapes documents we wrote ourselves into a response model's fields.
+
+    No validation runs: fields are copied in model order, missing optional
+    fields get the model default, and lists of nested models are shaped the
+    same way. The output serializes to the same JSON as the validated model.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self.fields = [
+            (name, field, field.is_required(), self._nested(field))
+            for name, field in model.model_fields.items()
+        ]
+
+    @staticmethod
+    def _nested(field) -> Optional["TrustedShape"]:
+        item = _list_item_model(field.annotation)
+        return TrustedShape(item) if item is not None else None
+
+    def __call__(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        shaped = {}
+        for name, field, required, nested in self.fields:
+            if name in doc:
+                value = doc[name]
+            elif required:
+                raise KeyError(f"{self.model.__name__}.{name} missing from document")
+            else:
+                value = field.get_default(call_default_factory=True)
+            if nested is not None and value:
+                value = [nested(item) for item in value]
+            shaped[name] = value
+        return shaped
+
+
+def trusted_response(content: Any, response: Optional[Response] = None, status_code: int = 200) -> FastJSONResponse:
+    """Return already-shaped data directly, keeping headers set on the injected response"""
+    headers = {
+        key: value for key, value in (response.headers.items() if response is not None else [])
+        if key.lower() != "content-length"
+    }
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
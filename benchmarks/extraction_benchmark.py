@@ -0,0 +1,100 @@
+"""
+Event-loop stall while crawls parse large job pages.
+
+    python -m benchmarks.extraction_benchmark
+
+Four pages of ~400KB are "crawled" concurrently from an in-memory transport,
+first parsed on the loop thread, then in the html_extraction process pool. The
+loop stall is the longest gap a 10ms ticker task saw, which is how long any
+unrelated API request would have waited.
+
+The last lines compare extracting one page through the JSON-LD fast path
+with the DOM selector path it falls back to.
+"""
+import asyncio
+import json
+import logging
+import time
+
+import httpx
+
+from app.services.job_page_extraction import extract_job_details
+from app.services.linkedin_crawler import LinkedInCrawler
+from app.utils.process_pool import BoundedProcessPool
+
+PAGES = 4
+PAGE = (
+    '<h1 class="top-card-layout__title">Backend Engineer</h1>'
+    '<span class="posted-time-ago__text">2 days ago</span>'
+    '<div class="show-more-less-html__markup">'
+    + "<p>Build and operate distributed systems.</p>" * 10000
+    + "</div>"
+)
+
+
+JSON_LD_PAGE = '<script type="application/ld+json">{}</script>'.format(json.dumps({
+    "@type": "JobPosting",
+    "title": "Backend Engineer",
+    "hiringOrganization": {"@type": "Organization", "name": "Acme"},
+    "jobLocation": {"address": {"addressLocality": "Berlin", "addressCountry": "DE"}},
+    "datePosted": "2026-10-01",
+    "description": "<p>Build and operate distributed systems.</p>" * 10000,
+})) + PAGE
+
+
+def fast_path():
+    for label, page in [("json-ld", JSON_LD_PAGE), ("selectors", PAGE)]:
+        start = time.perf_counter()
+        details = extract_job_details(page)
+        elapsed = time.perf_counter() - start
+        sources = sorted(set(details["field_sources"].values()) - {None})
+        print(f"{label:<13} one page {elapsed * 1000:8.1f}ms   sources {sources}")
+
+
+async def ticker(stop: asyncio.Event) -> float:
+    worst, last = 0.0, time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0.01)
+        now = time.perf_counter()
+        worst = max(worst, now - last - 0.01)
+        last = now
+    return worst
+
+
+async def crawl_all(pool, parser: str):
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text=PAGE))
+    crawler = LinkedInCrawler(transport=transport, parser=parser, extraction_pool=pool)
+    if pool is not None:
+        pool.start()
+        await pool.run(pow, 2, 2)  # spawn the workers outside the measurement
+    stop = asyncio.Event()
+    stall = asyncio.create_task(ticker(stop))
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        crawler.get_job_details(f"https://www.linkedin.com/jobs/view/{i}/") for i in range(PAGES)
+    ])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    label = "process pool" if pool is not None else "event loop"
+    print(f"{label:<13} {parser:<12} total {elapsed:6.2f}s   worst loop stall {await stall * 1000:8.1f}ms")
+    if pool is not None:
+        pool.shutdown()
+    await crawler.close()
+
+
+def main():
+    logging.disable(logging.INFO)
+    parsers = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+        parsers.append("lxml")
+    except ImportError:
+        print("lxml not installed; skipping the lxml parser")
+    for parser in parsers:
+        asyncio.run(crawl_all(None, parser))
+        asyncio.run(crawl_all(BoundedProcessPool("html_extraction", 2, 8), parser))
+    fast_path()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Search benchmark at 10k applications for one user.
+
+    python -m benchmarks.search_benchmark                  # in-memory index
+    python -m benchmarks.search_benchmark --mongo mongodb://localhost:27017
+
+The Mongo run writes to a scratch database (job_tracker_search_bench) and drops it afterwards.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.services.search import InvertedIndex, MongoTextSearchBackend, parse_query
+
+WORDS = (
+    "python kubernetes react terraform golang rust java typescript aws gcp azure docker "
+    "backend frontend platform data machine learning reliability site security mobile "
+    "distributed systems scale latency team remote hybrid senior staff principal junior "
+    "engineer developer manager analyst scientist observability postgres mongodb kafka"
+).split()
+COMPANIES = [f"Company {i}" for i in range(400)]
+QUERIES = ["kubernetes", "python backend", '"site reliability"', "senior golang kafka", "react typescript frontend", "staff"]
+
+
+def make_applications(user_id: ObjectId, count: int, seed: int = 7):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": ObjectId(),
+            "user_id": user_id,
+            "title": " ".join(rng.choices(WORDS, k=3)).title(),
+            "company": rng.choice(COMPANIES),
+            "job_description": " ".join(rng.choices(WORDS, k=rng.randint(150, 600))),
+            "status": rng.choice(["Wishlist", "Applied", "Interview", "Rejected"]),
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now - timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+
+def report(label: str, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"  {label:<28} p50 {statistics.median(timings) * 1000:8.2f} ms   p95 {p95 * 1000:8.2f} ms")
+
+
+def bench_memory(apps, repeat: int):
+    start = time.perf_counter()
+    index = InvertedIndex()
+    for app in apps:
+        index.add(app)
+    print(f"memory: built index over {len(apps)} applications in {time.perf_counter() - start:.2f}s")
+    for q in QUERIES:
+        query = parse_query(q)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            index.search(query, {}, 20)
+            timings.append(time.perf_counter() - start)
+        report(q, timings)
+
+
+async def bench_mongo(url: str, apps, user_id: ObjectId, repeat: int):
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo import ASCENDING, TEXT, IndexModel
+
+    client = AsyncIOMotorClient(url)
+    db = client["job_tracker_search_bench"]
+    try:
+        await db.applications.create_indexes([IndexModel(
+            [("user_id", ASCENDING), ("title", TEXT), ("company", TEXT), ("job_description", TEXT)],
+            weights={"title": 10, "company": 5, "job_description": 1},
+        )])
+        await db.applications.insert_many(apps)
+        backend = MongoTextSearchBackend()
+        print(f"mongo: {len(apps)} applications with inline descriptions")
+        for q in QUERIES:
+            query = parse_query(q)
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                await backend.search(db, user_id, query, {}, 20)
+                timings.append(time.perf_counter() - start)
+            report(q, timings)
+    finally:
+        await client.drop_database("job_tracker_search_bench")
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--mongo", help="MongoDB URL; also benchmark the text-index backend")
+    args = parser.parse_args()
+
+    user_id = ObjectId()
+    apps = make_applications(user_id, args.count)
+    bench_memory(apps, args.repeat)
+    if args.mongo:
+        asyncio.run(bench_mongo(args.mongo, apps, user_id, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
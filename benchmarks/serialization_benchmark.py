@@ -0,0 +1,95 @@
+"""
+Per-document cost of serializing application list responses.
+
+    python -m benchmarks.serialization_benchmark
+
+"before" is the previous path: Application(**doc) per document, then FastAPI
+validating the list against response_model and encoding it. "after" shapes the
+trusted Mongo documents directly and renders them with FastJSONResponse.
+"""
+import json
+import time
+from datetime import datetime
+from typing import List
+
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+from app.models.application import Application
+from app.utils.serialization import FastJSONResponse, TrustedShape, orjson
+
+REPEAT = 20
+
+adapter = TypeAdapter(List[Application])
+shape = TrustedShape(Application)
+
+
+def make_document() -> dict:
+    now = datetime.utcnow()
+    return {
+        "_id": ObjectId(),
+        "user_id": ObjectId(),
+        "linkedin_url": "https://www.linkedin.com/jobs/view/4012345678/",
+        "linkedin_job_id": "4012345678",
+        "title": "Senior Backend Engineer",
+        "company": "Acme",
+        "location": "Berlin, Germany",
+        "job_description": "Build and operate distributed systems. " * 80,
+        "date_posted": now,
+        "applied_date": now,
+        "status": "Interview",
+        "notes": "Referred by a former colleague",
+        "enrichment_status": "complete",
+        "status_history": [
+            {"status": "Wishlist", "previous_status": None, "changed_at": now, "notes": "Application created"},
+            {"status": "Applied", "previous_status": "Wishlist", "changed_at": now, "notes": None},
+            {"status": "Interview", "previous_status": "Applied", "changed_at": now, "notes": "Phone screen"},
+        ],
+        "documents": [{"name": "cv.pdf", "type": "Resume", "content": "x" * 200, "created_at": now}],
+        "contacts": [{"name": "Jane Doe", "position": "Recruiter", "email": "jane@example.com", "notes": None}],
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def before_old_fastapi(docs) -> bytes:
+    # Older FastAPI: validate, dump to Python, then json.dumps in JSONResponse
+    models = [Application(**{**d, "id": str(d["_id"]), "user_id": str(d["user_id"])}) for d in docs]
+    return json.dumps(adapter.dump_python(adapter.validate_python(models), mode="json")).encode("utf-8")
+
+
+def before_new_fastapi(docs) -> bytes:
+    # Newer FastAPI serializes straight to JSON bytes with pydantic-core
+    models = [Application(**{**d, "id": str(d["_id"]), "user_id": str(d["user_id"])}) for d in docs]
+    return adapter.dump_json(adapter.validate_python(models))
+
+
+def after(docs) -> bytes:
+    shaped = [shape({**d, "id": str(d["_id"]), "user_id": str(d["user_id"])}) for d in docs]
+    return FastJSONResponse(shaped).body
+
+
+def per_document_us(fn, docs) -> float:
+    fn(docs)
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn(docs)
+    return (time.perf_counter() - start) / REPEAT / len(docs) * 1e6
+
+
+def main():
+    print(f"JSON encoder: {'orjson' if orjson is not None else 'json (stdlib)'}")
+    for size in (100, 1000):
+        docs = [make_document() for _ in range(size)]
+        assert json.loads(after(docs)) == json.loads(before_new_fastapi(docs))
+        print(f"{size} documents")
+        for label, fn in (
+            ("before (json.dumps)", before_old_fastapi),
+            ("before (pydantic-core)", before_new_fastapi),
+            ("after", after),
+        ):
+            print(f"  {label:<24} {per_document_us(fn, docs):8.2f} us/doc")
+
+
+if __name__ == "__main__":
+    main()
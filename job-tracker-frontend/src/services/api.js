@@ -1,7 +1,9 @@
 import axios from "axios";
 
+const API_BASE_URL = "http://localhost:8000/api/v1";
+
 const apiClient = axios.create({
-  baseURL: "http://localhost:8000/api/v1",
+  baseURL: API_BASE_URL,
   headers: {
     "Content-Type": "application/json",
   },
@@ -43,8 +45,11 @@ export default {
   },
 
   // Application services
-  getApplications() {
-    return apiClient.get("/applications/");
+  getApplications(params = {}) {
+    return apiClient.get("/applications/", { params });
+  },
+  getApplicationStats() {
+    return apiClient.get("/applications/stats");
   },
   getApplication(id) {
     return apiClient.get(`/applications/${id}`);
@@ -83,4 +88,11 @@ export default {
     const params = token ? { token } : {};
     return apiClient.get("/github/rate-limit", { params });
   },
+
+  // Live updates (EventSource cannot send headers, so the token goes in the query)
+  openChangeStream() {
+    const token = localStorage.getItem("token");
+    const params = new URLSearchParams({ access_token: token || "" });
+    return new EventSource(`${API_BASE_URL}/events/stream?${params}`);
+  },
 };
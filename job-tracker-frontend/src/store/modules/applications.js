@@ -1,9 +1,12 @@
 import api from "@/services/api";
 
+let changeStream = null;
+
 export default {
   namespaced: true,
   state: {
     applications: [],
+    stats: null,
     currentApplication: null,
     loading: false,
     error: null,
@@ -16,6 +19,7 @@ export default {
   },
   getters: {
     applications: (state) => state.applications,
+    stats: (state) => state.stats,
     currentApplication: (state) => state.currentApplication,
     generatedEmail: (state) => state.generatedEmail,
     emailGenerationLoading: (state) => state.emailGenerationLoading,
@@ -38,6 +42,9 @@ export default {
     SET_APPLICATIONS(state, applications) {
       state.applications = applications;
     },
+    SET_STATS(state, stats) {
+      state.stats = stats;
+    },
     SET_CURRENT_APPLICATION(state, application) {
       state.currentApplication = application;
     },
@@ -52,6 +59,16 @@ export default {
         state.applications.splice(index, 1, updatedApplication);
       }
     },
+    PATCH_APPLICATION(state, { id, fields, removed = [] }) {
+      const index = state.applications.findIndex((a) => a.id === id);
+      if (index !== -1) {
+        const patched = { ...state.applications[index], ...fields };
+        removed.forEach((field) => {
+          patched[field] = null;
+        });
+        state.applications.splice(index, 1, patched);
+      }
+    },
     REMOVE_APPLICATION(state, id) {
       state.applications = state.applications.filter((a) => a.id !== id);
     },
@@ -84,8 +101,15 @@ export default {
     async fetchApplications({ commit }) {
       commit("SET_LOADING", true);
       try {
-        const response = await api.getApplications();
-        commit("SET_APPLICATIONS", response.data);
+        // Follow the keyset cursor until every page has been loaded
+        let applications = [];
+        let cursor = null;
+        do {
+          const response = await api.getApplications(cursor ? { cursor } : {});
+          applications = applications.concat(response.data);
+          cursor = response.headers["x-next-cursor"];
+        } while (cursor);
+        commit("SET_APPLICATIONS", applications);
       } catch (error) {
         commit(
           "SET_ERROR",
@@ -96,6 +120,21 @@ export default {
       }
     },
 
+    async fetchStats({ commit }) {
+      commit("SET_LOADING", true);
+      try {
+        const response = await api.getApplicationStats();
+        commit("SET_STATS", response.data);
+      } catch (error) {
+        commit(
+          "SET_ERROR",
+          error.response?.data?.detail || "Failed to fetch statistics"
+        );
+      } finally {
+        commit("SET_LOADING", false);
+      }
+    },
+
     async fetchApplication({ commit }, id) {
       commit("SET_LOADING", true);
       try {
@@ -161,6 +200,49 @@ export default {
       }
     },
 
+    // Apply server-pushed deltas instead of polling the list
+    subscribeToChanges({ dispatch }) {
+      if (changeStream || typeof EventSource === "undefined") {
+        return;
+      }
+      changeStream = api.openChangeStream();
+      changeStream.addEventListener("change", (event) => {
+        const delta = JSON.parse(event.data);
+        if (delta.collection === "applications") {
+          dispatch("applyApplicationChange", delta);
+        }
+      });
+      changeStream.addEventListener("reset", () => {
+        dispatch("fetchApplications");
+      });
+    },
+
+    unsubscribeFromChanges() {
+      if (changeStream) {
+        changeStream.close();
+        changeStream = null;
+      }
+    },
+
+    async applyApplicationChange({ commit, state }, { op, id, fields = {}, removed }) {
+      const known = state.applications.some((a) => a.id === id);
+      if (op === "delete" || fields.archived_at) {
+        commit("REMOVE_APPLICATION", id);
+      } else if (known) {
+        commit("PATCH_APPLICATION", { id, fields, removed });
+      } else {
+        // New (or unarchived) application: load the full summary once
+        try {
+          const response = await api.getApplication(id);
+          if (!state.applications.some((a) => a.id === id)) {
+            commit("ADD_APPLICATION", response.data);
+          }
+        } catch (error) {
+          // Gone again before we could load it
+        }
+      }
+    },
+
     async generateEmail(
       { commit },
       { applicationId, projectIds, language = "english" }
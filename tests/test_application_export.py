@@ -0,0 +1,27 @@
+import asyncio
+import gzip
+
+import pytest
+
+from app.services.application_export import csv_chunks, gzip_chunks, parse_columns
+
+
+async def _batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+async def _collect(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+def test_unknown_columns_are_rejected():
+    assert "job_description" not in parse_columns(None)
+    with pytest.raises(ValueError):
+        parse_columns("title,password")
+
+
+def test_csv_stream_is_gzipped_incrementally():
+    batches = _batches([{"title": "A, B"}], [{"title": "C"}])
+    body = asyncio.run(_collect(gzip_chunks(csv_chunks(batches, ["title"]))))
+    assert gzip.decompress(body).decode().splitlines() == ["title", '"A, B"', "C"]
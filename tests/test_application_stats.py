@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from bson import ObjectId
+
+from app.services.application_stats import summarize, week_key
+
+
+def test_week_key_uses_iso_weeks():
+    assert week_key(datetime(2027, 1, 1)) == "2026-W53"
+    assert week_key(datetime(2026, 10, 17)) == "2026-W42"
+
+
+def test_summarize_counts_and_dedupes_recent_activity():
+    app_id = ObjectId()
+    at = datetime(2026, 10, 17)
+    entry = {"application_id": app_id, "status": "Wishlist", "action": "created", "at": at}
+    stats = {
+        "total": 3,
+        "by_status": {"Wishlist": 1, "Interview": 2, "Rejected": 0},
+        "by_week": {"2026-W42": 3},
+        "recent_activity": [entry, {**entry, "status": "Interview", "action": "updated"}],
+    }
+    summary = summarize(stats)
+    assert summary["active"] == 3
+    assert summary["interview_stage"] == 2
+    assert "Rejected" not in summary["by_status"]
+    assert [e["action"] for e in summary["recent_activity"]] == ["updated"]
+    assert summary["recent_activity"][0]["application_id"] == str(app_id)
@@ -0,0 +1,188 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+
+from app.api import applications
+from app.api.auth import get_current_user
+from app.main import app
+from app.api.applications import BulkOperationRequest, _previous_status, _update_pipeline
+from app.models.application_event import APPLICATION_EVENTS_COLLECTION
+from app.models.user import User
+from app.services import application_stats, collection_versions
+
+
+def test_update_pipeline_only_touches_history_when_status_given():
+    now = datetime(2026, 10, 17, 12, 0, 0)
+    [stage] = _update_pipeline({"notes": "$100k", "updated_at": now}, now)
+    assert stage["$set"]["notes"] == {"$literal": "$100k"}
+    assert "status_history" not in stage["$set"]
+
+    [stage] = _update_pipeline({"status": "Applied", "updated_at": now}, now)
+    assert "$cond" in stage["$set"]["status_history"]
+
+
+def test_previous_status_is_read_from_the_entry_appended_by_this_update():
+    now = datetime(2026, 10, 17, 12, 0, 0)
+    app = {"status_history": [{"status": "Applied", "previous_status": "Wishlist", "changed_at": now}]}
+    assert _previous_status(app, now) == "Wishlist"
+    assert _previous_status(app, datetime(2026, 10, 18)) is None
+
+
+def test_update_pipeline_trims_history_only_after_events_backfill():
+    now = datetime(2026, 10, 17, 12, 0, 0)
+    [stage] = _update_pipeline({"status": "Offer", "updated_at": now}, now)
+    trimmed = stage["$set"]["status_history"]["$cond"][1]["$cond"]
+    assert trimmed[0] == {"$ifNull": ["$history_in_events", False]}
+    assert "$slice" in trimmed[1]
+
+
+def _bulk(db, monkeypatch, user_id, **request):
+    monkeypatch.setattr(applications, "get_database", lambda: db)
+    user = User(id=str(user_id), username="u", email="u@example.com", created_at=datetime.utcnow())
+    response = asyncio.run(applications.bulk_update_applications(BulkOperationRequest(**request), current_user=user))
+    return {item["id"]: item["outcome"] for item in response["results"]}
+
+
+def _insert(db, user_id, **fields):
+    now = datetime.utcnow()
+    app = {"_id": ObjectId(), "user_id": user_id, "status": "Applied", "created_at": now, "updated_at": now, **fields}
+    asyncio.run(db.applications.insert_one(app))
+    return app["_id"]
+
+
+def test_bulk_set_status_reports_each_id_and_records_events_for_changes_only(db, monkeypatch):
+    user_id, other_user = ObjectId(), ObjectId()
+    applied = _insert(db, user_id, history_in_events=True)
+    rejected = _insert(db, user_id, status="Rejected", history_in_events=True)
+    foreign = _insert(db, other_user)
+    missing = ObjectId()
+
+    outcomes = _bulk(db, monkeypatch, user_id, operation="set_status", status="Rejected",
+                     ids=[str(applied), str(rejected), str(foreign), str(missing), "nope", str(applied)])
+
+    assert outcomes == {
+        str(applied): "updated",
+        str(rejected): "unchanged",
+        str(foreign): "not_found",
+        str(missing): "not_found",
+        "nope": "invalid_id",
+    }
+    assert asyncio.run(db.applications.find_one({"_id": foreign}))["status"] == "Applied"
+    events = asyncio.run(db[APPLICATION_EVENTS_COLLECTION].find().to_list(length=None))
+    assert [(e["application_id"], e["previous_status"], e["status"]) for e in events] == [(applied, "Applied", "Rejected")]
+
+
+def test_bulk_archive_and_delete_stay_within_the_users_applications(db, monkeypatch):
+    user_id, other_user = ObjectId(), ObjectId()
+    active = _insert(db, user_id)
+    archived = _insert(db, user_id, archived_at=datetime.utcnow())
+    foreign = _insert(db, other_user)
+
+    outcomes = _bulk(db, monkeypatch, user_id, operation="archive", ids=[str(active), str(archived), str(foreign)])
+    assert outcomes == {str(active): "updated", str(archived): "unchanged", str(foreign): "not_found"}
+    assert asyncio.run(db.applications.find_one({"_id": active}))["archived_at"] is not None
+    assert asyncio.run(db.applications.find_one({"_id": foreign})).get("archived_at") is None
+
+    asyncio.run(db[APPLICATION_EVENTS_COLLECTION].insert_many([
+        {"user_id": user_id, "application_id": active},
+        {"user_id": other_user, "application_id": foreign},
+    ]))
+    outcomes = _bulk(db, monkeypatch, user_id, operation="delete", ids=[str(active), str(foreign)])
+    assert outcomes == {str(active): "deleted", str(foreign): "not_found"}
+    assert set(asyncio.run(db.applications.distinct("_id"))) == {archived, foreign}
+    assert asyncio.run(db[APPLICATION_EVENTS_COLLECTION].distinct("application_id")) == [foreign]
+    assert asyncio.run(db.application_stats.find_one({"_id": user_id}))["total"] == 1
+
+
+@pytest.fixture
+def api(db, monkeypatch):
+    """Test client signed in as a fresh user, backed by the in-memory database"""
+    user = User(id=str(ObjectId()), username="u", email="u@example.com", created_at=datetime.utcnow())
+    monkeypatch.setattr(applications, "get_database", lambda: db)
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield TestClient(app), ObjectId(user.id)
+    app.dependency_overrides.pop(get_current_user)
+
+
+def test_summary_view_leaves_out_heavy_fields_across_cursor_pages(db, api):
+    client, user_id = api
+    start = datetime(2026, 10, 1)
+    for day in range(3):
+        _insert(
+            db, user_id, title=f"Role {day}", linkedin_url=f"https://www.linkedin.com/jobs/view/{day}",
+            updated_at=start + timedelta(days=day), job_description="long text" * 100,
+            notes="private", status_history=[{"status": "Applied", "changed_at": start}],
+            documents=[{"name": "cv.pdf", "type": "cv", "sha256": "0" * 64}],
+        )
+
+    first = client.get("/api/v1/applications/", params={"view": "summary", "limit": 2})
+    assert first.status_code == 200
+    second = client.get("/api/v1/applications/", params={"view": "summary", "limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+    assert "X-Next-Cursor" not in second.headers
+
+    rows = first.json() + second.json()
+    assert [row["title"] for row in rows] == ["Role 2", "Role 1", "Role 0"]
+    heavy = {"job_description", "notes", "status_history", "documents", "linkedin_url"}
+    assert all(not heavy & set(row) for row in rows)
+    assert "job_description" in client.get("/api/v1/applications/", params={"limit": 1}).json()[0]
+
+
+def _posting(db, job_id, fetched_at, **fields):
+    posting = {"_id": job_id, "linkedin_url": f"https://www.linkedin.com/jobs/view/{job_id}", "fetched_at": fetched_at, **fields}
+    asyncio.run(db.job_postings.insert_one(posting))
+
+
+def test_create_reuses_a_fresh_posting_and_requeues_a_stale_one(db, api, monkeypatch):
+    client, user_id = api
+    monkeypatch.setattr(applications.settings, "JOB_POSTING_TTL_HOURS", 24)
+    _posting(db, "111", datetime.utcnow() - timedelta(hours=1), title="Fresh", company="Acme", job_description="Build APIs")
+    _posting(db, "222", datetime.utcnow() - timedelta(hours=25), title="Stale", company="Acme", job_description="Old text")
+
+    fresh = client.post("/api/v1/applications/", json={"linkedin_url": "https://www.linkedin.com/jobs/view/111"}).json()
+    assert (fresh["title"], fresh["enrichment_status"], fresh["job_description"]) == ("Fresh", "complete", "Build APIs")
+    stored = asyncio.run(db.applications.find_one({"_id": ObjectId(fresh["id"])}))
+    assert stored.get("job_description") is None and stored["linkedin_job_id"] == "111"
+
+    stale = client.post("/api/v1/applications/", json={"linkedin_url": "https://www.linkedin.com/jobs/view/222"}).json()
+    assert stale["title"] is None and stale["enrichment_status"] == "pending"
+    tasks = asyncio.run(db.enrichment_tasks.find().to_list(length=None))
+    assert [task["application_id"] for task in tasks] == [ObjectId(stale["id"])]
+
+
+def test_reads_join_the_description_from_the_shared_posting(db, api):
+    client, user_id = api
+    _posting(db, "333", datetime.utcnow(), job_description="Shared text")
+    shared = _insert(db, user_id, linkedin_url="https://www.linkedin.com/jobs/view/333", linkedin_job_id="333")
+    inline = _insert(db, user_id, linkedin_url="https://www.linkedin.com/jobs/view/444", linkedin_job_id="444",
+                     job_description="Own text")
+
+    assert client.get(f"/api/v1/applications/{shared}").json()["job_description"] == "Shared text"
+    listed = {row["id"]: row["job_description"] for row in client.get("/api/v1/applications/").json()}
+    assert listed == {str(shared): "Shared text", str(inline): "Own text"}
+
+
+def test_stats_read_between_the_two_writes_cannot_cache_old_counters(db, api, monkeypatch):
+    client, user_id = api
+    _insert(db, user_id)
+    assert client.get("/api/v1/applications/stats").json()["total"] == 1
+    reads = []
+
+    def then_read_stats(write):
+        async def wrapped(*args, **kwargs):
+            await write(*args, **kwargs)
+            version = await collection_versions.get_version(db, user_id, collection_versions.APPLICATIONS)
+            reads.append((version, (await application_stats.get_stats(db, user_id))["total"]))
+        return wrapped
+
+    monkeypatch.setattr(application_stats, "record_created", then_read_stats(application_stats.record_created))
+    monkeypatch.setattr(collection_versions, "bump_version", then_read_stats(collection_versions.bump_version))
+    client.post("/api/v1/applications/", json={"linkedin_url": "https://www.linkedin.com/jobs/view/555"})
+
+    # The read that landed between the writes either saw the new counters or an
+    # old version, whose ETag stops matching once the bump lands
+    (version, total), final = reads[0], reads[-1]
+    assert final[1] == 2
+    assert total == 2 or version < final[0]
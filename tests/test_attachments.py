@@ -0,0 +1,93 @@
+import asyncio
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from app.models.attachment import ATTACHMENT_BLOBS_COLLECTION, ATTACHMENT_CHUNKS_COLLECTION
+from app.services import attachments, collection_versions
+from app.services.attachments import AttachmentTooLarge, RangeNotSatisfiable, hash_file, parse_range
+
+
+def test_parse_range_handles_open_suffix_and_clamped_ranges():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=50-500", 100) == (50, 99)
+    # Multiple ranges and other units fall back to the whole file
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    assert parse_range("items=0-1", 100) is None
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("bytes=100-", 100)
+
+
+def test_hash_file_rewinds_and_enforces_the_size_limit():
+    source = io.BytesIO(b"resume")
+    digest, size = hash_file(source, max_bytes=10)
+    assert size == 6 and len(digest) == 64
+    assert source.read() == b"resume"
+    with pytest.raises(AttachmentTooLarge):
+        hash_file(io.BytesIO(b"x" * 11), max_bytes=10)
+
+
+def test_identical_content_is_stored_once_and_collected_after_release(db, monkeypatch):
+    monkeypatch.setattr(attachments, "CHUNK_SIZE", 4)
+    content = b"curriculum vitae"
+
+    async def scenario():
+        first = await attachments.put_blob(db, io.BytesIO(content), "text/plain")
+        chunks = await db[ATTACHMENT_CHUNKS_COLLECTION].count_documents({})
+        second = await attachments.put_blob(db, io.BytesIO(content), "text/plain")
+        assert second["_id"] == first["_id"] and second["refs"] == 2
+        assert chunks == 4
+        assert await db[ATTACHMENT_CHUNKS_COLLECTION].count_documents({}) == chunks
+
+        await attachments.release_blobs(db, [first["_id"]])
+        blob = await db[ATTACHMENT_BLOBS_COLLECTION].find_one({"_id": first["_id"]})
+        assert blob["refs"] == 1 and blob.get("released_at") is None
+
+        # Released blobs survive the grace period, then go with their chunks
+        await attachments.release_blobs(db, [first["_id"]])
+        assert await db[ATTACHMENT_BLOBS_COLLECTION].count_documents({}) == 1
+        await attachments.collect_garbage(db, datetime.utcnow() + timedelta(seconds=1))
+        assert await db[ATTACHMENT_BLOBS_COLLECTION].count_documents({}) == 0
+        assert await db[ATTACHMENT_CHUNKS_COLLECTION].count_documents({}) == 0
+
+    asyncio.run(scenario())
+
+
+def test_iter_blob_reads_only_the_requested_range(db, monkeypatch):
+    monkeypatch.setattr(attachments, "CHUNK_SIZE", 4)
+    content = b"0123456789abcdef"
+
+    async def read(blob, start, end):
+        return b"".join([data async for data in attachments.iter_blob(db, blob, start, end)])
+
+    async def scenario():
+        blob = await attachments.put_blob(db, io.BytesIO(content), "text/plain")
+        assert await read(blob, 0, len(content) - 1) == content
+        assert await read(blob, 3, 9) == content[3:10]
+        assert await read(blob, 4, 7) == content[4:8]
+        assert await read(blob, 15, 15) == b"f"
+
+    asyncio.run(scenario())
+
+
+def test_inline_documents_are_backfilled_into_blobs(db):
+    user_id = ObjectId()
+
+    async def scenario():
+        await db.applications.insert_one({
+            "user_id": user_id,
+            "documents": [{"name": "cover.txt", "type": "cover_letter", "content": "Dear team"}],
+        })
+        assert await attachments.backfill_inline_documents(db) == 1
+        [document] = (await db.applications.find_one({"user_id": user_id}))["documents"]
+        assert "content" not in document and document["size"] == 9
+        assert (await attachments.get_blob(db, document["sha256"]))["refs"] == 1
+        assert await collection_versions.get_version(db, user_id, collection_versions.APPLICATIONS) == 1
+        assert await attachments.backfill_inline_documents(db) == 0
+
+    asyncio.run(scenario())
@@ -1,5 +1,10 @@
+import asyncio
+
 from fastapi.testclient import TestClient
+from app import main
+from app.api import auth
 from app.main import app
+from app.models.database import index_registry
 
 client = TestClient(app)
 
@@ -8,4 +13,53 @@ def test_health_check():
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
 
-# Add more tests for authentication endpoints
\ No newline at end of file
+# Add more tests for authentication endpoints
+POOL = {"checked_out": 1, "available": 9}
+
+
+def test_readiness_reports_ping_and_pool(monkeypatch):
+    async def ping():
+        return 1.234
+
+    monkeypatch.setattr(main, "ping_database", ping)
+    monkeypatch.setattr(main, "get_pool_stats", lambda: POOL)
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "ping_ms": 1.23, "pool": POOL}
+
+
+def test_readiness_reports_unavailable_when_ping_fails(monkeypatch):
+    async def ping():
+        raise ConnectionError("no servers available")
+
+    monkeypatch.setattr(main, "ping_database", ping)
+    monkeypatch.setattr(main, "get_pool_stats", lambda: POOL)
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "unavailable", "error": "no servers available", "pool": POOL}
+
+
+def test_register_maps_duplicate_keys_to_the_field_that_clashed(db, monkeypatch):
+    async def fake_hash(password):
+        return "hashed:" + password
+
+    asyncio.run(db.users.create_indexes(index_registry["users"]))
+    monkeypatch.setattr(auth, "get_database", lambda: db)
+    monkeypatch.setattr(auth, "get_password_hash_async", fake_hash)
+
+    def register(username, email):
+        return client.post(
+            "/api/v1/auth/register", json={"username": username, "email": email, "password": "secret"}
+        )
+
+    assert register("ada", "ada@example.com").status_code == 200
+
+    response = register("grace", "ada@example.com")
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Email already registered"}
+
+    response = register("ada", "grace@example.com")
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Username already taken"}
+
+    assert asyncio.run(db.users.count_documents({})) == 1
@@ -0,0 +1,142 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.models.application_import import APPLICATION_IMPORTS_COLLECTION, ROW_PENDING
+from app.services import bulk_import
+from app.services.bulk_import import BulkImporter, build_import, import_response, parse_import_body
+from app.services.linkedin_crawler import LinkedInCrawler
+
+
+def test_rows_are_validated_and_deduplicated_up_front():
+    body = (
+        b"linkedin_url,status\n"
+        b"https://www.linkedin.com/jobs/view/101,Applied\n"
+        b"https://www.linkedin.com/jobs/view/101,\n"
+        b"not a url,\n"
+    )
+    rows = parse_import_body(body, "text/csv")
+    application_import = build_import(ObjectId(), rows, LinkedInCrawler().extract_job_id)
+
+    assert [row.result for row in application_import.rows] == ["pending", "duplicate", "invalid"]
+    assert application_import.rows[0].fields["status"] == "Applied"
+    assert application_import.rows[0].job_id == "101"
+
+
+def test_json_body_accepts_plain_urls():
+    rows = parse_import_body(b'{"items": ["https://www.linkedin.com/jobs/view/7"]}', "application/json")
+    assert rows == [{"linkedin_url": "https://www.linkedin.com/jobs/view/7"}]
+
+
+def test_json_body_rejects_items_that_are_not_urls_or_objects():
+    with pytest.raises(ValueError, match="Item 2 must be a URL string or an object"):
+        parse_import_body(b'["https://www.linkedin.com/jobs/view/7", 1]', "application/json")
+    with pytest.raises(ValueError):
+        parse_import_body(b"[null]", "application/json")
+
+
+class FakeCrawler:
+    extract_job_id = LinkedInCrawler().extract_job_id
+
+    def __init__(self):
+        self.crawled = []
+        self.broken = {"103"}
+
+    async def get_job_details(self, url):
+        job_id = self.extract_job_id(url)
+        self.crawled.append(job_id)
+        if job_id in self.broken:
+            raise RuntimeError("page unavailable")
+        if job_id == "104":
+            return {}
+        return {"title": f"Job {job_id}", "company": "Acme", "job_description": "Build things"}
+
+
+def test_import_runs_end_to_end_and_resumes_unfinished_rows(db):
+    crawler = FakeCrawler()
+    enqueued = []
+
+    async def enqueue(db, application):
+        enqueued.append(application["linkedin_job_id"])
+
+    importer = BulkImporter(crawler, enqueue, concurrency=2, host_rate_per_second=0, batch_size=2)
+    user_id = ObjectId()
+    rows = [{"linkedin_url": f"https://www.linkedin.com/jobs/view/{job_id}"} for job_id in ("100", "101", "102", "103", "104")]
+    rows[1]["status"] = "Applied"
+
+    async def scenario():
+        now = datetime.utcnow()
+        await db.applications.insert_one(
+            {"user_id": user_id, "linkedin_job_id": "100", "status": "Wishlist", "created_at": now, "updated_at": now}
+        )
+        doc = await importer.create(db, user_id, rows)
+        await asyncio.gather(*importer._running)
+
+        doc = await db[APPLICATION_IMPORTS_COLLECTION].find_one({"_id": doc["_id"]})
+        response = import_response(doc)
+        assert response["status"] == "completed"
+        assert [row["result"] for row in response["rows"]] == ["duplicate", "created", "created", "failed", "created"]
+        assert response["rows"][3]["error"] == "page unavailable"
+        assert sorted(crawler.crawled) == ["101", "102", "103", "104"]
+        assert enqueued == ["104"]  # crawled nothing, left for the enrichment worker
+
+        applied = await db.applications.find_one({"linkedin_job_id": "101"})
+        assert (applied["title"], applied["status"]) == ("Job 101", "Applied")
+        assert await db.applications.count_documents({"user_id": user_id}) == 4
+        assert await db.application_events.count_documents({"application_id": applied["_id"]}) == 1
+
+        # Row 102 was written but its outcome lost, as if the worker died mid-flush
+        crawler.broken.clear()
+        crawler.crawled.clear()
+        await db[APPLICATION_IMPORTS_COLLECTION].update_one({"_id": doc["_id"]}, {"$set": {"rows.2.result": ROW_PENDING}})
+        assert await importer.resume(db, doc["_id"], user_id) is not None
+        await asyncio.gather(*importer._running)
+
+        doc = await db[APPLICATION_IMPORTS_COLLECTION].find_one({"_id": doc["_id"]})
+        assert [row["result"] for row in doc["rows"]] == ["duplicate", "created", "created", "created", "created"]
+        assert crawler.crawled == ["103"]
+        assert await db.applications.count_documents({"user_id": user_id}) == 5
+        assert (await db.application_stats.find_one({"_id": user_id}))["total"] == 5
+
+    asyncio.run(scenario())
+
+
+class SlowCrawler(FakeCrawler):
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def get_job_details(self, url):
+        if self.extract_job_id(url) == "201":
+            await self.release.wait()
+        return await super().get_job_details(url)
+
+
+def test_slow_batch_keeps_heartbeat_and_counts_flushed_rows(db, monkeypatch):
+    monkeypatch.setattr(bulk_import, "HEARTBEAT_INTERVAL_SECONDS", 0.01)
+    monkeypatch.setattr(bulk_import, "HEARTBEAT_TIMEOUT_SECONDS", 0.04)
+    crawler = SlowCrawler()
+
+    async def enqueue(db, application):
+        pass
+
+    importer = BulkImporter(crawler, enqueue, concurrency=2, host_rate_per_second=0, batch_size=1)
+    user_id = ObjectId()
+    rows = [{"linkedin_url": f"https://www.linkedin.com/jobs/view/{job_id}"} for job_id in ("200", "201")]
+
+    async def scenario():
+        doc = await importer.create(db, user_id, rows)
+        await asyncio.sleep(0.1)
+
+        stored = await db[APPLICATION_IMPORTS_COLLECTION].find_one({"_id": doc["_id"]})
+        assert stored["status"] == "running" and stored["heartbeat_at"] > doc["heartbeat_at"]
+        assert (await db.application_stats.find_one({"_id": user_id}))["total"] == 1
+        assert await importer.resume(db, doc["_id"], user_id) is None
+
+        crawler.release.set()
+        await asyncio.gather(*importer._running)
+        assert (await db.application_stats.find_one({"_id": user_id}))["total"] == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,50 @@
+import asyncio
+
+from bson import ObjectId
+
+from app.services.change_feed import ChangeFeedHub, to_delta
+
+
+def _change(token, op, user_id, **extra):
+    change = {
+        "_id": {"_data": token},
+        "operationType": op,
+        "ns": {"db": "job_tracker", "coll": "applications"},
+        "documentKey": {"_id": ObjectId()},
+        "fullDocument": {"user_id": user_id, "status": "Applied", "job_description": "long"},
+    }
+    change.update(extra)
+    return change
+
+
+def test_update_delta_only_carries_whitelisted_changed_fields():
+    change = _change("01", "update", ObjectId(), updateDescription={
+        "updatedFields": {"status": "Offer", "status_history": []},
+        "removedFields": ["notes", "job_description"],
+    })
+    delta = to_delta(change)
+    assert delta["op"] == "update"
+    assert delta["fields"] == {"status": "Offer"}
+    assert delta["removed"] == ["notes"]
+
+
+def test_reconnect_replays_only_the_users_events_after_last_event_id():
+    async def scenario():
+        hub = ChangeFeedHub(buffer_size=10, queue_size=10, pre_images=True)
+        alice, bob = ObjectId(), ObjectId()
+        hub._dispatch(_change("01", "insert", alice))
+        hub._dispatch(_change("02", "insert", bob))
+        hub._dispatch(_change("03", "delete", None, fullDocument=None, fullDocumentBeforeChange={"user_id": alice}))
+
+        subscription, backlog, found = hub.subscribe(alice, "01")
+        assert found
+        assert [(e.token, e.payload["op"]) for e in backlog] == [("03", "delete")]
+
+        hub._dispatch(_change("04", "insert", bob))
+        hub._dispatch(_change("05", "insert", alice))
+        assert subscription.queue.qsize() == 1
+
+        _, _, found = hub.subscribe(alice, "00")
+        assert not found
+
+    asyncio.run(scenario())
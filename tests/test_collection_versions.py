@@ -0,0 +1,10 @@
+from app.services.collection_versions import etag_matches
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = '"abc"'
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('"x", W/"abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"abcd"', etag)
+    assert not etag_matches(None, etag)
@@ -0,0 +1,173 @@
+import asyncio
+import zlib
+from datetime import datetime, timedelta
+
+import httpx
+from pymongo.errors import PyMongoError
+
+from app.models.crawl_cache import CRAWL_CACHE_COLLECTION
+from app.services import crawl_cache
+from app.services.crawl_cache import CrawlCache
+from app.services.linkedin_crawler import LinkedInCrawler
+
+
+def test_entries_are_fresh_then_revalidated_with_their_validators():
+    cache = CrawlCache(fresh_seconds=60, ttl_seconds=3600, max_bytes=1024)
+    entry = {
+        "fetched_at": datetime.utcnow(),
+        "etag": '"abc"',
+        "last_modified": "Wed, 01 Oct 2026 10:00:00 GMT",
+        "html": zlib.compress("<h1>Engineer</h1>".encode("utf-8")),
+        "title": "Engineer",
+    }
+    assert cache.is_fresh(entry)
+    assert CrawlCache.html(entry) == "<h1>Engineer</h1>"
+    assert CrawlCache.details(entry)["title"] == "Engineer"
+
+    entry["fetched_at"] -= timedelta(minutes=2)
+    assert not cache.is_fresh(entry)
+    assert CrawlCache.validators(entry) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Wed, 01 Oct 2026 10:00:00 GMT",
+    }
+    assert CrawlCache.validators({"etag": None}) == {}
+
+
+def _page(title):
+    return f'<h1 class="top-card-layout__title">{title}</h1><div class="show-more-less-html__markup">{title} role</div>'
+
+
+class LinkedIn:
+    """MockTransport handler answering conditional requests with 304"""
+
+    def __init__(self):
+        self.requests = []
+        self.failing = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.failing:
+            return httpx.Response(503)
+        job_id = request.url.path.rstrip("/").rsplit("/", 1)[-1]
+        if request.headers.get("If-None-Match") == f'"{job_id}"':
+            return httpx.Response(304, headers={"ETag": f'"{job_id}"'})
+        body = "<p>nothing here</p>" if job_id == "0" else _page(f"Engineer {job_id}")
+        return httpx.Response(200, text=body, headers={"ETag": f'"{job_id}"'})
+
+
+def _crawl(db, monkeypatch, scenario, **cache_options):
+    monkeypatch.setattr(crawl_cache, "get_database", lambda: db)
+    linkedin = LinkedIn()
+    cache = CrawlCache(**{"fresh_seconds": 60, "ttl_seconds": 3600, "max_bytes": 1 << 20, "evict_interval": 0, **cache_options})
+    crawler = LinkedInCrawler(transport=httpx.MockTransport(linkedin), cache=cache)
+
+    async def run():
+        try:
+            await scenario(crawler, linkedin)
+        finally:
+            await crawler.close()
+
+    asyncio.run(run())
+
+
+def _url(job_id):
+    return f"https://www.linkedin.com/jobs/view/{job_id}/"
+
+
+async def _age(db, job_id):
+    await db[CRAWL_CACHE_COLLECTION].update_one(
+        {"_id": job_id}, {"$set": {"fetched_at": datetime.utcnow() - timedelta(hours=1)}}
+    )
+
+
+def test_fresh_entries_are_served_without_a_request(db, monkeypatch):
+    async def scenario(crawler, linkedin):
+        first = await crawler.get_job_details(_url(1))
+        second = await crawler.get_job_details(_url(1))
+        assert len(linkedin.requests) == 1
+        assert second["title"] == first["title"] == "Engineer 1"
+        assert second["field_sources"] == first["field_sources"]
+
+    _crawl(db, monkeypatch, scenario)
+
+
+def test_not_modified_reuses_the_stored_fields_without_parsing(db, monkeypatch):
+    async def scenario(crawler, linkedin):
+        await crawler.get_job_details(_url(2))
+        await _age(db, "2")
+
+        async def no_parsing(html):
+            raise AssertionError("a 304 must not be parsed")
+
+        crawler.extract = no_parsing
+        details = await crawler.get_job_details(_url(2))
+        assert linkedin.requests[-1].headers["If-None-Match"] == '"2"'
+        assert details["title"] == "Engineer 2"
+        assert crawler.cache.is_fresh(await db[CRAWL_CACHE_COLLECTION].find_one({"_id": "2"}))
+
+    _crawl(db, monkeypatch, scenario)
+
+
+def test_stale_entry_is_served_when_linkedin_fails(db, monkeypatch):
+    async def scenario(crawler, linkedin):
+        await crawler.get_job_details(_url(3))
+        await _age(db, "3")
+        linkedin.failing = True
+        assert (await crawler.get_job_details(_url(3)))["title"] == "Engineer 3"
+        assert (await crawler.get_job_details(_url(4)))["title"] is None
+
+    _crawl(db, monkeypatch, scenario)
+
+
+def test_pages_without_fields_are_not_cached(db, monkeypatch):
+    async def scenario(crawler, linkedin):
+        assert (await crawler.get_job_details(_url(0)))["title"] is None
+        assert await db[CRAWL_CACHE_COLLECTION].count_documents({}) == 0
+        assert await crawler.cache.usage() == 0
+
+    _crawl(db, monkeypatch, scenario)
+
+
+def test_cache_write_failures_do_not_fail_the_crawl(db, monkeypatch):
+    async def scenario(crawler, linkedin):
+        async def unavailable(*args):
+            raise PyMongoError("primary stepped down")
+
+        crawler.cache.store = unavailable
+        assert (await crawler.get_job_details(_url(5)))["title"] == "Engineer 5"
+
+    _crawl(db, monkeypatch, scenario)
+
+
+def test_least_recently_used_entries_are_evicted_over_budget(db, monkeypatch):
+    async def scenario(crawler, linkedin):
+        await crawler.get_job_details(_url(10))
+        entry_size = await crawler.cache.usage()
+        crawler.cache.max_bytes = entry_size * 5 // 2  # room for two entries
+        await crawler.get_job_details(_url(11))
+        for job_id, minutes in (("10", 2), ("11", 1)):
+            await db[CRAWL_CACHE_COLLECTION].update_one(
+                {"_id": job_id}, {"$set": {"last_used_at": datetime.utcnow() - timedelta(minutes=minutes)}}
+            )
+        await crawler.get_job_details(_url(10))  # fresh hit, now more recently used than 11
+        await crawler.get_job_details(_url(12))
+
+        assert set(await db[CRAWL_CACHE_COLLECTION].distinct("_id")) == {"10", "12"}
+        assert await crawler.cache.usage() <= crawler.cache.max_bytes
+
+    _crawl(db, monkeypatch, scenario)
+
+
+def test_entries_from_an_older_extractor_are_reextracted_from_the_stored_page(db, monkeypatch):
+    async def scenario(crawler, linkedin):
+        await crawler.get_job_details(_url(6))
+        await db[CRAWL_CACHE_COLLECTION].update_one(
+            {"_id": "6"}, {"$set": {"title": "Stale title", "extractor_version": 0}}
+        )
+
+        assert (await crawler.get_job_details(_url(6)))["title"] == "Engineer 6"
+        assert len(linkedin.requests) == 1
+        entry = await db[CRAWL_CACHE_COLLECTION].find_one({"_id": "6"})
+        assert entry["title"] == "Engineer 6" and CrawlCache.is_current(entry)
+
+    _crawl(db, monkeypatch, scenario)
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from app.main import app  # noqa: F401 - importing the app registers indexes and query shapes
+from app.models import database
+from app.models.database import _plan_stages, index_registry, query_shapes
+
+
+def test_models_register_indexes():
+    assert {"users", "applications", "github_projects"} <= set(index_registry)
+
+
+def test_every_query_shape_targets_an_indexed_collection():
+    for shape in query_shapes:
+        assert shape["collection"] in index_registry, shape["name"]
+
+
+def test_plan_stages_finds_nested_collscan():
+    plan = {
+        "stage": "SORT",
+        "inputStage": {"stage": "FETCH", "inputStages": [{"stage": "COLLSCAN"}]},
+    }
+    assert "COLLSCAN" in _plan_stages(plan)
+    assert "COLLSCAN" not in _plan_stages({"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}})
+
+
+def test_ensure_indexes_names_the_duplicates_blocking_a_unique_index(db, monkeypatch):
+    monkeypatch.setattr(database, "get_database", lambda: db)
+
+    async def scenario():
+        await db.users.insert_many([
+            {"email": "ada@example.com", "username": "ada"},
+            {"email": "ada@example.com", "username": "ada2"},
+        ])
+        with pytest.raises(RuntimeError, match="email_unique .*ada@example.com") as error:
+            await database.ensure_indexes()
+        assert "username_unique" not in str(error.value)
+
+    asyncio.run(scenario())
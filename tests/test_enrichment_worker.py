@@ -0,0 +1,132 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.models.enrichment_task import ENRICHMENT_TASKS_COLLECTION, TASK_FAILED, TASK_QUEUED, TASK_RUNNING
+from app.services import application_stats
+from app.services.enrichment_worker import ENRICHMENT_FAILED, EnrichmentWorkerPool
+
+
+class FailingCrawler:
+    def __init__(self):
+        self.calls = 0
+
+    def extract_job_id(self, url):
+        return None
+
+    async def get_job_details(self, url):
+        self.calls += 1
+        raise RuntimeError("connection reset")
+
+
+class StubCrawler:
+    def extract_job_id(self, url):
+        return None
+
+    async def get_job_details(self, url):
+        return {"title": "Backend Engineer", "company": "Acme"}
+
+
+def _pool(crawler=None):
+    return EnrichmentWorkerPool(crawler or FailingCrawler(), workers=1, poll_interval=1, lease_seconds=60, max_attempts=2)
+
+
+async def _queue(db, pool, **fields):
+    application = {"_id": ObjectId(), "user_id": ObjectId(), "linkedin_url": "https://www.linkedin.com/jobs/view/1"}
+    await db.applications.insert_one(dict(application))
+    await pool.enqueue(db, application)
+    if fields:
+        await db[ENRICHMENT_TASKS_COLLECTION].update_one({"application_id": application["_id"]}, {"$set": fields})
+    return application
+
+
+def test_claim_skips_tasks_not_due_and_live_leases(db):
+    pool = _pool()
+    now = datetime.utcnow()
+
+    async def scenario():
+        await _queue(db, pool, available_at=now + timedelta(minutes=5))
+        await _queue(db, pool, status=TASK_RUNNING, lease_expires_at=now + timedelta(minutes=5))
+        assert await pool._claim(db) is None
+
+        due = await _queue(db, pool)
+        task = await pool._claim(db)
+        assert task["application_id"] == due["_id"]
+        assert task["status"] == TASK_RUNNING and task["attempts"] == 1
+        assert task["lease_expires_at"] > now
+        assert await pool._claim(db) is None
+
+    asyncio.run(scenario())
+
+
+def test_expired_lease_is_reclaimed_as_another_attempt(db):
+    pool = _pool()
+
+    async def scenario():
+        await _queue(db, pool)
+        task = await pool._claim(db)
+        await db[ENRICHMENT_TASKS_COLLECTION].update_one(
+            {"_id": task["_id"]}, {"$set": {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}}
+        )
+        reclaimed = await pool._claim(db)
+        assert reclaimed["_id"] == task["_id"]
+        assert reclaimed["attempts"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_errors_are_retried_with_backoff_then_fail(db):
+    crawler = FailingCrawler()
+    pool = _pool(crawler)
+
+    async def scenario():
+        application = await _queue(db, pool)
+        await pool._attempt(db, await pool._claim(db))
+        task = await pool.get_task(db, application["_id"])
+        assert task["status"] == TASK_QUEUED
+        assert task["last_error"] == "connection reset"
+        assert task["available_at"] > datetime.utcnow()
+
+        await db[ENRICHMENT_TASKS_COLLECTION].update_one({"_id": task["_id"]}, {"$set": {"available_at": datetime.utcnow()}})
+        await pool._attempt(db, await pool._claim(db))
+        task = await pool.get_task(db, application["_id"])
+        assert task["status"] == TASK_FAILED and task["attempts"] == 2
+        assert (await db.applications.find_one({"_id": application["_id"]}))["enrichment_status"] == ENRICHMENT_FAILED
+        assert crawler.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_task_that_keeps_losing_its_lease_fails_without_crawling(db):
+    crawler = FailingCrawler()
+    pool = _pool(crawler)
+
+    async def scenario():
+        application = await _queue(db, pool, status=TASK_RUNNING, attempts=2, lease_expires_at=datetime.utcnow())
+        await pool._attempt(db, await pool._claim(db))
+        task = await pool.get_task(db, application["_id"])
+        assert task["status"] == TASK_FAILED
+        assert crawler.calls == 0
+
+    asyncio.run(scenario())
+
+
+def test_enrichment_refreshes_recent_activity(db):
+    pool = _pool(StubCrawler())
+
+    async def scenario():
+        application = await _queue(db, pool, available_at=datetime.utcnow())
+        now = datetime.utcnow()
+        await db.applications.update_one(
+            {"_id": application["_id"]}, {"$set": {"status": "Applied", "created_at": now, "updated_at": now}}
+        )
+        stats = await application_stats.get_stats(db, application["user_id"])
+        assert stats["recent_activity"][0]["title"] is None
+
+        await pool._attempt(db, await pool._claim(db))
+        stats = await application_stats.get_stats(db, application["user_id"])
+        assert stats["recent_activity"][0]["title"] == "Backend Engineer"
+        assert stats["recent_activity"][0]["company"] == "Acme"
+
+    asyncio.run(scenario())
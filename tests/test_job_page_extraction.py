@@ -0,0 +1,49 @@
+import pytest
+
+from app.services.job_page_extraction import extract_job_details, resolve_parser
+
+PAGE = """<html><body>
+<h1 class="top-card-layout__title">Data Engineer</h1>
+<span class="topcard__flavor--bullet">Berlin</span>
+<span class="posted-time-ago__text">3 days ago</span>
+<div class="show-more-less-html__markup"><p>Own the pipeline.</p><ul><li>Python</li><li>SQL</li></ul></div>
+</body></html>"""
+
+
+def test_extraction_is_a_pure_function_of_the_html():
+    details = extract_job_details(PAGE, resolve_parser("html.parser"))
+    assert details["title"] == "Data Engineer"
+    assert details["location"] == "Berlin"
+    assert details["date_posted_text"] == "3 days ago"
+    assert details["date_posted"] is not None
+    assert "- Python\n- SQL" in details["job_description"]
+
+
+def test_unknown_parser_is_rejected():
+    with pytest.raises(ValueError):
+        resolve_parser("regex")
+
+
+JSON_LD_PAGE = """<html><head>
+<script type="application/ld+json">{"@context": "https://schema.org", "@type": "JobPosting",
+ "title": "Platform Engineer", "hiringOrganization": {"@type": "Organization", "name": "Acme"},
+ "datePosted": "2026-09-30T08:00:00.000Z",
+ "description": "&lt;p&gt;Run &amp;amp; scale Kubernetes.&lt;/p&gt;&lt;ul&gt;&lt;li&gt;Go&lt;/li&gt;&lt;/ul&gt;"}</script>
+</head><body><span class="topcard__flavor--bullet">Remote</span></body></html>"""
+
+
+def test_json_ld_fields_win_and_selectors_fill_only_the_gaps():
+    details = extract_job_details(JSON_LD_PAGE)
+    assert details["title"] == "Platform Engineer"
+    assert details["company"] == "Acme"
+    assert details["date_posted"].isoformat() == "2026-09-30T08:00:00"
+    assert details["job_description"] == "Run & scale Kubernetes.\n\n- Go"
+    assert details["location"] == "Remote"
+    assert details["field_sources"] == {
+        "title": "json_ld",
+        "company": "json_ld",
+        "location": "selectors",
+        "job_description": "json_ld",
+        "date_posted": "json_ld",
+    }
+    assert extract_job_details(PAGE)["field_sources"]["company"] is None
@@ -0,0 +1,38 @@
+import asyncio
+
+import httpx
+
+from app.services.linkedin_crawler import LinkedInCrawler
+
+PAGE = """<html><body>
+<h1 class="top-card-layout__title">Backend Engineer</h1>
+<a class="topcard__org-name-link">Acme</a>
+<div class="show-more-less-html__markup"><p>Build APIs.</p></div>
+</body></html>"""
+
+
+def test_job_details_are_fetched_over_one_pooled_client():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith("/404/"):
+            return httpx.Response(404)
+        return httpx.Response(200, text=PAGE)
+
+    async def scenario():
+        crawler = LinkedInCrawler(transport=httpx.MockTransport(handler))
+        crawler.start()
+        client = crawler.client
+        details = await crawler.get_job_details("https://www.linkedin.com/jobs/view/123/")
+        missing = await crawler.get_job_details("https://www.linkedin.com/jobs/view/404/")
+        assert crawler.client is client
+        await crawler.close()
+        return details, missing
+
+    details, missing = asyncio.run(scenario())
+    assert details["title"] == "Backend Engineer"
+    assert details["company"] == "Acme"
+    assert details["linkedin_job_id"] == "123"
+    assert missing["title"] is None
+    assert requests[0].headers["User-Agent"].startswith("Mozilla/5.0")
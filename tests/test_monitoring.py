@@ -0,0 +1,14 @@
+from app.models.monitoring import _collection_name, _filter_shape, redact
+
+
+def test_redact_keeps_keys_and_operators_only():
+    shape = redact({"user_id": "abc", "status": {"$in": ["Applied", "Interview"]}})
+    assert shape == {"user_id": "?", "status": {"$in": ["?"]}}
+
+
+def test_filter_shape_for_update_and_find_commands():
+    update = {"update": "applications", "updates": [{"q": {"_id": 1}, "u": {"$set": {"a": 1}}}]}
+    assert _filter_shape("update", update) == {"_id": "?"}
+    assert _filter_shape("find", {"find": "users", "filter": {"email": "a@b.c"}}) == {"email": "?"}
+    assert _collection_name("find", {"find": "users"}) == "users"
+    assert _collection_name("ping", {"ping": 1}) == ""
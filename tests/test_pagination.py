@@ -0,0 +1,17 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    updated_at = datetime(2026, 3, 14, 9, 26, 53, 589000)
+    document_id = ObjectId()
+    assert decode_cursor(encode_cursor(updated_at, document_id)) == (updated_at, document_id)
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
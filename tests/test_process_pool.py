@@ -0,0 +1,46 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.utils.process_pool import BoundedProcessPool, PoolBusyError
+
+
+def test_pool_runs_tasks_and_rejects_when_full():
+    async def scenario():
+        pool = BoundedProcessPool("test", max_workers=1, max_queue=0)
+        try:
+            assert await pool.run(pow, 2, 10) == 1024
+
+            slow = asyncio.ensure_future(pool.run(time.sleep, 0.5))
+            await asyncio.sleep(0)
+            with pytest.raises(PoolBusyError):
+                await pool.run(pow, 2, 10)
+            await slow
+            assert pool.queue_depth == 0
+        finally:
+            pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_broken_pool_only_discards_the_executor_it_ran_on():
+    async def scenario():
+        pool = BoundedProcessPool("test", max_workers=1, max_queue=1)
+        crash = asyncio.ensure_future(pool.run(os._exit, 1))
+        await asyncio.sleep(0)
+        # Another task already saw the failure and started a fresh executor
+        broken, replacement = pool._executor, ProcessPoolExecutor(1)
+        pool._executor = replacement
+        try:
+            with pytest.raises(BrokenProcessPool):
+                await crash
+            assert pool._executor is replacement
+        finally:
+            broken.shutdown(wait=False)
+            pool.shutdown()
+
+    asyncio.run(scenario())
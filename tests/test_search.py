@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from bson import ObjectId
+
+from app.services.search import InvertedIndex, highlight, parse_query
+
+
+def _doc(title, description="", status="Applied"):
+    return {
+        "_id": ObjectId(),
+        "title": title,
+        "company": "Acme",
+        "job_description": description,
+        "status": status,
+        "updated_at": datetime.utcnow(),
+    }
+
+
+def test_phrases_are_required_and_terms_ranked():
+    index = InvertedIndex()
+    sre = _doc("Site Reliability Engineer", "kubernetes on-call")
+    scrambled = _doc("Data Scientist", "reliability of site metrics")
+    platform = _doc("Platform Engineer", "kubernetes kubernetes")
+    for doc in (sre, scrambled, platform):
+        index.add(doc)
+
+    assert [doc for _, doc in index.search(parse_query('"site reliability"'), {}, 10)] == [sre]
+    assert {doc["_id"] for _, doc in index.search(parse_query("kubernetes"), {}, 10)} == {sre["_id"], platform["_id"]}
+    assert index.search(parse_query("kubernetes"), {"status": "Offer"}, 10) == []
+
+    index.remove(platform["_id"])
+    assert [doc for _, doc in index.search(parse_query("kubernetes"), {}, 10)] == [sre]
+
+
+def test_highlight_escapes_and_marks_matches():
+    snippet = highlight("Run <Kubernetes> clusters", parse_query("kubernetes"))
+    assert snippet == "Run &lt;<mark>Kubernetes</mark>&gt; clusters"
+
+
+def test_archived_applications_are_filtered_like_the_list():
+    index = InvertedIndex()
+    active = _doc("Backend Engineer")
+    archived = {**_doc("Backend Developer"), "archived_at": datetime.utcnow()}
+    index.add(active)
+    index.add(archived)
+
+    assert [doc for _, doc in index.search(parse_query("backend"), {"archived_at": None}, 10)] == [active]
+    assert len(index.search(parse_query("backend"), {}, 10)) == 2
@@ -0,0 +1,27 @@
+import json
+from datetime import datetime
+
+from bson import ObjectId
+
+from app.models.application import Application
+from app.utils.serialization import FastJSONResponse, TrustedShape
+
+
+def test_trusted_shape_matches_validated_model():
+    now = datetime(2026, 3, 14, 9, 26, 53, 589000)
+    doc = {
+        "_id": ObjectId(),
+        "user_id": ObjectId(),
+        "linkedin_url": "https://www.linkedin.com/jobs/view/123/",
+        "title": "Engineer",
+        "status": "Applied",
+        # Older history entries predate previous_status
+        "status_history": [{"status": "Applied", "changed_at": now}],
+        "created_at": now,
+        "updated_at": now,
+    }
+    fields = {**doc, "id": str(doc["_id"]), "user_id": str(doc["user_id"])}
+
+    trusted = json.loads(FastJSONResponse(TrustedShape(Application)(fields)).body)
+    validated = json.loads(Application(**fields).model_dump_json())
+    assert trusted == validated